@@ -0,0 +1,323 @@
+"""
+Vectorized evaluation of many positions at once with NumPy.
+
+scoreBoard evaluates one GameState at a time through Python loops, which is the bottleneck when
+scoring large sets of positions offline (analysis, tuning). evaluateBatch computes the same terms
+for N positions in a handful of array operations:
+
+- material and piece-square tables, as one lookup in a stacked (13, 64) weight table
+- mobility, passed pawns, king shelter and the bishop pair, counted with shifted bitboard masks
+  (one uint64 per piece type and position) instead of per-square scans, then weighted
+
+The weights are read from AI.chessai on every call, so tuned parameters apply here too.
+
+Positions are given either as an (N, 64) array of piece indices (PIECE_CODES order from
+GameState/serialization.py, EMPTY for an empty square; see encodePositions) or as (N, 12, 64)
+boolean piece planes. Square indices are row * 8 + col as everywhere else (0 = a8, 63 = h1).
+
+The scores match scoreBoard (up to floating point rounding in the order of the sums) for any
+position it has not yet flagged as checkmate or stalemate: like scoreBoard on a freshly loaded
+position, terminal positions get no special score. Requires NumPy, which the rest of the engine
+does not.
+"""
+
+import numpy as np
+
+import AI.chessai as ChessAI
+from GameState.serialization import PIECE_CODES
+
+
+# Piece index of an empty square in the (N, 64) encoding
+EMPTY = len(PIECE_CODES)
+
+# Indices of the piece planes
+WP, WN, WB, WR, WQ, WK, BP, BN, BB, BR, BQ, BK = range(12)
+
+
+# --- STACKED EVALUATION TABLES ---
+
+# Heuristic terms scored on top of material and piece-square tables, in the column order of
+# termFeatures, with the chessai constant weighting each one
+TERMS = (
+    ("passed_pawn_bonus", "PASSED_PAWN_BONUS"),     # Passed pawns
+    ("shelter_pawn_bonus", "SHELTER_PAWN_BONUS"),   # Pawns in front of the king
+    ("mobility_weight", "MOBILITY_WEIGHT"),         # Pseudo-legal moves
+    ("bishop_pair_bonus", "BISHOP_PAIR_BONUS")      # Owning two or more bishops
+)
+
+
+def weightTable():
+    """
+    Stacks the current material and piece-square values into one (13, 64) table, signed from
+    white's perspective and indexed by [piece index, square] (the EMPTY row is all zero), so the
+    material and positional score of a position is a gather and a sum.
+    """
+    weights = np.zeros((EMPTY + 1, 64))
+    for index, piece in enumerate(PIECE_CODES):
+        sign = 1.0 if piece[0] == "w" else -1.0
+        weights[index, :] = sign * ChessAI.piece_score[piece[1]]
+        if piece in ChessAI.piece_position_scores:  # Kings have no table
+            weights[index, :] += sign * np.array(ChessAI.piece_position_scores[piece], dtype=float).ravel()
+    return weights
+
+
+def termWeights():
+    """
+    Returns the current weights of the TERMS, as a vector matching the columns of termFeatures.
+    """
+    return np.array([getattr(ChessAI, constant) for _, constant in TERMS])
+
+# File masks that stop shifts from wrapping around the board edge
+FILE_A = np.uint64(0x0101010101010101)
+FILE_H = np.uint64(0x8080808080808080)
+NOT_A_FILE = ~FILE_A
+NOT_H_FILE = ~FILE_H
+NOT_AB_FILE = ~(FILE_A | (FILE_A << np.uint64(1)))
+NOT_GH_FILE = ~(FILE_H | (FILE_H >> np.uint64(1)))
+
+# Squares a pawn reaches with its first single push (see GameState/bitboard.py)
+WHITE_DOUBLE_PUSH_RANK = np.uint64(0xFF << 40)
+BLACK_DOUBLE_PUSH_RANK = np.uint64(0xFF << 16)
+
+# Number of set bits in every byte value, for population counts
+_BYTE_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.int64)
+
+# (row, col) steps of the pieces. A step is a shift of the bitboard by d_row * 8 + d_col,
+# followed by a mask removing squares that wrapped around to the other side of the board.
+KNIGHT_STEPS = ((-2, -1), (-2, 1), (-1, 2), (1, 2), (2, -1), (2, 1), (-1, -2), (1, -2))
+KING_STEPS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+ROOK_STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+BISHOP_STEPS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+# --- BITBOARD HELPERS ---
+
+def _shift(bitboards, d_row, d_col):
+    """
+    Moves every set bit by (d_row, d_col), dropping bits that leave the board.
+    """
+    amount = d_row * 8 + d_col
+    if amount > 0:
+        shifted = bitboards << np.uint64(amount)
+    else:
+        shifted = bitboards >> np.uint64(-amount)
+
+    if d_col == 1:
+        shifted &= NOT_A_FILE
+    elif d_col == 2:
+        shifted &= NOT_AB_FILE
+    elif d_col == -1:
+        shifted &= NOT_H_FILE
+    elif d_col == -2:
+        shifted &= NOT_GH_FILE
+    return shifted
+
+
+def _popcount(bitboards):
+    """
+    Counts the set bits of every uint64 in `bitboards`.
+    """
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+        return np.bitwise_count(bitboards).astype(np.int64)
+    as_bytes = np.ascontiguousarray(bitboards, dtype=np.uint64).view(np.uint8)
+    return _BYTE_POPCOUNT[as_bytes].reshape(bitboards.shape + (8,)).sum(axis=-1)
+
+
+def _slidingAttacks(sliders, empty, d_row, d_col):
+    """
+    Squares attacked along one direction by a set of sliders, stopping at the first occupied square.
+
+    Along a single direction a slider blocks the ray of any slider behind it, so every square
+    in the result is attacked by exactly one piece: its population count is the sum of the
+    pieces' individual move counts in that direction.
+    """
+    attacks = np.zeros_like(sliders)
+    ray = _shift(sliders, d_row, d_col)
+    for _ in range(7):
+        attacks |= ray
+        ray = _shift(ray & empty, d_row, d_col)
+    return attacks
+
+
+def _fillForward(bitboards, d_row):
+    """
+    Extends every set bit over all squares in front of it (d_row = -1 towards row 0, 1 towards row 7),
+    excluding its own square.
+    """
+    filled = _shift(bitboards, d_row, 0)
+    for _ in range(6):
+        filled |= _shift(filled, d_row, 0)
+    return filled
+
+
+def _spreadFiles(bitboards):
+    """
+    Adds the squares on either side of every set bit (same row, adjacent files).
+    """
+    return bitboards | _shift(bitboards, 0, -1) | _shift(bitboards, 0, 1)
+
+
+# --- ENCODING ---
+
+def encodePositions(game_states):
+    """
+    Encodes GameStates (or anything with a `board` grid) as an (N, 64) array of piece indices.
+
+    Returns:
+        np.ndarray: int8 array, PIECE_CODES index per square and EMPTY for empty squares.
+    """
+    piece_index = {piece: index for index, piece in enumerate(PIECE_CODES)}
+    piece_index["--"] = EMPTY
+    return np.array(
+        [[piece_index[piece] for row in game_state.board for piece in row] for game_state in game_states],
+        dtype=np.int8
+    ).reshape(-1, 64)
+
+
+def toIndices(positions):
+    """
+    Returns positions as an (N, 64) array of piece indices, converting (N, 12, 64) piece planes.
+
+    Raises:
+        ValueError: If the array has neither shape.
+    """
+    positions = np.asarray(positions)
+    if positions.ndim == 3 and positions.shape[1:] == (12, 64):
+        planes = positions.astype(bool, copy=False)
+        return np.where(planes.any(axis=1), planes.argmax(axis=1), EMPTY)
+    if positions.ndim != 2 or positions.shape[1] != 64:
+        raise ValueError("Expected an (N, 64) or (N, 12, 64) array, got shape {}".format(positions.shape))
+    return positions
+
+
+def toPlanes(indices):
+    """
+    Converts (N, 64) piece indices to (N, 12, 64) boolean piece planes.
+    """
+    return indices[:, None, :] == np.arange(12)[None, :, None]
+
+
+def toBitboards(indices):
+    """
+    Packs (N, 64) piece indices into an (N, 12) array of uint64 bitboards.
+    """
+    packed = np.packbits(toPlanes(indices), axis=2, bitorder="little")  # 8 bytes per plane, square 0 first
+    return packed.view("<u8")[..., 0]
+
+
+# --- EVALUATION TERMS ---
+
+def mobility(bitboards, color):
+    """
+    Counts the pseudo-legal moves of `color` in every position, as GameState.getMobility does.
+
+    Args:
+        bitboards (np.ndarray): (N, 12) uint64 piece bitboards.
+        color (str): 'w' or 'b'.
+
+    Returns:
+        np.ndarray: (N,) move counts.
+    """
+    first = WP if color == "w" else BP
+    pawns, knights, bishops, rooks, queens, kings = (bitboards[:, first + i] for i in range(6))
+    own = np.bitwise_or.reduce(bitboards[:, first:first + 6], axis=1)
+    enemy_first = BP if color == "w" else WP
+    enemy = np.bitwise_or.reduce(bitboards[:, enemy_first:enemy_first + 6], axis=1)
+    empty = ~(own | enemy)
+    not_own = ~own
+
+    # Knights and kings: a single step is a one-to-one shift, so each target counts for one piece
+    count = np.zeros(len(bitboards), dtype=np.int64)
+    for d_row, d_col in KNIGHT_STEPS:
+        count += _popcount(_shift(knights, d_row, d_col) & not_own)
+    for d_row, d_col in KING_STEPS:
+        count += _popcount(_shift(kings, d_row, d_col) & not_own)
+
+    # Sliders: queens move like both rooks and bishops
+    for d_row, d_col in ROOK_STEPS:
+        count += _popcount(_slidingAttacks(rooks | queens, empty, d_row, d_col) & not_own)
+    for d_row, d_col in BISHOP_STEPS:
+        count += _popcount(_slidingAttacks(bishops | queens, empty, d_row, d_col) & not_own)
+
+    # Pawns: pushes onto empty squares (double pushes from the start rank) and captures
+    direction = -1 if color == "w" else 1
+    double_push_rank = WHITE_DOUBLE_PUSH_RANK if color == "w" else BLACK_DOUBLE_PUSH_RANK
+    single_pushes = _shift(pawns, direction, 0) & empty
+    double_pushes = _shift(single_pushes & double_push_rank, direction, 0) & empty
+    count += _popcount(single_pushes) + _popcount(double_pushes)
+    count += _popcount(_shift(pawns, direction, -1) & enemy)
+    count += _popcount(_shift(pawns, direction, 1) & enemy)
+
+    return count
+
+
+def passedPawns(bitboards, color):
+    """
+    Finds the passed pawns of `color` (no opposing pawn ahead on the same or an adjacent file)
+    in every position, as chessai.passedPawns does.
+
+    Returns:
+        np.ndarray: (N,) uint64 bitboards of the passed pawns.
+    """
+    if color == "w":
+        pawns, enemy_pawns, enemy_direction = bitboards[:, WP], bitboards[:, BP], 1
+    else:
+        pawns, enemy_pawns, enemy_direction = bitboards[:, BP], bitboards[:, WP], -1
+    # Squares an enemy pawn guards or blocks on its way to promotion
+    enemy_front_span = _spreadFiles(_fillForward(enemy_pawns, enemy_direction))
+    return pawns & ~enemy_front_span
+
+
+def shelterPawns(bitboards, color):
+    """
+    Counts `color`'s pawns on the three squares in front of its king (see chessai.kingShelterScore).
+
+    Returns:
+        np.ndarray: (N,) pawn counts.
+    """
+    if color == "w":
+        king, pawns, direction = bitboards[:, WK], bitboards[:, WP], -1
+    else:
+        king, pawns, direction = bitboards[:, BK], bitboards[:, BP], 1
+    shelter_squares = _spreadFiles(_shift(king, direction, 0))
+    return _popcount(shelter_squares & pawns)
+
+
+def termFeatures(bitboards):
+    """
+    Measures the TERMS in every position, white's count minus black's:
+    passed pawns, shelter pawns, pseudo-legal moves and bishop pair (0 or 1).
+
+    The terms' contribution to the score is termFeatures(bitboards) @ termWeights().
+
+    Returns:
+        np.ndarray: (N, len(TERMS)) int array.
+    """
+    features = np.empty((len(bitboards), len(TERMS)), dtype=np.int64)
+    features[:, 0] = _popcount(passedPawns(bitboards, "w")) - _popcount(passedPawns(bitboards, "b"))
+    features[:, 1] = shelterPawns(bitboards, "w") - shelterPawns(bitboards, "b")
+    features[:, 2] = mobility(bitboards, "w") - mobility(bitboards, "b")
+    features[:, 3] = (_popcount(bitboards[:, WB]) >= 2).astype(np.int64) - (_popcount(bitboards[:, BB]) >= 2)
+    return features
+
+
+def evaluateBatch(positions):
+    """
+    Scores N positions at once with the same terms and weights as chessai.scoreBoard.
+
+    Args:
+        positions (np.ndarray): (N, 64) piece indices (see encodePositions) or (N, 12, 64) piece planes.
+
+    Returns:
+        np.ndarray: (N,) float scores — positive favors white, negative favors black.
+    """
+    indices = toIndices(positions)
+    bitboards = toBitboards(indices)
+
+    # --- MATERIAL AND POSITIONAL VALUE ---
+    score = weightTable()[indices, np.arange(64)].sum(axis=1)
+
+    # --- PASSED PAWNS, KING SAFETY, MOBILITY, BISHOP PAIR ---
+    score += termFeatures(bitboards) @ termWeights()
+
+    return score
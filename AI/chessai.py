@@ -1,204 +1,692 @@
 """
 This module defines an AI for selecting moves in a chess game using the negamax algorithm
-with alpha-beta pruning. It also includes positional evaluation tables to guide the decision-making process.
+with alpha-beta pruning. Positions are evaluated with the material and positional tables of
+GameState/piece_values.py, shared with the board model's incremental totals.
 """
 
+import json
+import os
 import random
-
-# --- MATERIAL SCORES ---
-
-# Assigns material value to each piece type (used in static evaluation).
-# These values approximate the traditional chess piece valuations.
-piece_score = {
-    "K": 0,  # King is not scored directly since its loss ends the game.
-    "Q": 9,  # Queen is most valuable
-    "R": 5,  # Rook
-    "B": 3,  # Bishop
-    "N": 3,  # Knight
-    "p": 1   # Pawn
-}
-
-# --- POSITIONAL SCORES (PIECE-SQUARE TABLES) ---
-
-# These tables encourage good piece positioning.
-# Higher values represent stronger control or tactical advantage for that square.
-# Tables are flipped for black to maintain symmetry from white's perspective.
-
-# Knight is most valuable in the center, less so on the edges.
-knight_scores = [
-    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
-    [0.1, 0.3, 0.5, 0.5, 0.5, 0.5, 0.3, 0.1],
-    [0.2, 0.5, 0.6, 0.65, 0.65, 0.6, 0.5, 0.2],
-    [0.2, 0.55, 0.65, 0.7, 0.7, 0.65, 0.55, 0.2],
-    [0.2, 0.5, 0.65, 0.7, 0.7, 0.65, 0.5, 0.2],
-    [0.2, 0.55, 0.6, 0.65, 0.65, 0.6, 0.55, 0.2],
-    [0.1, 0.3, 0.5, 0.55, 0.55, 0.5, 0.3, 0.1],
-    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0]
-]
-
-# Bishop prefers open diagonals and central influence.
-bishop_scores = [
-    [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0],
-    [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
-    [0.2, 0.4, 0.5, 0.6, 0.6, 0.5, 0.4, 0.2],
-    [0.2, 0.5, 0.5, 0.6, 0.6, 0.5, 0.5, 0.2],
-    [0.2, 0.4, 0.6, 0.6, 0.6, 0.6, 0.4, 0.2],
-    [0.2, 0.6, 0.6, 0.6, 0.6, 0.6, 0.6, 0.2],
-    [0.2, 0.5, 0.4, 0.4, 0.4, 0.4, 0.5, 0.2],
-    [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0]
-]
-
-# Rooks are best placed on open files and central ranks.
-rook_scores = [
-    [0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25],
-    [0.5, 0.75, 0.75, 0.75, 0.75, 0.75, 0.75, 0.5],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
-    [0.25, 0.25, 0.25, 0.5, 0.5, 0.25, 0.25, 0.25]
-]
-
-# Queen gains value from central control and flexibility.
-queen_scores = [
-    [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0],
-    [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
-    [0.2, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
-    [0.3, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
-    [0.4, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
-    [0.2, 0.5, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
-    [0.2, 0.4, 0.5, 0.4, 0.4, 0.4, 0.4, 0.2],
-    [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0]
-]
-
-# Pawns are evaluated based on progression and structure.
-pawn_scores = [
-    [0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8],  # Rank 1 (Black side, white pawns start here)
-    [0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7],
-    [0.3, 0.3, 0.4, 0.5, 0.5, 0.4, 0.3, 0.3],
-    [0.25, 0.25, 0.3, 0.45, 0.45, 0.3, 0.25, 0.25],
-    [0.2, 0.2, 0.2, 0.4, 0.4, 0.2, 0.2, 0.2],
-    [0.25, 0.15, 0.1, 0.2, 0.2, 0.1, 0.15, 0.25],
-    [0.25, 0.3, 0.3, 0.0, 0.0, 0.3, 0.3, 0.25],
-    [0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2]   # Rank 8 (White side)
-]
-
-# Dictionary linking piece identifiers to their respective square score matrices.
-# Black piece tables are vertically flipped versions of white ones.
-piece_position_scores = {
-    "wN": knight_scores,
-    "bN": knight_scores[::-1],
-    "wB": bishop_scores,
-    "bB": bishop_scores[::-1],
-    "wQ": queen_scores,
-    "bQ": queen_scores[::-1],
-    "wR": rook_scores,
-    "bR": rook_scores[::-1],
-    "wp": pawn_scores,
-    "bp": pawn_scores[::-1]
-}
+import time
+
+from AI.transposition import (
+    TranspositionTable,
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    DEFAULT_SIZE_MB
+)
+from AI.pawn_table import PawnHashTable
+from GameState.piece_values import (
+    piece_score,
+    piece_position_scores,
+    piece_square_tables
+)
+
+# --- MATERIAL AND POSITIONAL SCORES ---
+# piece_score and the piece-square tables live in GameState/piece_values.py, since GameState
+# keeps running totals of them; the board model does not import the search.
+
+# Evaluation weights written by the tuner (AI/tuner.py). Loaded at import when present,
+# replacing the hand-picked values in GameState/piece_values.py and below.
+EVAL_PARAMS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eval_params.json")
 
 # --- GAME EVALUATION CONSTANTS ---
 
 CHECKMATE = 1000    # Arbitrarily high score to represent a winning state
 STALEMATE = 0       # Neutral outcome
-DEPTH = 3           # Search depth for the minimax (negamax) algorithm
+DEPTH = 3           # Search depth for the minimax (negamax) algorithm when no budget is given
+MAX_DEPTH = 64      # Iterative deepening ceiling when searching against a time or node budget
+
+# Number of nodes searched between checks of the clock and node budget.
+NODE_CHECK_INTERVAL = 256
+
+# Safety margin (in pawns) for delta pruning in quiescence search: a capture is skipped when even
+# winning the captured piece plus this margin cannot lift the score above alpha.
+DELTA_MARGIN = 2
+
+# Transposition table shared by every search in this process, so results from the
+# previous AI turn are reused on the next one.
+transposition_table = TranspositionTable(DEFAULT_SIZE_MB)
+
+# Cache of pawn structure terms (passed pawns, king shelter) keyed by GameState.pawn_key.
+pawn_table = PawnHashTable()
+
+# Evaluation weights of the heuristics besides material and piece-square tables
+PASSED_PAWN_BONUS = 0.5   # Per passed pawn
+SHELTER_PAWN_BONUS = 0.2  # Per own pawn on the three squares in front of the king
+MOBILITY_WEIGHT = 0.1     # Per pseudo-legal move
+BISHOP_PAIR_BONUS = 0.3   # For owning at least two bishops
 
 
-def findBestMove(game_state, valid_moves, return_queue):
+class SearchInfo:
     """
-    Initiates the search for the best move using the negamax algorithm with alpha-beta pruning.
+    Bookkeeping for one call to iterativeDeepening: the budget, the node counter,
+    the stop flag and the best move from the last completed iteration.
+    """
+
+    def __init__(self, table, max_depth, time_limit=None, node_limit=None, randomize=False,
+                 stop_flag=None):
+        """
+        Args:
+            table (TranspositionTable): Table used by this search.
+            max_depth (int): Deepest iteration to run.
+            time_limit (float): Wall-clock budget in seconds, or None.
+            node_limit (int): Maximum number of nodes to search, or None.
+            randomize (bool): Break move-ordering ties randomly for more varied play.
+            stop_flag (Event or Value): Shared flag polled along with the budget; once it is set
+                the search stops with the best move found so far.
+        """
+        self.table = table
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.stop_flag = stop_flag
+
+        self.start_time = time.perf_counter()
+        self.deadline = self.start_time + time_limit if time_limit is not None else None
+        self.next_check = NODE_CHECK_INTERVAL if node_limit is None else min(NODE_CHECK_INTERVAL, node_limit)
+
+        self.nodes = 0            # Nodes visited so far (all iterations)
+        self.stopped = False      # Set once the budget is exhausted; the search then unwinds
+
+        self.root_depth = 0       # Depth of the iteration in progress
+        self.iteration_move = None  # Best root move found so far in the current iteration
+
+        self.best_move = None     # Best move of the last completed iteration
+        self.best_score = None    # Its score, from the perspective of the side to move
+        self.completed_depth = 0  # Depth of the last completed iteration
+
+        # --- Parallel search (AI/parallel_search.py) ---
+        self.worker_nodes = {}            # Nodes searched by each worker process, keyed by pid
+        self.principal_variation = None   # Expected line, when it is not in this process's table
+
+        # --- Move ordering state ---
+        self.randomize = randomize
+        # Two quiet moves per ply that recently caused a beta cutoff (stored as moveIDs)
+        self.killers = [[None, None] for _ in range(max_depth + 1)]
+        # Cutoff counts for quiet moves, keyed by (piece moved, destination square)
+        self.history = {}
+
+
+    def checkLimits(self):
+        """
+        Called every NODE_CHECK_INTERVAL nodes; sets `stopped` once the time or node budget runs out
+        or the caller asks the search to stop.
+        """
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            self.stopped = True
+        elif self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.stopped = True
+        elif self.stop_flag is not None and self.stopRequested():
+            self.stopped = True
+
+        self.next_check = self.nodes + NODE_CHECK_INTERVAL
+        if self.node_limit is not None:
+            self.next_check = min(self.next_check, self.node_limit)
+
+
+    def stopRequested(self):
+        """
+        Reads the shared stop flag. Accepts an Event (threading or multiprocessing) or a
+        shared-memory multiprocessing.Value, which is cheaper to poll across processes.
+        """
+        flag = self.stop_flag
+        if hasattr(flag, "is_set"):
+            return flag.is_set()
+        return bool(flag.value)
+
+
+    def elapsed(self):
+        """
+        Seconds since the search started.
+        """
+        return time.perf_counter() - self.start_time
+
+
+    def report(self):
+        """
+        Returns a one-line summary of the search, used to measure node counts and speed.
+        Table statistics are those of this process; a parallel search also lists the nodes
+        searched by every worker process.
+        """
+        elapsed = self.elapsed()
+        nps = int(self.nodes / elapsed) if elapsed > 0 else 0
+        summary = "depth {} score {} nodes {} time {:.2f}s nps {}".format(
+            self.completed_depth, self.best_score, self.nodes, elapsed, nps
+        )
+        if self.table is not None:
+            summary += " tt hits {} misses {} pawn hit rate {:.1%}".format(
+                self.table.hits, self.table.misses, pawn_table.hitRate()
+            )
+        if self.worker_nodes:
+            summary += " worker nodes " + " ".join(
+                "{}:{}".format(pid, nodes) for pid, nodes in sorted(self.worker_nodes.items())
+            )
+        return summary
+
+
+def findBestMove(game_state, valid_moves, return_queue=None, depth=None, time_limit=None,
+                 node_limit=None, tt=None, randomize=False, verbose=False, stop_flag=None):
+    """
+    Searches for the best move and sends it back through `return_queue`.
+
+    With no budget the search runs iterative deepening up to DEPTH plies. Give `depth` for a
+    different fixed depth, or `time_limit` / `node_limit` to keep deepening until the budget runs out.
 
     Args:
         game_state (GameState): The current state of the chess game.
         valid_moves (list): List of legal Move objects available to the current player.
-        return_queue (Queue): A multiprocessing queue to return the selected best move.
+        return_queue (Queue): A multiprocessing queue to return the selected best move (optional).
+        depth (int): Maximum search depth in plies.
+        time_limit (float): Wall-clock budget in seconds.
+        node_limit (int): Maximum number of nodes to search.
+        tt (TranspositionTable): Table to use; defaults to the module-level table.
+        randomize (bool): Break ties between equally ordered moves at random.
+        verbose (bool): Print the search summary (depth, nodes, speed) when done.
+        stop_flag (Event or Value): Shared flag; setting it makes the search return early with
+            the best move found so far.
+
+    Returns:
+        Move: The best move found (also put on `return_queue` if one is given).
     """
-    global next_move
-    next_move = None  # Reset best move storage
+    search = iterativeDeepening(game_state, valid_moves, depth, time_limit, node_limit, tt, randomize,
+                                stop_flag)
+    if verbose:
+        print(search.report())
 
-    # Randomize move order to add variability in equivalent evaluations
-    random.shuffle(valid_moves)
+    # Send the selected move back through the queue
+    if return_queue is not None:
+        return_queue.put(search.best_move)
+    return search.best_move
 
-    # Launch negamax recursive search
-    findMoveNegaMaxAlphaBeta(
-        game_state,
-        valid_moves,
-        DEPTH,
-        -CHECKMATE, CHECKMATE,
-        1 if game_state.white_to_move else -1
-    )
 
-    # Send the selected move back through the queue
-    return_queue.put(next_move)
+def iterativeDeepening(game_state, valid_moves, depth=None, time_limit=None, node_limit=None, tt=None,
+                       randomize=False, stop_flag=None, on_iteration=None, start_depth=1, new_search=True):
+    """
+    Runs negamax searches of depth 1, 2, 3, ... until the maximum depth is reached or the
+    time/node budget runs out.
 
+    Each iteration tries the previous iteration's best move first (see orderMoves), so a usable best
+    move is always available when the budget expires or the stop flag is set mid-search.
 
-def findMoveNegaMaxAlphaBeta(game_state, valid_moves, depth, alpha, beta, turn_multiplier):
+    Args:
+        game_state (GameState): The current state of the chess game.
+        valid_moves (list): List of legal Move objects available to the current player.
+        depth (int): Maximum search depth; defaults to DEPTH, or MAX_DEPTH when a budget is given.
+        time_limit (float): Wall-clock budget in seconds.
+        node_limit (int): Maximum number of nodes to search.
+        tt (TranspositionTable): Table to use; defaults to the module-level table.
+        randomize (bool): Break move-ordering ties at random.
+        stop_flag (Event or Value): Polled every NODE_CHECK_INTERVAL nodes; once set, the search
+            unwinds cleanly and returns the best move found so far.
+        on_iteration (callable): Called with the SearchInfo after every completed iteration,
+            e.g. to report progress to a UCI interface.
+        start_depth (int): Depth of the first iteration (Lazy SMP helpers start deeper).
+        new_search (bool): Advance the table's age for this search. Pass False when the caller
+            has already done so (Lazy SMP does, before its helpers start storing).
+
+    Returns:
+        SearchInfo: The finished search, including best move, score, depth reached and node count.
+    """
+    if depth is None:
+        depth = DEPTH if time_limit is None and node_limit is None else MAX_DEPTH
+
+    table = tt if tt is not None else transposition_table
+    if new_search:
+        table.newSearch()
+    pawn_table.resetStats()
+    search = SearchInfo(table, depth, time_limit, node_limit, randomize, stop_flag)
+    root_moves = list(valid_moves)
+
+    turn_multiplier = 1 if game_state.white_to_move else -1
+
+    for iteration_depth in range(start_depth, depth + 1):
+        search.root_depth = iteration_depth
+        search.iteration_move = None
+
+        score = findMoveNegaMaxAlphaBeta(
+            game_state, root_moves, iteration_depth,
+            -CHECKMATE, CHECKMATE, turn_multiplier, search
+        )
+
+        if search.stopped:
+            # The previous best move is searched first, so a different root move recorded in a
+            # partial iteration has already been proven better at this depth
+            if search.iteration_move is not None and search.completed_depth > 0:
+                search.best_move = search.iteration_move
+            break
+
+        search.best_move = search.iteration_move
+        search.best_score = score
+        search.completed_depth = iteration_depth
+        if on_iteration is not None:
+            on_iteration(search)
+
+        # A forced mate will not change with more depth
+        if abs(score) >= CHECKMATE:
+            break
+
+    # Budget ran out before even depth 1 finished: fall back to any legal move
+    if search.best_move is None:
+        search.best_move = search.iteration_move or (root_moves[0] if root_moves else None)
+
+    return search
+
+
+def principalVariation(game_state, first_move, table=None, max_length=MAX_DEPTH):
+    """
+    Reconstructs the expected line of play starting with `first_move` by following the best
+    moves stored in the transposition table.
+
+    The line ends early where an entry is missing, was overwritten, or a position repeats,
+    so it can be shorter than the depth searched.
+
+    Args:
+        game_state (GameState): Position the line starts from. Restored before returning.
+        first_move (Move): Root move of the line (normally the search's best move).
+        table (TranspositionTable): Table to read; defaults to the module-level table.
+        max_length (int): Maximum number of moves to return.
+
+    Returns:
+        list: Move objects, starting with `first_move`.
+    """
+    table = table if table is not None else transposition_table
+    line = [first_move]
+    game_state.makeMove(first_move)
+    seen_keys = {game_state.zobrist_key}
+
+    while len(line) < max_length:
+        entry = table.probe(game_state.zobrist_key)
+        if entry is None or entry[4] is None:
+            break
+        # Test the stored moveID on its own; only that move is built
+        next_move = game_state.getLegalMoveById(game_state.prepareMoveGeneration(), entry[4])
+        if next_move is None:
+            break
+        game_state.makeMove(next_move)
+        line.append(next_move)
+        if game_state.zobrist_key in seen_keys:
+            break
+        seen_keys.add(game_state.zobrist_key)
+
+    for _ in line:
+        game_state.undoMove()
+    return line
+
+
+def findMoveNegaMaxAlphaBeta(game_state, valid_moves, depth, alpha, beta, turn_multiplier, search):
     """
     Recursive negamax algorithm with alpha-beta pruning to find the best possible move.
     
     Negamax simplifies minimax by using a single perspective (maximizing) and inverting scores
     for the opponent. Alpha-beta pruning skips branches that cannot influence the final result.
 
+    Every result is stored in the transposition table under the position's Zobrist key,
+    together with whether it is an exact score or only a bound, so transposed positions
+    (and identical leaves) are not searched or evaluated twice.
+
     Args:
         game_state (GameState): Current state of the board.
-        valid_moves (list): List of valid moves from this position.
+        valid_moves (list): List of valid moves from this position, or None to have the
+            staged picker (pickMoves) generate them only as far as the search needs them.
         depth (int): Current depth of search remaining.
         alpha (float): Alpha cutoff (best score guaranteed for maximizer).
         beta (float): Beta cutoff (best score guaranteed for minimizer).
         turn_multiplier (int): +1 for white’s turn, -1 for black’s turn.
+        search (SearchInfo): Shared state of the running search (budget, node count, root move).
 
     Returns:
         float: The evaluated score of the best position found at this level.
+            Meaningless once `search.stopped` is set; callers must discard it.
     """
-    global next_move
+    # --- Budget Check ---
+    search.nodes += 1
+    if search.nodes >= search.next_check:
+        search.checkLimits()
+    if search.stopped:
+        return 0
+
+    is_root = depth == search.root_depth
+    ply = search.root_depth - depth
+    table = search.table
+    key = game_state.zobrist_key
+
+    # --- Transposition Table Lookup (never at the root, which must produce a move) ---
+    entry = table.probe(key)
+    if entry is not None and entry[1] >= depth and not is_root:
+        tt_score, tt_flag = entry[2], entry[3]
+        if tt_flag == EXACT:
+            return tt_score
+        elif tt_flag == LOWER_BOUND:
+            alpha = max(alpha, tt_score)
+        else:
+            beta = min(beta, tt_score)
+        if alpha >= beta:
+            return tt_score
+
+    # Taken after the bound adjustment: a score at or below a raised alpha was searched with
+    # the narrowed window, so it is only an upper bound and must not be stored as exact
+    alpha_original = alpha
 
     # --- Base Case: Reached maximum search depth ---
+    # Resolve pending captures before evaluating, so the horizon never falls mid-exchange
     if depth == 0:
-        return turn_multiplier * scoreBoard(game_state)
+        score = quiescence(game_state, alpha, beta, turn_multiplier, search)
+        if not search.stopped:
+            table.store(key, 0, score, boundType(score, alpha_original, beta))
+        return score
+
+    # --- Move Ordering ---
+    # At the root the previous iteration's best move is the hash move, and the given move
+    # list is sorted. Elsewhere moves come from the staged picker, which only generates as
+    # much as the search gets through before a cutoff.
+    if is_root and search.best_move is not None:
+        hash_move_id = search.best_move.moveID
+    else:
+        hash_move_id = entry[4] if entry is not None else None
+    if valid_moves is not None:
+        ordered_moves = orderMoves(valid_moves, hash_move_id, ply, search)
+    else:
+        ordered_moves = pickMoves(game_state, hash_move_id, ply, search)
 
     max_score = -CHECKMATE  # Initialize to lowest possible score
+    best_move = None
+    moves_searched = 0
 
     # --- Explore each move ---
-    for move in valid_moves:
+    for move in ordered_moves:
+        moves_searched += 1
         game_state.makeMove(move)
 
-        # Get the next valid moves after making this move
-        next_moves = game_state.getValidMoves()
-
         # Recursive call: negate score because perspective flips
         score = -findMoveNegaMaxAlphaBeta(
-            game_state, next_moves, depth - 1,
-            -beta, -alpha, -turn_multiplier
+            game_state, None, depth - 1,
+            -beta, -alpha, -turn_multiplier, search
         )
 
         game_state.undoMove()  # Undo move to restore state
 
+        if search.stopped:
+            return 0  # Budget exhausted mid-search: the partial result is unusable
+
         # --- Update best score found ---
         if score > max_score:
             max_score = score
-            if depth == DEPTH:
-                next_move = move  # Only save move at root level
+            best_move = move
+            if is_root:
+                search.iteration_move = move  # Only save move at root level
 
         # --- Alpha-Beta Pruning ---
         if max_score > alpha:
             alpha = max_score
         if alpha >= beta:
+            # Remember quiet moves that refute a position for ordering sibling nodes
+            if not move.is_capture:
+                recordQuietCutoff(move, ply, depth, search)
             break  # Beta cutoff: opponent has a better option already
 
+    # --- No Legal Moves: Checkmate or Stalemate ---
+    # Decided here rather than by the move generator, which the picker may not run to the end
+    if moves_searched == 0:
+        max_score = -CHECKMATE if game_state.inCheck() else STALEMATE
+
+    # --- Transposition Table Store ---
+    table.store(key, depth, max_score, boundType(max_score, alpha_original, beta),
+                best_move.moveID if best_move is not None else None)
+
     return max_score
 
 
+def boundType(score, alpha_original, beta):
+    """
+    Classifies a search result for the transposition table: a score at or below the original
+    alpha is only an upper bound, one at or above beta only a lower bound.
+    """
+    if score <= alpha_original:
+        return UPPER_BOUND
+    elif score >= beta:
+        return LOWER_BOUND
+    return EXACT
+
+
+def quiescence(game_state, alpha, beta, turn_multiplier, search):
+    """
+    Extends the search at the horizon through captures and promotions only, until the
+    position is quiet, so the static evaluation is never taken in the middle of an exchange.
+
+    - Stand pat: the side to move may decline all captures, so the static score is a lower bound
+      and a static score >= beta cuts off immediately.
+    - Delta pruning: captures that could not raise the score above alpha even with a margin
+      of DELTA_MARGIN pawns are skipped.
+    - Only captures and promotions are generated (GameState.getCaptureMoves), never the full
+      legal move list. When in check, all evasions are searched instead and mate is detected.
+
+    Args:
+        game_state (GameState): Current state of the board.
+        alpha (float): Alpha cutoff.
+        beta (float): Beta cutoff.
+        turn_multiplier (int): +1 for white’s turn, -1 for black’s turn.
+        search (SearchInfo): Shared state of the running search.
+
+    Returns:
+        float: Score from the perspective of the side to move.
+    """
+    # --- Budget Check ---
+    search.nodes += 1
+    if search.nodes >= search.next_check:
+        search.checkLimits()
+    if search.stopped:
+        return 0
+
+    ally_color = "w" if game_state.white_to_move else "b"
+    in_check = game_state.inCheck()
+
+    if in_check:
+        # --- In check: standing pat is not an option, try every legal evasion ---
+        moves = game_state.getValidMoves()
+        if len(moves) == 0:
+            return -CHECKMATE
+        best_score = -CHECKMATE
+        stand_pat = None
+    else:
+        # --- Stand Pat ---
+        stand_pat = turn_multiplier * scoreBoard(game_state)
+        if stand_pat >= beta:
+            return stand_pat
+        # Even winning a queen would not reach alpha: nothing here can help. A promotion can
+        # gain more than that (a queen captured and another made), so the shortcut is not taken
+        # while the side to move has a pawn on its seventh rank.
+        promotion_row = 1 if ally_color == "w" else 6
+        if stand_pat + piece_score["Q"] + DELTA_MARGIN < alpha and \
+                ally_color + "p" not in game_state.board[promotion_row]:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+        best_score = stand_pat
+        moves = game_state.getCaptureMoves()
+
+    # --- Explore captures, most valuable victim first ---
+    for move in sorted(moves, key=mvvLva, reverse=True):
+        # --- Delta Pruning ---
+        if stand_pat is not None and not move.is_pawn_promotion and \
+                stand_pat + piece_score[move.piece_captured[1]] + DELTA_MARGIN <= alpha:
+            continue
+
+        game_state.makeMove(move)
+
+        # Capture moves are pseudo-legal: skip any that leave our own king in check
+        if not in_check and game_state.kingInCheck(ally_color):
+            game_state.undoMove()
+            continue
+
+        score = -quiescence(game_state, -beta, -alpha, -turn_multiplier, search)
+        game_state.undoMove()
+
+        if search.stopped:
+            return 0
+
+        if score > best_score:
+            best_score = score
+        if best_score > alpha:
+            alpha = best_score
+        if alpha >= beta:
+            break
+
+    return best_score
+
+
+def mvvLva(move):
+    """
+    Most Valuable Victim / Least Valuable Attacker ordering score for captures and promotions.
+    Higher scores should be searched first.
+    """
+    victim = piece_score[move.piece_captured[1]] if move.is_capture else 0
+    if move.is_pawn_promotion:
+        victim += piece_score[move.promotion_piece]
+    return 10 * victim - piece_score[move.piece_moved[1]]
+
+
+def orderMoves(moves, hash_move_id, ply, search):
+    """
+    Sorts moves so the ones most likely to cause a cutoff are searched first:
+
+    1. The hash move (best move stored in the transposition table for this position)
+    2. Captures and promotions, by MVV-LVA: most valuable victim first, then least valuable attacker
+    3. Killer moves: quiet moves that caused a cutoff at the same ply elsewhere in the tree
+    4. Remaining quiet moves, by history score (how often they caused cutoffs so far)
+
+    Args:
+        moves (list): Moves to order (not modified).
+        hash_move_id (int): moveID of the hash move, or None.
+        ply (int): Distance from the root, used to look up killer moves.
+        search (SearchInfo): Holds the killer and history tables.
+
+    Returns:
+        list: The moves in search order.
+    """
+    killers = search.killers[ply]
+    history = search.history
+
+    def sort_key(move):
+        if move.moveID == hash_move_id:
+            key = (4, 0)
+        elif move.is_capture or move.is_pawn_promotion:
+            key = (3, mvvLva(move))
+        elif move.moveID == killers[0]:
+            key = (2, 1)
+        elif move.moveID == killers[1]:
+            key = (2, 0)
+        else:
+            key = (1, history.get((move.piece_moved, move.end_row, move.end_col), 0))
+
+        if search.randomize:
+            return key + (random.random(),)
+        return key
+
+    return sorted(moves, key=sort_key, reverse=True)
+
+
+def pickMoves(game_state, hash_move_id, ply, search):
+    """
+    Staged move picker: yields the legal moves in the same order as orderMoves, but only
+    does the work for a stage once every move of the previous stages has been searched
+    without a cutoff:
+
+    1. The hash move, if it is legal here
+    2. Captures and promotions, by MVV-LVA
+    3. Killer moves, if they are legal quiet moves here
+    4. Remaining quiet moves, by history score
+
+    The hash move and killers are tested on their own (GameState.getLegalMoveById) before
+    anything is generated, and captures and quiet moves are generated as separate stages
+    (getLegalCaptureMoves / getLegalQuietMoves). After a cutoff on the hash move, no other
+    move is generated at all; after a cutoff on a capture, no quiet move is.
+
+    Checkmate and stalemate are not detected here: when nothing is yielded the caller
+    decides between them (see findMoveNegaMaxAlphaBeta).
+
+    Args:
+        game_state (GameState): Position to pick moves for. The caller must have undone its
+            last move before asking for the next one.
+        hash_move_id (int): moveID of the hash move, or None.
+        ply (int): Distance from the root, used to look up killer moves.
+        search (SearchInfo): Holds the killer and history tables.
+
+    Yields:
+        Move: The legal moves, in search order.
+    """
+    context = game_state.prepareMoveGeneration()
+
+    # ---- 1. HASH MOVE ----
+    if hash_move_id is not None:
+        hash_move = game_state.getLegalMoveById(context, hash_move_id)
+        if hash_move is not None:
+            yield hash_move
+
+    # ---- 2. CAPTURES AND PROMOTIONS ----
+    captures = [move for move in game_state.getLegalCaptureMoves(context) if move.moveID != hash_move_id]
+    if search.randomize:
+        captures.sort(key=lambda move: (mvvLva(move), random.random()), reverse=True)
+    else:
+        captures.sort(key=mvvLva, reverse=True)
+    for move in captures:
+        yield move
+
+    # ---- 3. KILLER MOVES ----
+    # A killer comes from a sibling position, so it is only played if it is a legal quiet move here
+    killer_ids = []
+    for killer in search.killers[ply]:
+        if killer is None or killer == hash_move_id or killer in killer_ids:
+            continue
+        killer_move = game_state.getLegalMoveById(context, killer)
+        if killer_move is not None and not (killer_move.is_capture or killer_move.is_pawn_promotion):
+            killer_ids.append(killer)
+            yield killer_move
+
+    # ---- 4. QUIET MOVES ----
+    quiets = [
+        move for move in game_state.getLegalQuietMoves(context)
+        if move.moveID != hash_move_id and move.moveID not in killer_ids
+    ]
+    if quiets:
+        history = search.history
+
+        def history_key(move):
+            score = history.get((move.piece_moved, move.end_row, move.end_col), 0)
+            if search.randomize:
+                return score, random.random()
+            return score
+
+        quiets.sort(key=history_key, reverse=True)
+        for move in quiets:
+            yield move
+
+
+def recordQuietCutoff(move, ply, depth, search):
+    """
+    Updates the killer and history tables after a quiet move caused a beta cutoff.
+    Deeper cutoffs weigh more in the history table, since they prune more of the tree.
+    """
+    killers = search.killers[ply]
+    if killers[0] != move.moveID:
+        killers[1] = killers[0]
+        killers[0] = move.moveID
+
+    history_key = (move.piece_moved, move.end_row, move.end_col)
+    search.history[history_key] = search.history.get(history_key, 0) + depth * depth
+
+
 def scoreBoard(game_state):
     """
     Evaluates the current board state for the AI using multiple strategic heuristics:
     
     - Material value (standard piece worth)
     - Piece-square tables (positional value)
-    - Mobility (number of legal moves)
+    - Mobility (number of pseudo-legal moves)
     - King safety (nearby pawns)
     - Passed pawns (potential for promotion)
+      (both cached per pawn structure in the pawn hash table)
     - Bishop pair bonus (two bishops work well together)
 
     Returns:
@@ -214,97 +702,115 @@ def scoreBoard(game_state):
     # --- MOBILITY HEURISTIC ---
     def mobility_score(color):
         """
-        Calculates mobility by counting the number of legal moves available for the player.
-        Each legal move contributes +0.1 to the score.
+        Calculates mobility from the number of pseudo-legal moves available to the player,
+        counted from attack sets without generating moves or touching the game state.
+        Each move contributes MOBILITY_WEIGHT to the score.
         """
-        original_turn = game_state.white_to_move
-        game_state.white_to_move = (color == 'w')
-        moves = game_state.getValidMoves()
-        game_state.white_to_move = original_turn  # Restore game state
-        return len(moves) * 0.1
-
-    # --- KING SAFETY HEURISTIC ---
-    def king_safety_score(color):
-        """
-        Rewards positions where pawns are protecting the king.
-        Each adjacent pawn directly in front of the king adds +0.2 to the score.
-        """
-        king_pos = game_state.white_king_location if color == 'w' else game_state.black_king_location
-        row, col = king_pos
-        score = 0
-        pawn = 'wp' if color == 'w' else 'bp'
-        direction = -1 if color == 'w' else 1  # Pawns protect in front
-        for offset in [-1, 0, 1]:  # Left, front, right
-            r = row + direction
-            c = col + offset
-            if 0 <= r < 8 and 0 <= c < 8 and game_state.board[r][c] == pawn:
-                score += 0.2
-        return score
+        return game_state.getMobility(color) * MOBILITY_WEIGHT
 
-    # --- PASSED PAWN HEURISTIC ---
-    def is_passed_pawn(row, col, color):
-        """
-        Checks if the pawn has no opposing pawns in its file or adjacent files ahead of it.
-        Passed pawns get a bonus due to promotion potential.
-        """
-        direction = -1 if color == 'w' else 1
-        # Scan each square in front of the pawn in its file and adjacent files
-        for r in range(row + direction, 8 if color == 'w' else -1, direction):
-            for c in range(col - 1, col + 2):  # Same file, left, and right
-                if 0 <= c < 8:
-                    if game_state.board[r][c] == ('bp' if color == 'w' else 'wp'):
-                        return False
-        return True
-
-    
     # --- BISHOP PAIR BONUS ---
     def bishop_pair_bonus(color):
         """
         Rewards having both bishops (light- and dark-squared) on the board.
         Having a bishop pair is generally stronger than bishop + knight.
         """
-        count = 0
-        for row in game_state.board:
-            for piece in row:
-                if piece == color + 'B':
-                    count += 1
-        return 0.3 if count >= 2 else 0
-
-    # --- MAIN EVALUATION LOOP ---
-    score = 0  # Overall evaluation score
-
-    for row in range(8):
-        for col in range(8):
-            piece = game_state.board[row][col]
-            if piece != "--":
-                # --- Material Value ---
-                piece_val = piece_score[piece[1]]
-
-                # --- Positional Bonus ---
-                position_bonus = 0
-                if piece[1] != "K":  # King usually excluded from position tables
-                    # Get piece-square bonus (handles flipped boards for black)
-                    position_bonus = piece_position_scores.get(piece, [[0]*8]*8)[row][col]
-
-                # --- Passed Pawn Bonus ---
-                pawn_bonus = 0
-                if piece[1] == 'p' and is_passed_pawn(row, col, piece[0]):
-                    pawn_bonus = 0.5
-
-                # --- Combine Heuristics ---
-                if piece[0] == 'w':
-                    score += piece_val + position_bonus + pawn_bonus
-                else:
-                    score -= piece_val + position_bonus + pawn_bonus
+        return BISHOP_PAIR_BONUS if len(game_state.piece_locations[color + 'B']) >= 2 else 0
+
+    # --- MATERIAL AND POSITIONAL VALUE ---
+    # Kept up to date incrementally by makeMove/undoMove (King excluded from position tables)
+    material, position = game_state.material_score, game_state.position_score
+    score = (material['w'] + position['w']) - (material['b'] + position['b'])
+
+    # --- PAWN STRUCTURE (PASSED PAWNS, KING SAFETY) ---
+    # Cached by pawn structure, so this is normally a single table lookup
+    score += evaluatePawnStructure(game_state)[5]
 
     # --- Aggregate Additional Heuristics ---
     score += mobility_score('w') - mobility_score('b')
-    score += king_safety_score('w') - king_safety_score('b')
     score += bishop_pair_bonus('w') - bishop_pair_bonus('b')
 
     return score  # Final board score: >0 favors white, <0 favors black
 
 
+def evaluatePawnStructure(game_state):
+    """
+    Returns the pawn structure terms of the position from the pawn hash table, computing
+    and storing them first if the pawn structure has not been seen before.
+
+    Returns:
+        tuple: (key, white_passed, black_passed, white_shelter, black_shelter, score); see
+            PawnHashTable. `score` is positive when white's pawn structure is better.
+    """
+    entry = pawn_table.probe(game_state.pawn_key)
+    if entry is not None:
+        return entry
+
+    locations = game_state.piece_locations
+    white_passed = passedPawns(game_state.board, 'w', locations['wp'])
+    black_passed = passedPawns(game_state.board, 'b', locations['bp'])
+    white_shelter = kingShelterScore(game_state, 'w')
+    black_shelter = kingShelterScore(game_state, 'b')
+    score = (
+        PASSED_PAWN_BONUS * (white_passed.bit_count() - black_passed.bit_count()) +
+        white_shelter - black_shelter
+    )
+    return pawn_table.store(game_state.pawn_key, white_passed, black_passed,
+                            white_shelter, black_shelter, score)
+
+
+def passedPawns(board, color, pawn_squares=None):
+    """
+    Finds the passed pawns of `color`: pawns with no opposing pawn ahead of them on their own
+    file or either adjacent file. Passed pawns get a bonus due to promotion potential.
+
+    Args:
+        board (list of lists): current game board state
+        color (str): 'w' or 'b'.
+        pawn_squares (iterable): (row, col) of every pawn of `color` (GameState.piece_locations),
+            or None to find them by scanning the board.
+
+    Returns:
+        int: Bitboard with bit (row * 8 + col) set for every passed pawn.
+    """
+    pawn, enemy_pawn = (color + 'p', ('b' if color == 'w' else 'w') + 'p')
+    direction = -1 if color == 'w' else 1
+    last_row = -1 if color == 'w' else 8  # Scan up to and including the far edge
+
+    if pawn_squares is None:
+        pawn_squares = [(row, col) for row in range(8) for col in range(8) if board[row][col] == pawn]
+
+    passed = 0
+    for row, col in pawn_squares:
+        is_passed = True
+        # Scan each square in front of the pawn in its file and adjacent files
+        for r in range(row + direction, last_row, direction):
+            for c in range(max(col - 1, 0), min(col + 2, 8)):  # Left, same file, right
+                if board[r][c] == enemy_pawn:
+                    is_passed = False
+                    break
+            if not is_passed:
+                break
+        if is_passed:
+            passed |= 1 << (row * 8 + col)
+    return passed
+
+
+def kingShelterScore(game_state, color):
+    """
+    Rewards positions where pawns are protecting the king.
+    Each own pawn on one of the three squares directly in front of the king adds SHELTER_PAWN_BONUS.
+    """
+    row, col = game_state.white_king_location if color == 'w' else game_state.black_king_location
+    pawn = color + 'p'
+    r = row - 1 if color == 'w' else row + 1  # Pawns protect in front
+    score = 0
+    if 0 <= r < 8:
+        for c in (col - 1, col, col + 1):  # Left, front, right
+            if 0 <= c < 8 and game_state.board[r][c] == pawn:
+                score += SHELTER_PAWN_BONUS
+    return score
+
+
 def findRandomMove(valid_moves):
     """
     Selects a move at random from the list of valid moves.
@@ -331,6 +837,99 @@ def findRandomMove(valid_moves):
 # - It recursively simulates future game states up to a fixed depth.
 # - Alpha-beta pruning skips branches that won't influence the final decision, reducing computation.
 # - Each board state is evaluated using material values and positional advantage heuristics.
+#   Material and piece-square totals are maintained incrementally by the GameState, and pawn structure
+#   terms are cached in a pawn hash table, so most of a leaf evaluation is table lookups.
 # - Position tables reward center control, open files for rooks, advanced pawns, etc.
-# - Depth is limited to 3 plies for performance, but this can be increased for stronger play.
-# - The AI does not yet include move ordering or iterative deepening, which could further improve it.
+# - Iterative deepening searches 1, 2, 3... plies, so a time or node budget can stop it at any point
+#   and still return the best move of the last completed depth (3 plies by default).
+# - A transposition table keyed by Zobrist hash caches results so transposed positions are searched once.
+# - At the horizon a quiescence search keeps playing captures and promotions until the position is
+#   quiet, with stand-pat cutoffs and delta pruning, so evaluation never happens mid-exchange.
+# - Moves are ordered hash move first, then captures by MVV-LVA, then killer moves, then quiet moves
+#   by history score, so alpha-beta cuts off as early as possible.
+
+
+# ---- EVALUATION PARAMETERS ----
+
+def getEvaluationParameters():
+    """
+    Returns every tunable evaluation weight in the layout of the parameter file:
+
+        {
+            "piece_score": {"Q": 9, "R": 5, "B": 3, "N": 3, "p": 1},
+            "piece_square_tables": {"N": 8x8 list, "B": ..., "R": ..., "Q": ..., "p": ...},
+            "passed_pawn_bonus": 0.5,
+            "shelter_pawn_bonus": 0.2,
+            "mobility_weight": 0.1,
+            "bishop_pair_bonus": 0.3
+        }
+
+    Tables are in white's orientation (row 0 = rank 8). The king has no material value or table.
+    """
+    return {
+        "piece_score": {piece: piece_score[piece] for piece in piece_square_tables},
+        "piece_square_tables": {piece: [list(row) for row in table] for piece, table in piece_square_tables.items()},
+        "passed_pawn_bonus": PASSED_PAWN_BONUS,
+        "shelter_pawn_bonus": SHELTER_PAWN_BONUS,
+        "mobility_weight": MOBILITY_WEIGHT,
+        "bishop_pair_bonus": BISHOP_PAIR_BONUS
+    }
+
+
+def setEvaluationParameters(parameters):
+    """
+    Replaces the evaluation weights. Keys missing from `parameters` keep their current value.
+
+    Tables and piece values are updated in place, so every module that imported them (and the
+    flipped black tables, which share their rows) sees the new values. Incremental evaluation
+    totals of existing GameStates are not recomputed, so call this before creating games.
+
+    Raises:
+        ValueError: If a value has the wrong shape or an unknown piece.
+    """
+    global PASSED_PAWN_BONUS, SHELTER_PAWN_BONUS, MOBILITY_WEIGHT, BISHOP_PAIR_BONUS
+
+    if not isinstance(parameters, dict):
+        raise ValueError("Evaluation parameters must be a dictionary")
+
+    for piece, value in parameters.get("piece_score", {}).items():
+        if piece not in piece_square_tables:
+            raise ValueError("Unknown piece {!r} in piece_score".format(piece))
+        piece_score[piece] = float(value)
+
+    for piece, table in parameters.get("piece_square_tables", {}).items():
+        if piece not in piece_square_tables:
+            raise ValueError("Unknown piece {!r} in piece_square_tables".format(piece))
+        if len(table) != 8 or any(len(row) != 8 for row in table):
+            raise ValueError("Piece-square table for {!r} must be 8x8".format(piece))
+        for row, values in zip(piece_square_tables[piece], table):
+            row[:] = [float(value) for value in values]
+
+    PASSED_PAWN_BONUS = float(parameters.get("passed_pawn_bonus", PASSED_PAWN_BONUS))
+    SHELTER_PAWN_BONUS = float(parameters.get("shelter_pawn_bonus", SHELTER_PAWN_BONUS))
+    MOBILITY_WEIGHT = float(parameters.get("mobility_weight", MOBILITY_WEIGHT))
+    BISHOP_PAIR_BONUS = float(parameters.get("bishop_pair_bonus", BISHOP_PAIR_BONUS))
+
+    # Cached pawn structure scores were computed with the old weights
+    pawn_table.clear()
+
+
+def loadEvaluationParameters(path=EVAL_PARAMS_FILE):
+    """
+    Loads evaluation weights from a JSON parameter file (see getEvaluationParameters).
+
+    Returns:
+        bool: True if the file existed and was loaded.
+
+    Raises:
+        ValueError: If the file is not a valid parameter file.
+    """
+    if not os.path.exists(path):
+        return False
+    with open(path) as parameter_file:
+        setEvaluationParameters(json.load(parameter_file))
+    return True
+
+
+# Use the tuned weights, if any, from the start
+loadEvaluationParameters()
@@ -0,0 +1,193 @@
+"""
+Lazy SMP: several processes search the same position and share one transposition table.
+
+The main search runs in the calling process exactly like chessai.iterativeDeepening and its
+result is the one used. Helper processes run their own iterative deepening over the same
+position at the same time, with staggered depths (odd helpers start one ply deeper) and
+randomised move ordering so they explore different parts of the tree. They return nothing
+useful themselves: their only effect is filling the shared table (AI/shared_transposition.py)
+with scores, bounds and best moves that the main search then finds instead of searching.
+
+Helpers are persistent processes that stay attached to the table, so its contents carry over
+from one move to the next. They stop through a shared-memory flag as soon as the main search
+finishes.
+
+Run from the project root to compare it with the single-process search:
+    python -m AI.lazy_smp --threads 4 --depth 5
+    python -m AI.lazy_smp --threads 4 --time 10 --fen "<FEN>"
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import AI.chessai as ChessAI
+from AI.shared_transposition import SharedTranspositionTable
+from GameState.bitboard import BitboardGameState
+
+
+class LazySmpSearch:
+    """
+    Shared transposition table plus a pool of helper processes. Used from the main search's
+    process; create it once and reuse it for every search.
+    """
+
+    def __init__(self, threads=None, hash_mb=ChessAI.DEFAULT_SIZE_MB, state_class=BitboardGameState):
+        """
+        Creates the shared table and starts the helper processes.
+
+        Args:
+            threads (int): Total number of searching processes, including the calling one;
+                defaults to the number of CPUs.
+            hash_mb (int): Size of the shared transposition table in megabytes.
+            state_class (type): GameState implementation the helpers search with.
+        """
+        self.threads = threads or os.cpu_count() or 1
+        self.table = SharedTranspositionTable(hash_mb)
+
+        # Spawned, not forked, for the same reason as in AI/parallel_search.py
+        context = multiprocessing.get_context("spawn")
+        self.stop_flag = context.Value("b", 0, lock=False)
+
+        self.executor = None
+        if self.threads > 1:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.threads - 1,
+                mp_context=context,
+                initializer=_initHelper,
+                initargs=(self.table.name, self.stop_flag, state_class)
+            )
+
+
+    def close(self):
+        """
+        Shuts the helpers down and frees the shared table.
+        """
+        self.stop_flag.value = 1
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+        self.table.close()
+
+
+    def search(self, game_state, valid_moves, depth=None, time_limit=None, node_limit=None,
+               randomize=False, stop_flag=None, on_iteration=None):
+        """
+        Runs the main search with the helpers feeding the shared table.
+
+        Takes the same arguments as chessai.iterativeDeepening; the budget applies to the
+        main search, and the helpers stop when it returns.
+
+        Returns:
+            SearchInfo: The main search. `nodes` includes the helpers' nodes, `worker_nodes`
+                lists the nodes of every process and `principal_variation` the expected line.
+        """
+        self.stop_flag.value = 0
+        # Age the table before the helpers start storing, so their entries belong to this search
+        self.table.newSearch()
+        position = game_state.toBytes()
+        helpers = [
+            self.executor.submit(_helperSearch, position, helper_index)
+            for helper_index in range(1, self.threads)
+        ] if self.executor is not None else []
+
+        def report_iteration(search):
+            # The line is in the shared table, not the module-level one
+            search.principal_variation = ChessAI.principalVariation(
+                game_state, search.best_move, self.table, max_length=search.completed_depth
+            )
+            if on_iteration is not None:
+                on_iteration(search)
+
+        try:
+            search = ChessAI.iterativeDeepening(
+                game_state, valid_moves, depth, time_limit, node_limit, self.table, randomize,
+                stop_flag, report_iteration, new_search=False
+            )
+        finally:
+            self.stop_flag.value = 1
+
+        search.worker_nodes[os.getpid()] = search.nodes
+        for helper in helpers:
+            nodes, pid = helper.result()
+            search.worker_nodes[pid] = search.worker_nodes.get(pid, 0) + nodes
+            search.nodes += nodes
+
+        if search.principal_variation is None and search.best_move is not None:
+            search.principal_variation = [search.best_move]
+        return search
+
+
+# ---- HELPER PROCESS ----
+
+# State of a helper process, set up by _initHelper
+_helper = {}
+
+
+def _initHelper(table_name, stop_flag, state_class):
+    """
+    Runs once in every helper process: attaches to the shared table.
+    """
+    _helper["table"] = SharedTranspositionTable(name=table_name)
+    _helper["stop_flag"] = stop_flag
+    _helper["state_class"] = state_class
+    _helper["position"] = None  # Encoded root position the helper currently holds
+
+
+def _helperSearch(position, helper_index):
+    """
+    Searches the root position until the main search sets the stop flag.
+
+    Args:
+        position (bytes): Root position, encoded with GameState.toBytes.
+        helper_index (int): 1, 2, ...; odd helpers start their iterations one ply deeper.
+
+    Returns:
+        tuple: (nodes searched, pid)
+    """
+    if _helper["position"] != position:
+        _helper["position"] = position
+        _helper["game_state"] = _helper["state_class"].fromBytes(position)
+    game_state = _helper["game_state"]
+    valid_moves = game_state.getValidMoves()
+
+    nodes = 0
+    # Deepen until stopped; a helper that runs out of depth (e.g. after finding a mate) starts again
+    while valid_moves and not _helper["stop_flag"].value:
+        search = ChessAI.iterativeDeepening(
+            game_state, valid_moves, ChessAI.MAX_DEPTH, tt=_helper["table"], randomize=True,
+            stop_flag=_helper["stop_flag"], start_depth=1 + helper_index % 2, new_search=False
+        )
+        nodes += search.nodes
+    return nodes, os.getpid()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lazy SMP search benchmark.")
+    parser.add_argument("--fen", help="position to search (default: the start position)")
+    parser.add_argument("--threads", type=int, default=os.cpu_count(), help="searching processes")
+    parser.add_argument("--depth", type=int, help="search depth")
+    parser.add_argument("--time", type=float, help="time limit in seconds")
+    args = parser.parse_args()
+
+    game_state = BitboardGameState.fromFen(args.fen) if args.fen else BitboardGameState()
+    depth = args.depth if args.depth is not None or args.time is not None else ChessAI.DEPTH
+
+    # ---- SINGLE PROCESS ----
+    search = ChessAI.iterativeDeepening(game_state, game_state.getValidMoves(), depth, args.time)
+    print("serial:    ", search.best_move.getUciNotation(), search.report())
+
+    # ---- LAZY SMP ----
+    lazy_smp = LazySmpSearch(args.threads)
+    try:
+        start_time = time.perf_counter()
+        search = lazy_smp.search(game_state, game_state.getValidMoves(), depth, args.time)
+        print("{} threads:".format(lazy_smp.threads), search.best_move.getUciNotation(), search.report())
+        print("wall time {:.2f}s".format(time.perf_counter() - start_time))
+    finally:
+        lazy_smp.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+"""
+Parallel root search over a pool of persistent worker processes.
+
+Each iteration of iterative deepening splits the root moves between the workers
+("young brothers wait"):
+
+1. The first root move (the previous iteration's best) is searched with a full window, which
+   establishes alpha.
+2. The remaining root moves are queued on the pool at once. A worker picking one up reads the
+   current shared alpha and searches the move with the window (alpha - TIE_MARGIN, CHECKMATE),
+   so a move that cannot reach the best score so far fails low quickly. Every exact result that
+   raises alpha is published to the shared value, so moves started later search with tighter
+   windows.
+3. Results are merged deterministically: the best exact score wins, and ties go to the move
+   earlier in the root ordering. Fail-low results are only bounds and never chosen. Because the
+   window opens just below alpha, a move that only equals the best score still comes back
+   exact, whichever of the tied moves happened to finish first.
+
+Workers are persistent, so each keeps its own transposition table warm across iterations and
+moves; the hash size given is split between them. Searches stop cooperatively through a
+shared-memory flag, as in AI/worker.py, and a node budget is enforced through a shared node
+counter that every worker adds to as it searches.
+
+Run from the project root to measure the speedup over a single process:
+    python -m AI.parallel_search --threads 4 --depth 5
+    python -m AI.parallel_search --threads 4 --time 10 --fen "<FEN>"
+
+and to check that tied root moves are merged the same in either completion order:
+    python -m AI.parallel_search --tie-test --depth 3
+"""
+
+import argparse
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import AI.chessai as ChessAI
+from GameState.bitboard import BitboardGameState
+
+
+# Seconds between checks of the clock and stop flag while waiting for workers
+POLL_INTERVAL = 0.01
+
+# Queued root moves are searched from this far below the shared alpha, and scores closer than
+# this count as equal when merging, so ties are decided by root order rather than timing
+TIE_MARGIN = 1e-6
+
+# Default position for --tie-test: bare kings, where several king moves score the same
+TIE_TEST_FEN = "k7/8/8/8/8/8/8/K7 w - - 0 1"
+
+
+class ParallelSearch:
+    """
+    Pool of search processes plus the shared alpha and stop flag they poll. Used from the
+    coordinating process; create it once and reuse it for every search.
+    """
+
+    def __init__(self, threads=None, hash_mb=ChessAI.DEFAULT_SIZE_MB, state_class=BitboardGameState):
+        """
+        Starts the worker processes.
+
+        Args:
+            threads (int): Number of worker processes; defaults to the number of CPUs.
+            hash_mb (int): Total transposition table size in megabytes, divided evenly between
+                the workers (each has its own table).
+            state_class (type): GameState implementation the workers search with.
+        """
+        self.threads = threads or os.cpu_count() or 1
+        self.hash_mb = hash_mb
+
+        # Workers are spawned rather than forked: a fork from a search thread while another thread
+        # blocks reading stdin (as in uci.py) deadlocks the child when it closes its copy of stdin
+        context = multiprocessing.get_context("spawn")
+
+        # Shared by every worker: best exact root score of the current iteration, the stop flag
+        # and the number of nodes searched so far by all workers together
+        self.shared_alpha = context.Value("d", -ChessAI.CHECKMATE)
+        self.stop_flag = context.Value("b", 0, lock=False)
+        self.shared_nodes = context.Value("q", 0)
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.threads,
+            mp_context=context,
+            initializer=_initWorker,
+            initargs=(self.shared_alpha, self.stop_flag, state_class, hash_mb / self.threads,
+                      self.shared_nodes)
+        )
+
+
+    def close(self):
+        """
+        Shuts the worker processes down.
+        """
+        self.stop_flag.value = 1
+        self.executor.shutdown(wait=True)
+
+
+    def search(self, game_state, valid_moves, depth=None, time_limit=None, node_limit=None,
+               randomize=False, stop_flag=None, on_iteration=None):
+        """
+        Runs iterative deepening with every iteration's root moves searched in parallel.
+
+        Takes the same arguments as chessai.iterativeDeepening. The node limit applies to all
+        workers together: they count their nodes in a shared counter and stop once it is reached.
+
+        Returns:
+            SearchInfo: The finished search. `worker_nodes` holds the nodes searched by each
+                worker process and `principal_variation` the expected line.
+        """
+        if depth is None:
+            depth = ChessAI.DEPTH if time_limit is None and node_limit is None else ChessAI.MAX_DEPTH
+
+        # No table: every worker has its own
+        search = ChessAI.SearchInfo(None, depth, time_limit, node_limit, randomize, stop_flag)
+        if not valid_moves:
+            return search
+        position = game_state.toBytes()
+        root_moves = sorted(valid_moves, key=_rootOrderKey, reverse=True)
+        self.stop_flag.value = 0
+        self.shared_nodes.value = 0
+
+        for iteration_depth in range(1, depth + 1):
+            search.root_depth = iteration_depth
+            results = self._searchIteration(search, position, root_moves, iteration_depth)
+            if results is None:
+                break  # Stopped before the first move finished: nothing usable at this depth
+
+            best = _mergeResults(root_moves, results)
+            if self.stop_flag.value:
+                # Like the serial search, keep a partial iteration only if a move proved better
+                # than the previous best (which was searched first, with a full window)
+                if best is not None and search.completed_depth > 0 and best[0] is not root_moves[0]:
+                    search.best_move, search.principal_variation = best[0], best[2]
+                break
+
+            search.best_move, search.best_score, search.principal_variation = best
+            search.completed_depth = iteration_depth
+            if on_iteration is not None:
+                on_iteration(search)
+
+            # A forced mate will not change with more depth
+            if abs(search.best_score) >= ChessAI.CHECKMATE:
+                break
+
+            # Next iteration: best move first, then the others by this iteration's scores
+            scores = {move_id: result[0] for move_id, result in results.items()}
+            root_moves.sort(
+                key=lambda move: (move is search.best_move, scores.get(move.moveID, -ChessAI.CHECKMATE)),
+                reverse=True
+            )
+
+        if search.best_move is None:
+            search.best_move = root_moves[0]
+        return search
+
+
+    def _searchIteration(self, search, position, root_moves, depth):
+        """
+        Searches every root move at `depth`: the first one alone, then the rest in parallel.
+
+        Returns:
+            dict or None: Maps moveID to (score, exact, line) for every move that finished, or None
+                if the search was stopped before the first move finished.
+        """
+        results = {}
+        self.shared_alpha.value = -ChessAI.CHECKMATE
+
+        # ---- 1. FIRST MOVE, FULL WINDOW ----
+        first = self.executor.submit(
+            _searchRootMove, position, root_moves[0].moveID, depth, False, search.randomize,
+            search.node_limit
+        )
+        if not self._collect(search, [first], results):
+            return None
+
+        # ---- 2. REMAINING MOVES, SHARED ALPHA ----
+        futures = [
+            self.executor.submit(
+                _searchRootMove, position, move.moveID, depth, True, search.randomize,
+                search.node_limit
+            )
+            for move in root_moves[1:]
+        ]
+        self._collect(search, futures, results)
+        return results
+
+
+    def _collect(self, search, futures, results):
+        """
+        Waits for `futures`, recording their results and node counts, while enforcing the time
+        and node budget and the caller's stop flag.
+
+        Returns:
+            bool: True if every future finished without being stopped.
+        """
+        pending = set(futures)
+        complete = True
+        while pending:
+            done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                move_id, score, exact, nodes, pid, stopped, line = future.result()
+                search.nodes += nodes
+                search.worker_nodes[pid] = search.worker_nodes.get(pid, 0) + nodes
+                if stopped:
+                    complete = False
+                else:
+                    results[move_id] = (score, exact, line)
+
+            search.checkLimits()
+            if search.stopped:
+                self.stop_flag.value = 1
+        return complete and not self.stop_flag.value
+
+
+def _rootOrderKey(move):
+    """
+    Initial root move order: captures and promotions first, by MVV-LVA.
+    """
+    if move.is_capture or move.is_pawn_promotion:
+        return (1, ChessAI.mvvLva(move))
+    return (0, 0)
+
+
+def _mergeResults(root_moves, results):
+    """
+    Picks the best root move from the results of an iteration: the highest exact score,
+    ties going to the move searched earlier. The first move (full window) is always exact.
+
+    Returns:
+        tuple or None: (move, score, principal variation), or None if no move has an exact score.
+    """
+    best = None
+    for move in root_moves:
+        if move.moveID not in results:
+            continue
+        score, exact, line = results[move.moveID]
+        if exact and (best is None or score > best[1] + TIE_MARGIN):
+            best = (move, score, line)
+    return best
+
+
+# ---- WORKER PROCESS ----
+
+# State of a worker process, set up by _initWorker
+_worker = {}
+
+
+class _SharedNodeSearch(ChessAI.SearchInfo):
+    """
+    SearchInfo for one root move in a worker, whose node limit is shared by all workers: at
+    every budget check it adds its new nodes to the shared counter and stops once the total
+    reaches the limit. The limit can be overshot by at most NODE_CHECK_INTERVAL per worker.
+    """
+
+    def __init__(self, table, max_depth, node_limit, shared_nodes, randomize=False, stop_flag=None):
+        """
+        Args:
+            node_limit (int): Node budget of the whole parallel search, or None.
+            shared_nodes (Value): Nodes searched so far by every worker together.
+        """
+        super().__init__(table, max_depth, randomize=randomize, stop_flag=stop_flag)
+        self.shared_node_limit = node_limit
+        self.shared_nodes = shared_nodes
+        self.reported_nodes = 0  # Nodes of this search already added to the shared counter
+
+
+    def checkLimits(self):
+        """
+        Checks the stop flag (see SearchInfo.checkLimits) and the shared node budget.
+        """
+        super().checkLimits()
+        total = self.reportNodes()
+        if self.shared_node_limit is not None and total >= self.shared_node_limit:
+            self.stopped = True
+
+
+    def reportNodes(self):
+        """
+        Adds the nodes searched since the last report to the shared counter.
+
+        Returns:
+            int: The shared total.
+        """
+        with self.shared_nodes.get_lock():
+            self.shared_nodes.value += self.nodes - self.reported_nodes
+            total = self.shared_nodes.value
+        self.reported_nodes = self.nodes
+        return total
+
+
+def _initWorker(shared_alpha, stop_flag, state_class, hash_mb, shared_nodes):
+    """
+    Runs once in every worker process.
+    """
+    _worker["shared_alpha"] = shared_alpha
+    _worker["stop_flag"] = stop_flag
+    _worker["shared_nodes"] = shared_nodes
+    _worker["state_class"] = state_class
+    _worker["position"] = None  # Encoded root position the worker currently holds
+    ChessAI.transposition_table.resize(hash_mb)
+
+
+def _searchRootMove(position, move_id, depth, use_shared_alpha, randomize, node_limit):
+    """
+    Searches one root move in a worker process.
+
+    Args:
+        position (bytes): Root position, encoded with GameState.toBytes.
+        move_id (int): moveID of the root move to search.
+        depth (int): Depth of the iteration (the move's subtree is searched to depth - 1).
+        use_shared_alpha (bool): Start from the shared alpha; otherwise search a full window.
+        randomize (bool): Break move-ordering ties at random.
+        node_limit (int): Node budget of the whole search (all workers together), or None.
+
+    Returns:
+        tuple: (move_id, score, exact, nodes, pid, stopped, principal variation (list of Move)).
+            `exact` is False when the move failed low, i.e. `score` is only an upper bound.
+    """
+    # Decode the root position only when it changed (a new search)
+    if _worker["position"] != position:
+        _worker["position"] = position
+        _worker["game_state"] = _worker["state_class"].fromBytes(position)
+        _worker["root_moves"] = {move.moveID: move for move in _worker["game_state"].getValidMoves()}
+        ChessAI.transposition_table.newSearch()
+    game_state = _worker["game_state"]
+    move = _worker["root_moves"][move_id]
+
+    search = _SharedNodeSearch(ChessAI.transposition_table, depth, node_limit, _worker["shared_nodes"],
+                               randomize=randomize, stop_flag=_worker["stop_flag"])
+    # Moves still queued when the budget runs out or the search is stopped do not start at all
+    search.checkLimits()
+    if search.stopped:
+        return move_id, -ChessAI.CHECKMATE, False, 0, os.getpid(), True, []
+    search.root_depth = depth  # The move's subtree is one ply below the root
+    # Open the window just below the shared alpha, so a score equal to it is still exact
+    alpha = _worker["shared_alpha"].value - TIE_MARGIN if use_shared_alpha else -ChessAI.CHECKMATE
+    turn_multiplier = 1 if game_state.white_to_move else -1
+
+    game_state.makeMove(move)
+    score = -ChessAI.findMoveNegaMaxAlphaBeta(
+        game_state, None, depth - 1, -ChessAI.CHECKMATE, -alpha, -turn_multiplier, search
+    )
+    game_state.undoMove()
+    search.reportNodes()  # Count the nodes since the last budget check
+
+    exact = score > alpha or not use_shared_alpha
+    line = []
+    if not search.stopped and exact:
+        # Publish the improved bound for the moves still to be searched
+        shared_alpha = _worker["shared_alpha"]
+        with shared_alpha.get_lock():
+            if score > shared_alpha.value:
+                shared_alpha.value = score
+        line = ChessAI.principalVariation(game_state, move, max_length=depth)
+
+    return move_id, score, exact, search.nodes, os.getpid(), search.stopped, line
+
+
+def checkTieOrder(game_state, depth):
+    """
+    Checks that tied best root moves are merged the same way whichever of them finishes first.
+
+    Runs in the calling process: every root move is searched with a full window to find the
+    moves sharing the best score, then the first two of them are searched as queued moves
+    (with the shared alpha) in both completion orders. Either way the move earlier in the
+    root order must win.
+
+    Args:
+        game_state (GameState): Position to test; it needs at least two tied best moves.
+        depth (int): Iteration depth to search the root moves at.
+
+    Returns:
+        tuple or None: (earlier move, later move, winner when the earlier finishes first,
+            winner when the later finishes first), or None if the position has no tie.
+    """
+    context = multiprocessing.get_context("spawn")
+    shared_alpha = context.Value("d", -ChessAI.CHECKMATE)
+    _initWorker(shared_alpha, context.Value("b", 0, lock=False), type(game_state), ChessAI.DEFAULT_SIZE_MB,
+                context.Value("q", 0))
+    position = game_state.toBytes()
+    root_moves = sorted(game_state.getValidMoves(), key=_rootOrderKey, reverse=True)
+
+    # ---- 1. FIND THE TIED BEST MOVES ----
+    scores = {}
+    for move in root_moves:
+        ChessAI.transposition_table.clear()
+        scores[move.moveID] = _searchRootMove(position, move.moveID, depth, False, False, None)[1]
+    best_score = max(scores.values())
+    tied = [move for move in root_moves if scores[move.moveID] >= best_score - TIE_MARGIN]
+    if len(tied) < 2:
+        return None
+    earlier, later = tied[0], tied[1]
+
+    # ---- 2. SEARCH THEM AS QUEUED MOVES IN BOTH ORDERS ----
+    winners = []
+    for completion_order in ((earlier, later), (later, earlier)):
+        ChessAI.transposition_table.clear()
+        shared_alpha.value = -ChessAI.CHECKMATE
+        results = {}
+        for move in completion_order:
+            move_id, score, exact = _searchRootMove(position, move.moveID, depth, True, False, None)[:3]
+            results[move_id] = (score, exact, [])
+        best = _mergeResults([earlier, later], results)
+        winners.append(best[0] if best is not None else None)
+    return earlier, later, winners[0], winners[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel root search benchmark.")
+    parser.add_argument("--fen", help="position to search (default: the start position)")
+    parser.add_argument("--threads", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--depth", type=int, help="search depth")
+    parser.add_argument("--time", type=float, help="time limit in seconds")
+    parser.add_argument("--tie-test", action="store_true",
+                        help="check that tied root moves merge the same in either completion order")
+    args = parser.parse_args()
+
+    game_state = BitboardGameState.fromFen(args.fen) if args.fen else BitboardGameState()
+    depth = args.depth if args.depth is not None or args.time is not None else ChessAI.DEPTH
+
+    if args.tie_test:
+        if not args.fen:
+            game_state = BitboardGameState.fromFen(TIE_TEST_FEN)
+        result = checkTieOrder(game_state, depth)
+        if result is None:
+            print("no tied best moves in this position")
+            return
+        earlier, later, first_winner, second_winner = result
+        ok = first_winner is earlier and second_winner is earlier
+        print("{} tie {} / {}: {} finishing first -> {}, {} finishing first -> {}".format(
+            "ok  " if ok else "FAIL", earlier.getUciNotation(), later.getUciNotation(),
+            earlier.getUciNotation(), first_winner.getUciNotation() if first_winner else None,
+            later.getUciNotation(), second_winner.getUciNotation() if second_winner else None
+        ))
+        return
+
+    # ---- SINGLE PROCESS ----
+    search = ChessAI.iterativeDeepening(game_state, game_state.getValidMoves(), depth, args.time)
+    print("serial:    ", search.best_move.getUciNotation(), search.report())
+
+    # ---- PARALLEL ----
+    parallel = ParallelSearch(args.threads)
+    try:
+        start_time = time.perf_counter()
+        search = parallel.search(game_state, game_state.getValidMoves(), depth, args.time)
+        print("{} workers:".format(parallel.threads), search.best_move.getUciNotation(), search.report())
+        print("wall time {:.2f}s".format(time.perf_counter() - start_time))
+    finally:
+        parallel.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Pawn structure hash table for the evaluation.
+
+Passed pawns and king shelter only depend on where the pawns and kings stand, which changes far
+less often during a search than the rest of the position. Their evaluation is therefore cached
+under GameState.pawn_key (a Zobrist key over pawns and kings only), so most leaves reuse an
+earlier result instead of rescanning the pawns.
+"""
+
+# Rough memory cost of one stored entry (a 6-tuple plus its members and list slot).
+# Used only to turn a kilobyte budget into a number of slots.
+ENTRY_SIZE_BYTES = 200
+
+DEFAULT_SIZE_KB = 1024
+
+
+class PawnHashTable:
+    """
+    Direct-mapped cache of pawn structure terms keyed by pawn key.
+
+    Entries are tuples: (key, white_passed, black_passed, white_shelter, black_shelter, score),
+    where the passed values are bitboards of each side's passed pawns (bit row * 8 + col), the
+    shelter values are each side's king shelter score, and `score` is the total of all pawn
+    structure terms from white's perspective. Further pawn terms (doubled, isolated, ...) can
+    be folded into `score` without changing the table.
+    """
+
+    def __init__(self, size_kb=DEFAULT_SIZE_KB):
+        """
+        Args:
+            size_kb (float): Approximate memory budget for the table in kilobytes.
+        """
+        self.resize(size_kb)
+
+
+    def resize(self, size_kb):
+        """
+        Reallocates the table for a new memory budget, discarding all entries.
+        The slot count is rounded down to a power of two so indexing is a single mask.
+        """
+        self.size_kb = size_kb
+        max_slots = max(1, int(size_kb * 1024) // ENTRY_SIZE_BYTES)
+        self.num_slots = 1 << (max_slots.bit_length() - 1)
+        self.index_mask = self.num_slots - 1
+        self.clear()
+
+
+    def clear(self):
+        """
+        Empties the table and resets the statistics.
+        """
+        self.entries = [None] * self.num_slots
+        self.resetStats()
+
+
+    def resetStats(self):
+        """
+        Resets the hit/miss counters.
+        """
+        self.hits = 0    # Probes that found the pawn structure
+        self.misses = 0  # Probes that had to compute it
+
+
+    def hitRate(self):
+        """
+        Returns the fraction of probes answered from the table (0.0 - 1.0).
+        """
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+
+    def probe(self, key):
+        """
+        Looks up a pawn structure.
+
+        Args:
+            key (int): Pawn key of the position (GameState.pawn_key).
+
+        Returns:
+            tuple or None: The stored entry if found.
+        """
+        entry = self.entries[key & self.index_mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+
+    def store(self, key, white_passed, black_passed, white_shelter, black_shelter, score):
+        """
+        Records the pawn structure terms of a position, replacing whatever shared its slot.
+
+        Returns:
+            tuple: The stored entry.
+        """
+        entry = (key, white_passed, black_passed, white_shelter, black_shelter, score)
+        self.entries[key & self.index_mask] = entry
+        return entry
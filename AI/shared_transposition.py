@@ -0,0 +1,219 @@
+"""
+Transposition table in shared memory, for searches running in several processes at once
+(see AI/lazy_smp.py).
+
+It has the same interface and replacement scheme as TranspositionTable (two slots per bucket:
+depth-preferred and always-replace), but the entries live in one multiprocessing.shared_memory
+block instead of a Python list, so every process attached to the table reads and writes the
+same entries.
+
+Entries are written without locks. Each entry is three 64-bit words:
+
+    word 0   checksum: key ^ word 1 ^ word 2
+    word 1   score (the bits of a float64)
+    word 2   bits 0-7 depth, 8-9 flag, 10-17 age, 18-49 best_move_id + 1 (0 = none), bit 63 valid
+
+A reader recomputes the key from the three words, so an entry torn by two processes writing
+the same slot at once (or belonging to another position) simply reads as a miss.
+
+The first word of the block holds the search age, shared by every process.
+"""
+
+import struct
+from multiprocessing import shared_memory
+
+from AI.transposition import DEFAULT_SIZE_MB
+
+
+ENTRY_WORDS = 3
+ENTRY_SIZE_BYTES = ENTRY_WORDS * 8
+HEADER_WORDS = 1
+
+VALID_BIT = 1 << 63
+MOVE_SHIFT = 18
+MOVE_MASK = 0xFFFFFFFF
+
+_FLOAT = struct.Struct("<d")
+_WORD = struct.Struct("<Q")
+
+
+def _scoreToBits(score):
+    """Returns the bits of `score` as a float64, as an unsigned integer."""
+    return _WORD.unpack(_FLOAT.pack(score))[0]
+
+
+def _bitsToScore(bits):
+    """Inverse of _scoreToBits."""
+    return _FLOAT.unpack(_WORD.pack(bits))[0]
+
+
+class SharedTranspositionTable:
+    """
+    Hash table of search results keyed by Zobrist key, shared between processes.
+
+    Entries are returned as the same tuples as TranspositionTable.probe:
+    (key, depth, score, flag, best_move_id, age). Hit/miss statistics are per process.
+    """
+
+    def __init__(self, size_mb=DEFAULT_SIZE_MB, name=None):
+        """
+        Creates a new table, or attaches to an existing one.
+
+        Args:
+            size_mb (float): Approximate memory budget in megabytes (ignored when attaching).
+            name (str): Name of an existing table's shared memory block (see `name`), or None
+                to create a new table. The creating process owns the block and must close() it.
+        """
+        if name is None:
+            max_buckets = max(1, int(size_mb * 1024 * 1024) // (2 * ENTRY_SIZE_BYTES))
+            num_buckets = 1 << (max_buckets.bit_length() - 1)
+            size = (HEADER_WORDS + 2 * num_buckets * ENTRY_WORDS) * 8
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+            self.owner = False
+            # The block may be rounded up to a page, so derive the bucket count from the entries
+            num_buckets = 1 << (((len(self.memory.buf) // 8 - HEADER_WORDS) // (2 * ENTRY_WORDS)).bit_length() - 1)
+
+        self.name = self.memory.name
+        self.size_mb = num_buckets * 2 * ENTRY_SIZE_BYTES / (1024 * 1024)
+        self.num_buckets = num_buckets
+        self.index_mask = num_buckets - 1
+        self.words = self.memory.buf.cast("Q")
+        self.resetStats()
+
+
+    def close(self):
+        """
+        Detaches from the shared memory block; the owner also frees it.
+        """
+        self.words.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+    def clear(self):
+        """
+        Empties the table (for every attached process) and resets the statistics.
+        """
+        self.memory.buf[HEADER_WORDS * 8:] = bytes(len(self.memory.buf) - HEADER_WORDS * 8)
+        self.resetStats()
+
+
+    def resetStats(self):
+        """
+        Resets the hit/miss/collision counters of this process.
+        """
+        self.hits = 0        # Probes that found the position
+        self.misses = 0      # Probes that did not find the position
+        self.collisions = 0  # Misses where the bucket was occupied by other positions
+        self.stores = 0      # Entries written
+
+
+    @property
+    def age(self):
+        """
+        Age of the current search, shared by every attached process.
+        """
+        return self.words[0]
+
+
+    def newSearch(self):
+        """
+        Marks the start of a new search. Only the owner advances the shared age; for the
+        other processes the age simply follows it.
+        """
+        if self.owner:
+            self.words[0] = (self.words[0] + 1) & 0xFF
+
+
+    def _read(self, slot, key):
+        """
+        Decodes the entry in `slot` if it holds `key`.
+
+        Returns:
+            tuple or None: (entry or None, whether the slot holds any valid entry)
+        """
+        words = self.words
+        base = HEADER_WORDS + slot * ENTRY_WORDS
+        check, score_bits, data = words[base], words[base + 1], words[base + 2]
+        if not data & VALID_BIT:
+            return None, False
+        if check ^ score_bits ^ data != key:
+            return None, True
+        move = (data >> MOVE_SHIFT) & MOVE_MASK
+        return (key, data & 0xFF, _bitsToScore(score_bits), (data >> 8) & 0x3,
+                move - 1 if move else None, (data >> 10) & 0xFF), True
+
+
+    def probe(self, key):
+        """
+        Looks up a position.
+
+        Args:
+            key (int): Zobrist key of the position.
+
+        Returns:
+            tuple or None: (key, depth, score, flag, best_move_id, age) if found.
+        """
+        slot = (key & self.index_mask) << 1
+
+        entry, occupied = self._read(slot, key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        other, other_occupied = self._read(slot + 1, key)
+        if other is not None:
+            self.hits += 1
+            return other
+
+        self.misses += 1
+        if occupied or other_occupied:
+            self.collisions += 1
+        return None
+
+
+    def store(self, key, depth, score, flag, best_move_id=None):
+        """
+        Records a search result, with the same replacement rules as TranspositionTable.store.
+
+        Args:
+            key (int): Zobrist key of the position.
+            depth (int): Remaining search depth the score was computed with.
+            score (float): Score from the perspective of the side to move.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+            best_move_id (int): moveID of the best move, or None.
+        """
+        words = self.words
+        slot = (key & self.index_mask) << 1
+        age = self.age
+        self.stores += 1
+
+        # Depth-preferred slot, unless it holds a deeper result of this search for another position
+        base = HEADER_WORDS + slot * ENTRY_WORDS
+        current = words[base + 2]
+        if current & VALID_BIT and (current & 0xFF) > depth and (current >> 10) & 0xFF == age and \
+                words[base] ^ words[base + 1] ^ current != key:
+            base += ENTRY_WORDS
+
+        score_bits = _scoreToBits(score)
+        data = (
+            VALID_BIT | (depth & 0xFF) | (flag << 8) | (age << 10) |
+            ((best_move_id + 1 if best_move_id is not None else 0) << MOVE_SHIFT)
+        )
+        words[base + 1] = score_bits
+        words[base + 2] = data
+        words[base] = key ^ score_bits ^ data
+
+
+    def usage(self):
+        """
+        Returns the fraction of slots in use (0.0 - 1.0).
+        """
+        words = self.words
+        slots = 2 * self.num_buckets
+        used = sum(1 for slot in range(slots) if words[HEADER_WORDS + slot * ENTRY_WORDS + 2] & VALID_BIT)
+        return used / slots
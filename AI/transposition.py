@@ -0,0 +1,139 @@
+"""
+Fixed-size transposition table for the negamax search.
+
+Positions are identified by their 64-bit Zobrist key (GameState.zobrist_key). Each bucket holds
+two entries: a depth-preferred slot that keeps the most expensive result seen for that bucket,
+and an always-replace slot that keeps the most recent one. The table lives for the lifetime of
+the process, so results from the previous AI turn are reused on the next.
+"""
+
+# --- BOUND TYPES ---
+
+EXACT = 0        # Score is the true negamax value of the position
+LOWER_BOUND = 1  # Search failed high (score >= beta): true value is at least `score`
+UPPER_BOUND = 2  # Search failed low (score <= alpha): true value is at most `score`
+
+# Rough memory cost of one stored entry: a 6-tuple plus its int/float members and list slot.
+# Used only to turn a megabyte budget into a number of buckets.
+ENTRY_SIZE_BYTES = 160
+
+DEFAULT_SIZE_MB = 16
+
+
+class TranspositionTable:
+    """
+    Hash table of search results keyed by Zobrist key.
+
+    Entries are tuples: (key, depth, score, flag, best_move_id, age), where `best_move_id`
+    is the Move.moveID of the best (or refuting) move found, or None.
+    """
+
+    def __init__(self, size_mb=DEFAULT_SIZE_MB):
+        """
+        Args:
+            size_mb (float): Approximate memory budget for the table in megabytes.
+        """
+        self.resize(size_mb)
+
+
+    def resize(self, size_mb):
+        """
+        Reallocates the table for a new memory budget, discarding all entries.
+        The bucket count is rounded down to a power of two so indexing is a single mask.
+        """
+        self.size_mb = size_mb
+        max_buckets = max(1, int(size_mb * 1024 * 1024) // (2 * ENTRY_SIZE_BYTES))
+        self.num_buckets = 1 << (max_buckets.bit_length() - 1)
+        self.index_mask = self.num_buckets - 1
+        self.clear()
+
+
+    def clear(self):
+        """
+        Empties the table and resets the statistics.
+        """
+        # Slot 2*i is the depth-preferred entry of bucket i, slot 2*i + 1 the always-replace entry
+        self.entries = [None] * (2 * self.num_buckets)
+        self.age = 0
+        self.resetStats()
+
+
+    def resetStats(self):
+        """
+        Resets the hit/miss/collision counters.
+        """
+        self.hits = 0        # Probes that found the position
+        self.misses = 0      # Probes that did not find the position
+        self.collisions = 0  # Misses where the bucket was occupied by other positions
+        self.stores = 0      # Entries written
+
+
+    def newSearch(self):
+        """
+        Marks the start of a new search. Entries from earlier searches stay usable but are
+        the first to be replaced in the depth-preferred slot.
+        """
+        self.age += 1
+
+
+    def probe(self, key):
+        """
+        Looks up a position.
+
+        Args:
+            key (int): Zobrist key of the position.
+
+        Returns:
+            tuple or None: (key, depth, score, flag, best_move_id, age) if found.
+        """
+        index = (key & self.index_mask) << 1
+        entries = self.entries
+
+        entry = entries[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+
+        other = entries[index + 1]
+        if other is not None and other[0] == key:
+            self.hits += 1
+            return other
+
+        self.misses += 1
+        if entry is not None or other is not None:
+            self.collisions += 1
+        return None
+
+
+    def store(self, key, depth, score, flag, best_move_id=None):
+        """
+        Records a search result.
+
+        The depth-preferred slot is overwritten when the new result is at least as deep,
+        when it already holds this position, or when it is left over from an older search.
+        Otherwise the result goes into the always-replace slot.
+
+        Args:
+            key (int): Zobrist key of the position.
+            depth (int): Remaining search depth the score was computed with.
+            score (float): Score from the perspective of the side to move.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+            best_move_id (int): moveID of the best move, or None.
+        """
+        index = (key & self.index_mask) << 1
+        entries = self.entries
+        new_entry = (key, depth, score, flag, best_move_id, self.age)
+        self.stores += 1
+
+        current = entries[index]
+        if current is None or current[0] == key or depth >= current[1] or current[5] != self.age:
+            entries[index] = new_entry
+        else:
+            entries[index + 1] = new_entry
+
+
+    def usage(self):
+        """
+        Returns the fraction of slots in use (0.0 - 1.0).
+        """
+        return sum(1 for entry in self.entries if entry is not None) / len(self.entries)
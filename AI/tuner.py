@@ -0,0 +1,408 @@
+"""
+Texel-style tuning of the evaluation weights.
+
+Fits every weight of scoreBoard (piece values, the five piece-square tables and the passed pawn,
+king shelter, mobility and bishop pair weights) to a set of positions labelled with the result
+of the game they came from, by minimising
+
+    mean((result - sigmoid(score)) ** 2),    sigmoid(score) = 1 / (1 + 10 ** (-K * score / 4))
+
+where score is the static evaluation in pawns from white's perspective and K scales scores to
+winning chances (fitted to the data before tuning).
+
+The evaluation is linear in its weights, so each position is reduced once to its piece indices
+(AI/batch_eval.py encoding) and its term counts (batch_eval.termFeatures), and every optimisation
+step is a handful of vectorised NumPy operations over the whole set. Reading and feature
+extraction, which dominate for large files, run in parallel worker processes.
+
+Input: one position per line, a FEN followed by the game result from white's perspective as the
+last token: 1-0, 0-1, 1/2-1/2, or 1.0, 0.0, 0.5 (optionally in brackets or quotes, e.g.
+EPD lines ending in c9 "1-0";). Blank lines and lines starting with # are ignored.
+
+Run from the project root:
+    python -m AI.tuner positions.epd                       # writes AI/eval_params.json
+    python -m AI.tuner positions.epd --epochs 500 --limit 1000000 --output tuned.json
+
+The engine loads AI/eval_params.json at startup (see chessai.loadEvaluationParameters).
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+import AI.chessai as ChessAI
+import AI.batch_eval as BatchEval
+from GameState.serialization import parseFen, PIECE_CODES
+
+
+# Piece types with a value and a table, in PIECE_CODES order
+TUNED_PIECES = ("p", "N", "B", "R", "Q")
+
+# Layout of the parameter vector: piece values, then the tables (white orientation, 64 squares
+# each, square = row * 8 + col), then the term weights in batch_eval.TERMS order
+MATERIAL_OFFSET = 0
+TABLE_OFFSET = MATERIAL_OFFSET + len(TUNED_PIECES)
+TERM_OFFSET = TABLE_OFFSET + len(TUNED_PIECES) * 64
+NUM_PARAMETERS = TERM_OFFSET + len(BatchEval.TERMS)
+
+# Positions processed per vectorised block (bounds the size of temporary arrays)
+BLOCK_SIZE = 1 << 16
+
+# Lines handed to a worker process at a time
+DEFAULT_CHUNK_SIZE = 10000
+
+DEFAULT_EPOCHS = 200
+DEFAULT_LEARNING_RATE = 0.005
+
+# Results in the input file -> score from white's perspective
+RESULTS = {
+    "1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5,
+    "1.0": 1.0, "0.0": 0.0, "0.5": 0.5, "1": 1.0, "0": 0.0
+}
+
+
+def _buildSlotTable():
+    """
+    Maps every (piece index, square) of the batch encoding to the slot of the signed value table
+    it scores with (see _signedValues): white pieces use slots 0 .. NUM_TABLE_SLOTS - 1, black
+    pieces the same table negated and mirrored vertically (square ^ 56), and empty squares and
+    kings NO_SLOT.
+    """
+    slots = np.full((BatchEval.EMPTY + 1, 64), NO_SLOT, dtype=np.int16)
+    for index, piece in enumerate(PIECE_CODES):
+        if piece[1] not in TUNED_PIECES:
+            continue
+        offset = TUNED_PIECES.index(piece[1]) * 64
+        for square in range(64):
+            if piece[0] == "w":
+                slots[index, square] = offset + square
+            else:
+                slots[index, square] = NUM_TABLE_SLOTS + offset + (square ^ 56)
+    return slots
+
+
+NUM_TABLE_SLOTS = len(TUNED_PIECES) * 64
+NO_SLOT = -1
+SQUARE_SLOTS = _buildSlotTable()
+
+# Board strings -> batch encoding
+_PIECE_INDEX = {piece: index for index, piece in enumerate(PIECE_CODES)}
+_PIECE_INDEX["--"] = BatchEval.EMPTY
+
+
+# ---- PARAMETERS ----
+
+def packParameters(parameters):
+    """
+    Flattens a parameter dictionary (chessai.getEvaluationParameters layout) into a vector.
+    """
+    vector = np.empty(NUM_PARAMETERS)
+    for i, piece in enumerate(TUNED_PIECES):
+        vector[MATERIAL_OFFSET + i] = parameters["piece_score"][piece]
+        table = np.array(parameters["piece_square_tables"][piece], dtype=float).ravel()
+        vector[TABLE_OFFSET + i * 64:TABLE_OFFSET + (i + 1) * 64] = table
+    for i, (name, _) in enumerate(BatchEval.TERMS):
+        vector[TERM_OFFSET + i] = parameters[name]
+    return vector
+
+
+def unpackParameters(vector, decimals=4):
+    """
+    Turns a parameter vector back into a parameter dictionary, rounding every weight.
+    """
+    parameters = {"piece_score": {}, "piece_square_tables": {}}
+    for i, piece in enumerate(TUNED_PIECES):
+        parameters["piece_score"][piece] = round(float(vector[MATERIAL_OFFSET + i]), decimals)
+        table = vector[TABLE_OFFSET + i * 64:TABLE_OFFSET + (i + 1) * 64].reshape(8, 8)
+        parameters["piece_square_tables"][piece] = [[round(float(value), decimals) for value in row] for row in table]
+    for i, (name, _) in enumerate(BatchEval.TERMS):
+        parameters[name] = round(float(vector[TERM_OFFSET + i]), decimals)
+    return parameters
+
+
+# ---- READING LABELLED POSITIONS ----
+
+def parseLabelledLine(line):
+    """
+    Parses one input line into (piece indices, result).
+
+    Returns:
+        tuple or None: (list of 64 piece indices, float result), or None for blank and comment lines.
+
+    Raises:
+        ValueError: If the line has no valid FEN or result.
+    """
+    tokens = line.replace(";", " ").split()
+    if not tokens or tokens[0].startswith("#"):
+        return None
+
+    result_text = tokens[-1].strip("[]\"'")
+    if result_text not in RESULTS:
+        raise ValueError("Unknown result {!r}".format(tokens[-1]))
+
+    board = parseFen(" ".join(tokens[:4]))["board"]
+    return [_PIECE_INDEX[piece] for row in board for piece in row], RESULTS[result_text]
+
+
+def _extractChunk(lines):
+    """
+    Worker function: turns a chunk of input lines into arrays.
+
+    Every position is reduced to the value table slots of its pieces (kings excluded), stored
+    back to back, plus its term counts.
+
+    Returns:
+        tuple: (slots (m,) int16, piece counts (n,) int8, features (n, len(TERMS)) int16,
+                results (n,) float32, skipped line count)
+    """
+    indices, results = [], []
+    skipped = 0
+    for line in lines:
+        try:
+            parsed = parseLabelledLine(line)
+        except ValueError:
+            skipped += 1
+            continue
+        if parsed is not None:
+            indices.append(parsed[0])
+            results.append(parsed[1])
+
+    indices = np.array(indices, dtype=np.int8).reshape(-1, 64)
+    features = BatchEval.termFeatures(BatchEval.toBitboards(indices)).astype(np.int16)
+
+    square_slots = SQUARE_SLOTS[indices, np.arange(64)]
+    has_slot = square_slots != NO_SLOT
+    return (square_slots[has_slot], has_slot.sum(axis=1).astype(np.int8), features,
+            np.array(results, dtype=np.float32), skipped)
+
+
+def _readChunks(path, chunk_size, limit):
+    """
+    Streams the input file as lists of at most `chunk_size` lines (and at most `limit` lines in total).
+    """
+    chunk = []
+    with open(path) as positions_file:
+        for line_number, line in enumerate(positions_file):
+            if limit is not None and line_number >= limit:
+                break
+            chunk.append(line)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def loadTrainingSet(path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, limit=None):
+    """
+    Reads a file of labelled positions, extracting features in `workers` processes.
+
+    Returns:
+        dict: {
+            "slots": (M,) int16 value table slots of every piece of every position,
+            "owners": (M,) int32 position each of those pieces belongs to,
+            "offsets": (N + 1,) start of each position's pieces in "slots",
+            "features": (N, len(TERMS)) int16 term counts,
+            "results": (N,) float32 game results,
+            "skipped": number of unreadable lines
+        }
+    """
+    slots, counts, features, results = [], [], [], []
+    skipped = 0
+    with Pool(workers) as pool:
+        for chunk in pool.imap(_extractChunk, _readChunks(path, chunk_size, limit)):
+            for part, array in zip((slots, counts, features, results), chunk):
+                part.append(array)
+            skipped += chunk[4]
+
+    counts = np.concatenate(counts) if counts else np.empty(0, np.int8)
+    return {
+        "slots": np.concatenate(slots) if slots else np.empty(0, np.int16),
+        "owners": np.repeat(np.arange(len(counts), dtype=np.int32), counts),
+        "offsets": np.concatenate(([0], np.cumsum(counts, dtype=np.int64))),
+        "features": np.concatenate(features) if features else np.empty((0, len(BatchEval.TERMS)), np.int16),
+        "results": np.concatenate(results) if results else np.empty(0, np.float32),
+        "skipped": skipped
+    }
+
+
+# ---- MODEL ----
+
+def _signedValues(vector):
+    """
+    Builds the value of every slot of SQUARE_SLOTS from a parameter vector: piece value plus
+    table entry for white pieces, the negation for black pieces.
+    """
+    values = (vector[MATERIAL_OFFSET:TABLE_OFFSET, None] + vector[TABLE_OFFSET:TERM_OFFSET].reshape(-1, 64)).ravel()
+    return np.concatenate((values, -values))
+
+
+def _blocks(training_set):
+    """
+    Splits the training set into blocks of at most BLOCK_SIZE positions.
+
+    Yields:
+        tuple: (position slice, slots, owners relative to the block start) of each block.
+    """
+    count = len(training_set["results"])
+    offsets = training_set["offsets"]
+    for start in range(0, count, BLOCK_SIZE):
+        end = min(start + BLOCK_SIZE, count)
+        pieces = slice(offsets[start], offsets[end])
+        yield slice(start, end), training_set["slots"][pieces], training_set["owners"][pieces] - start
+
+
+def evaluate(vector, training_set):
+    """
+    Scores every position of the training set with the weights in `vector`
+    (the same scores scoreBoard gives with those weights).
+    """
+    values = _signedValues(vector)
+    scores = []
+    for positions, slots, owners in _blocks(training_set):
+        scores.append(_blockScores(vector, values, training_set, positions, slots, owners))
+    return np.concatenate(scores) if scores else np.empty(0)
+
+
+def _blockScores(vector, values, training_set, positions, slots, owners):
+    """
+    Scores one block: the signed values of its pieces, summed per position, plus the weighted terms.
+    """
+    count = positions.stop - positions.start
+    piece_sum = np.bincount(owners, weights=values[slots], minlength=count)
+    return piece_sum + training_set["features"][positions] @ vector[TERM_OFFSET:]
+
+
+def winProbability(scores, k):
+    """
+    Expected result for white given scores in pawns.
+    """
+    exponent = np.clip(-k * scores / 4, -30, 30)
+    return 1 / (1 + 10 ** exponent)
+
+
+def meanSquaredError(vector, training_set, k, gradient=False):
+    """
+    Texel error of the weights in `vector` over the training set.
+
+    Args:
+        gradient (bool): Also return the gradient of the error with respect to `vector`.
+
+    Returns:
+        float, or (float, np.ndarray) when `gradient` is True.
+    """
+    results = training_set["results"]
+    values = _signedValues(vector)
+    error = 0.0
+    slot_gradient = np.zeros(2 * NUM_TABLE_SLOTS)
+    term_gradient = np.zeros(len(BatchEval.TERMS))
+
+    for positions, slots, owners in _blocks(training_set):
+        probability = winProbability(_blockScores(vector, values, training_set, positions, slots, owners), k)
+        residual = results[positions] - probability
+        error += float(residual @ residual)
+
+        if gradient:
+            # d(error) / d(score) of each position
+            score_gradient = -2 * residual * probability * (1 - probability) * k * math.log(10) / 4
+            # Every piece adds its slot's value to the score of its position
+            slot_gradient += np.bincount(slots, weights=score_gradient[owners], minlength=2 * NUM_TABLE_SLOTS)
+            term_gradient += score_gradient @ training_set["features"][positions]
+
+    count = max(len(results), 1)
+    if not gradient:
+        return error / count
+
+    # Black slots hold negated values
+    table_gradient = (slot_gradient[:NUM_TABLE_SLOTS] - slot_gradient[NUM_TABLE_SLOTS:]).reshape(len(TUNED_PIECES), 64)
+    full_gradient = np.concatenate([table_gradient.sum(axis=1), table_gradient.ravel(), term_gradient])
+    return error / count, full_gradient / count
+
+
+def fitScalingConstant(vector, training_set, low=0.05, high=5.0, iterations=40):
+    """
+    Finds the K that best maps the current evaluation to the results (golden-section search).
+    """
+    ratio = (math.sqrt(5) - 1) / 2
+    for _ in range(iterations):
+        k1 = high - ratio * (high - low)
+        k2 = low + ratio * (high - low)
+        if meanSquaredError(vector, training_set, k1) < meanSquaredError(vector, training_set, k2):
+            high = k2
+        else:
+            low = k1
+    return (low + high) / 2
+
+
+def tune(vector, training_set, k, epochs=DEFAULT_EPOCHS, learning_rate=DEFAULT_LEARNING_RATE, report_every=10):
+    """
+    Minimises the Texel error with full-batch Adam steps.
+
+    Returns:
+        np.ndarray: The tuned parameter vector.
+    """
+    vector = vector.copy()
+    first_moment = np.zeros_like(vector)
+    second_moment = np.zeros_like(vector)
+    beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+
+    for epoch in range(1, epochs + 1):
+        error, gradient = meanSquaredError(vector, training_set, k, gradient=True)
+        first_moment = beta1 * first_moment + (1 - beta1) * gradient
+        second_moment = beta2 * second_moment + (1 - beta2) * gradient ** 2
+        step = (first_moment / (1 - beta1 ** epoch)) / (np.sqrt(second_moment / (1 - beta2 ** epoch)) + epsilon)
+        vector -= learning_rate * step
+
+        if epoch % report_every == 0 or epoch == 1:
+            print("epoch {:>5} error {:.6f}".format(epoch, error))
+
+    return vector
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Texel-style tuning of the evaluation weights.")
+    parser.add_argument("positions", help="file with one 'FEN result' per line")
+    parser.add_argument("--output", default=ChessAI.EVAL_PARAMS_FILE,
+                        help="parameter file to write (default: the one the engine loads)")
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS)
+    parser.add_argument("--learning-rate", type=float, default=DEFAULT_LEARNING_RATE)
+    parser.add_argument("--k", type=float, help="scaling constant (default: fitted to the data)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes reading the positions")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--limit", type=int, help="read at most this many lines")
+    args = parser.parse_args()
+
+    # ---- 1. READ POSITIONS ----
+    start_time = time.perf_counter()
+    training_set = loadTrainingSet(args.positions, args.workers, args.chunk_size, args.limit)
+    print("loaded {} positions ({} unreadable lines skipped) in {:.1f}s".format(
+        len(training_set["results"]), training_set["skipped"], time.perf_counter() - start_time
+    ))
+    if not len(training_set["results"]):
+        return
+
+    # ---- 2. FIT K TO THE CURRENT WEIGHTS ----
+    # Starts from the weights the engine currently uses (including a previous parameter file)
+    vector = packParameters(ChessAI.getEvaluationParameters())
+    k = args.k if args.k is not None else fitScalingConstant(vector, training_set)
+    print("K = {:.4f}, initial error {:.6f}".format(k, meanSquaredError(vector, training_set, k)))
+
+    # ---- 3. TUNE AND SAVE ----
+    start_time = time.perf_counter()
+    vector = tune(vector, training_set, k, args.epochs, args.learning_rate)
+    print("final error {:.6f} after {:.1f}s".format(
+        meanSquaredError(vector, training_set, k), time.perf_counter() - start_time
+    ))
+
+    with open(args.output, "w") as parameter_file:
+        json.dump(unpackParameters(vector), parameter_file, indent=2)
+    print("wrote", args.output)
+
+
+if __name__ == "__main__":
+    main()
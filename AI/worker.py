@@ -0,0 +1,184 @@
+"""
+Long-lived AI worker process.
+
+Instead of starting a new Process (and pickling the whole GameState) for every AI move, the GUI
+keeps one EngineWorker for the whole session. The worker holds its own copy of the game and only
+receives the moves that changed since the last search, as a list of moveIDs over a Pipe. Because
+the process stays alive, its transposition table stays warm between turns.
+
+Searches are stopped cooperatively through a one-byte flag in shared memory that the search polls
+every few hundred nodes: setting it makes the worker answer immediately with the best move found so
+far, instead of the process being terminated.
+"""
+
+from multiprocessing import Process, Pipe, Value
+
+import AI.chessai as ChessAI
+from GameState.bitboard import BitboardGameState
+from Moves.moves import Move, MOVE_ID_MASK
+
+
+class EngineWorker:
+    """
+    Handle to a persistent engine process. Used from the GUI process.
+    """
+
+    def __init__(self, state_class=BitboardGameState):
+        """
+        Starts the worker process.
+
+        Args:
+            state_class (type): GameState implementation the worker searches with.
+        """
+        self.connection, worker_connection = Pipe()
+
+        # Shared-memory stop flag polled by the search (no lock: a single writer, one byte)
+        self.stop_flag = Value("b", 0, lock=False)
+
+        self.process = Process(
+            target=_workerLoop,
+            args=(worker_connection, state_class, self.stop_flag),
+            daemon=True
+        )
+        self.process.start()
+
+        self.synced_move_ids = []  # moveIDs of the game the worker currently holds
+        self.thinking = False      # True while a search request is outstanding
+        self.last_info = None      # Statistics of the last completed search
+
+
+    def syncPosition(self, game_state):
+        """
+        Brings the worker's copy of the game in line with `game_state`.
+
+        Only the difference is sent: how many moves to take back (after an undo or reset)
+        and which moves to play from there.
+        """
+        move_ids = [move.moveID for move in game_state.move_log]
+
+        # Length of the history both sides agree on
+        common = 0
+        for old_id, new_id in zip(self.synced_move_ids, move_ids):
+            if old_id != new_id:
+                break
+            common += 1
+
+        undo_count = len(self.synced_move_ids) - common
+        new_moves = move_ids[common:]
+        if undo_count or new_moves:
+            self.connection.send(("position", undo_count, new_moves))
+        self.synced_move_ids = move_ids
+
+
+    def startSearch(self, game_state, **limits):
+        """
+        Asks the worker to search the current position. Returns immediately.
+
+        Args:
+            game_state (GameState): Position to search (only its move history is sent).
+            **limits: Keyword arguments for ChessAI.iterativeDeepening
+                (depth, time_limit, node_limit, randomize).
+        """
+        self.syncPosition(game_state)
+        self.stop_flag.value = 0
+        self.connection.send(("search", limits))
+        self.thinking = True
+
+
+    def poll(self):
+        """
+        Returns True once the result of the outstanding search is available.
+        """
+        return self.thinking and self.connection.poll()
+
+
+    def bestMove(self, valid_moves):
+        """
+        Collects the search result and returns the matching Move from `valid_moves`.
+        Blocks until the worker has answered.
+
+        Returns:
+            Move or None: The chosen move, or None if the worker found none.
+        """
+        _, move_id, self.last_info = self.connection.recv()
+        self.thinking = False
+        for move in valid_moves:
+            if move.moveID == move_id:
+                return move
+        return None
+
+
+    def stopSearch(self):
+        """
+        Asks the running search to finish now (e.g. when the clock runs out).
+        Its best move so far arrives through poll()/bestMove() as usual.
+        """
+        if self.thinking:
+            self.stop_flag.value = 1
+
+
+    def cancel(self):
+        """
+        Stops the outstanding search (if any) and discards its result.
+        The worker stays alive and keeps its transposition table.
+        """
+        if self.thinking:
+            self.stopSearch()
+            self.connection.recv()  # The interrupted search still answers; drop it
+            self.thinking = False
+
+
+    def close(self):
+        """
+        Shuts the worker down.
+        """
+        self.cancel()
+        self.connection.send(("quit",))
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+def _workerLoop(connection, state_class, stop_flag):
+    """
+    Entry point of the worker process: applies position updates and runs searches until told to quit.
+    """
+    game_state = state_class()
+
+    while True:
+        message = connection.recv()
+        command = message[0]
+
+        if command == "position":
+            _, undo_count, new_moves = message
+            for _ in range(undo_count):
+                game_state.undoMove()
+            for move_id in new_moves:
+                _playMoveId(game_state, move_id)
+
+        elif command == "search":
+            limits = message[1]
+            valid_moves = game_state.getValidMoves()
+            search = ChessAI.iterativeDeepening(
+                game_state, valid_moves, stop_flag=stop_flag, **limits
+            )
+            best_move = search.best_move
+            connection.send((
+                "bestmove",
+                best_move.moveID if best_move is not None else None,
+                {"depth": search.completed_depth, "score": search.best_score, "nodes": search.nodes}
+            ))
+
+        elif command == "quit":
+            break
+
+
+def _playMoveId(game_state, move_id):
+    """
+    Plays the legal move with the given moveID on `game_state`.
+    """
+    for code in game_state.getLegalMoveCodes():
+        if code & MOVE_ID_MASK == move_id:
+            game_state.makeMove(Move.fromEncoded(code, game_state.board))
+            return
+    raise ValueError("Move {} is not legal in the worker's position".format(move_id))
@@ -0,0 +1,843 @@
+"""
+Bitboard-backed position representation.
+
+BitboardGameState keeps the position as twelve 64-bit integers (one per piece type and
+colour) plus per-colour occupancy masks, and does move generation, check detection and
+square attack queries with bit operations instead of walking the 8x8 grid.
+
+Square indices run from 0 (a8, row 0 col 0) to 63 (h1, row 7 col 7), i.e. index = row * 8 + col,
+so a bit index maps straight onto the (row, col) coordinates used everywhere else.
+"""
+
+from Moves.moves import Move, encodeMove, PROMOTION_SHIFT, ENPASSANT_FLAG, CASTLE_FLAG
+from GameState.gamestate import GameState
+
+
+# --- PRECOMPUTED ATTACK TABLES ---
+
+# All twelve piece identifiers, in the same two-character format used by the board grid.
+PIECES = ("wp", "wN", "wB", "wR", "wQ", "wK", "bp", "bN", "bB", "bR", "bQ", "bK")
+
+# Row/column offsets for each sliding direction.
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))        # up, down, left, right
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))    # up-left, up-right, down-left, down-right
+
+KNIGHT_OFFSETS = (
+    (-2, -1), (-2, 1), (-1, 2), (1, 2),
+    (2, -1), (2, 1), (-1, -2), (1, -2)
+)
+KING_OFFSETS = (
+    (-1, -1), (-1, 0), (-1, 1), (0, -1),
+    (0, 1), (1, -1), (1, 0), (1, 1)
+)
+
+FULL_BOARD = (1 << 64) - 1
+
+# Back ranks: a pawn arriving there promotes
+PROMOTION_RANKS = 0xFF | 0xFF << 56
+
+# Stages of the legal move generator (see BitboardGameState._generateMoveCodes)
+ALL_MOVES = 0
+CAPTURE_MOVES = 1   # Captures, en passant and promotions
+QUIET_MOVES = 2     # Everything else, castling included
+
+# Squares a pawn reaches with its first single push from the start rank (row 5 for white,
+# row 2 for black); pushing on from there is a double push.
+WHITE_DOUBLE_PUSH_RANK = 0xFF << 40
+BLACK_DOUBLE_PUSH_RANK = 0xFF << 16
+
+
+def _offsetMask(square, offsets):
+    """
+    Builds a mask of every on-board square reachable from `square` with a single jump
+    from `offsets` (used for knights, kings and pawn captures).
+    """
+    row, col = divmod(square, 8)
+    mask = 0
+    for d_row, d_col in offsets:
+        end_row, end_col = row + d_row, col + d_col
+        if 0 <= end_row < 8 and 0 <= end_col < 8:
+            mask |= 1 << (end_row * 8 + end_col)
+    return mask
+
+
+def _rayMask(square, direction):
+    """
+    Builds a mask of all squares from `square` (exclusive) to the edge of the board
+    along `direction`.
+    """
+    row, col = divmod(square, 8)
+    mask = 0
+    for i in range(1, 8):
+        end_row, end_col = row + direction[0] * i, col + direction[1] * i
+        if not (0 <= end_row < 8 and 0 <= end_col < 8):
+            break
+        mask |= 1 << (end_row * 8 + end_col)
+    return mask
+
+
+KNIGHT_ATTACKS = [_offsetMask(sq, KNIGHT_OFFSETS) for sq in range(64)]
+KING_ATTACKS = [_offsetMask(sq, KING_OFFSETS) for sq in range(64)]
+
+# Squares attacked by a pawn of the given colour standing on each square.
+# White pawns attack "up" the board (towards row 0), black pawns attack "down".
+PAWN_ATTACKS = {
+    "w": [_offsetMask(sq, ((-1, -1), (-1, 1))) for sq in range(64)],
+    "b": [_offsetMask(sq, ((1, -1), (1, 1))) for sq in range(64)]
+}
+
+# RAYS[direction][square] -> every square along that direction up to the board edge.
+RAYS = {
+    direction: [_rayMask(sq, direction) for sq in range(64)]
+    for direction in ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+}
+
+# Directions that step towards higher square indices: the nearest blocker on such a ray is
+# its lowest set bit. For the other directions the nearest blocker is the highest set bit.
+POSITIVE_DIRECTIONS = {
+    direction for direction in RAYS if direction[0] * 8 + direction[1] > 0
+}
+
+
+def _lowestSquare(mask):
+    """Returns the index of the least significant set bit of a non-empty mask."""
+    return (mask & -mask).bit_length() - 1
+
+
+def _squaresOf(mask):
+    """Yields the square index of every set bit in `mask`, lowest first."""
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+def _nearestBlocker(direction, blockers):
+    """Returns the blocker closest to the ray origin for a non-empty blockers mask."""
+    if direction in POSITIVE_DIRECTIONS:
+        return _lowestSquare(blockers)
+    return blockers.bit_length() - 1
+
+
+def _slidingAttacks(square, occupied, directions):
+    """
+    Computes the squares attacked by a slider on `square` along `directions`,
+    stopping at (and including) the first occupied square on each ray.
+    """
+    attacks = 0
+    for direction in directions:
+        ray = RAYS[direction][square]
+        blockers = ray & occupied
+        if blockers:
+            # Cut the ray off behind the nearest blocker
+            ray ^= RAYS[direction][_nearestBlocker(direction, blockers)]
+        attacks |= ray
+    return attacks
+
+
+def rookAttacks(square, occupied):
+    """Squares attacked by a rook on `square` given the occupancy mask."""
+    return _slidingAttacks(square, occupied, ROOK_DIRECTIONS)
+
+
+def bishopAttacks(square, occupied):
+    """Squares attacked by a bishop on `square` given the occupancy mask."""
+    return _slidingAttacks(square, occupied, BISHOP_DIRECTIONS)
+
+
+class BitboardGameState(GameState):
+    """
+    Drop-in replacement for GameState that generates moves from bitboards.
+
+    The inherited `board` grid is still updated by makeMove/undoMove and serves as the
+    compatibility view used by main.py for drawing and by Move objects to look up the
+    moved and captured pieces. Move generation, check detection and attack queries only
+    ever touch the bitboards.
+    """
+
+    def __init__(self):
+        """
+        Initializes the standard starting position and builds the bitboards from it.
+        """
+        super().__init__()
+        self.loadBitboards()
+
+
+    def loadBitboards(self):
+        """
+        Rebuilds every bitboard and occupancy mask from the `board` grid.
+        Call this after editing `board` directly (e.g. when setting up a custom position).
+        """
+        # One 64-bit integer per piece type and colour
+        self.bitboards = {piece: 0 for piece in PIECES}
+
+        # Union of all pieces of each colour
+        self.occupancy = {"w": 0, "b": 0}
+
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece != "--":
+                    bit = 1 << (row * 8 + col)
+                    self.bitboards[piece] |= bit
+                    self.occupancy[piece[0]] |= bit
+
+
+    def loadPosition(self, position):
+        """
+        Sets up the given position (see GameState.loadPosition) and rebuilds the bitboards.
+        """
+        super().loadPosition(position)
+        self.loadBitboards()
+
+
+    def _toggle(self, piece, mask):
+        """
+        Flips the bits in `mask` for `piece` and its colour's occupancy.
+        Because XOR is its own inverse, the same toggles both make and unmake a move.
+        """
+        self.bitboards[piece] ^= mask
+        self.occupancy[piece[0]] ^= mask
+
+
+    def _toggleMove(self, move):
+        """
+        Applies (or reverts) the bitboard changes caused by `move`.
+        """
+        start_bit = 1 << (move.start_row * 8 + move.start_col)
+        end_bit = 1 << (move.end_row * 8 + move.end_col)
+
+        # ---- 1. REMOVE CAPTURED PIECE ----
+        if move.is_enpassant_move:
+            # The captured pawn sits beside the moving pawn, not on the destination square
+            self._toggle(move.piece_captured, 1 << (move.start_row * 8 + move.end_col))
+        elif move.piece_captured != "--":
+            self._toggle(move.piece_captured, end_bit)
+
+        # ---- 2. MOVE THE PIECE (PROMOTING IF NECESSARY) ----
+        self._toggle(move.piece_moved, start_bit)
+        if move.is_pawn_promotion:
+            self._toggle(move.piece_moved[0] + move.promotion_piece, end_bit)
+        else:
+            self._toggle(move.piece_moved, end_bit)
+
+        # ---- 3. SHUFFLE THE ROOK WHEN CASTLING ----
+        if move.is_castle_move:
+            rook = move.piece_moved[0] + "R"
+            row_offset = move.end_row * 8
+            if move.end_col - move.start_col == 2:
+                # King-side: rook h-file -> f-file
+                self._toggle(rook, (1 << (row_offset + 7)) | (1 << (row_offset + 5)))
+            else:
+                # Queen-side: rook a-file -> d-file
+                self._toggle(rook, (1 << row_offset) | (1 << (row_offset + 3)))
+
+
+    def makeMove(self, move):
+        """
+        Executes a move, keeping the board grid and the bitboards in step.
+        """
+        super().makeMove(move)
+        self._toggleMove(move)
+
+
+    def undoMove(self):
+        """
+        Undoes the last move, reverting both the board grid and the bitboards.
+        """
+        if len(self.move_log) != 0:
+            move = self.move_log[-1]
+            super().undoMove()
+            self._toggleMove(move)
+
+
+    # --- ATTACK DETECTION ---
+
+    def attackersOf(self, square, color, occupied=None):
+        """
+        Returns a mask of all pieces of `color` that attack `square`.
+
+        Looks outward from the target square: a piece attacks the square exactly when the
+        same kind of piece placed on the square would attack it.
+
+        Args:
+            square (int): Square index (row * 8 + col).
+            color (str): 'w' or 'b' — the attacking side.
+            occupied (int): Optional occupancy override, used to see through pieces (x-rays).
+        """
+        if occupied is None:
+            occupied = self.occupancy["w"] | self.occupancy["b"]
+        bitboards = self.bitboards
+        other = "b" if color == "w" else "w"
+
+        queens = bitboards[color + "Q"]
+        return (
+            (PAWN_ATTACKS[other][square] & bitboards[color + "p"]) |
+            (KNIGHT_ATTACKS[square] & bitboards[color + "N"]) |
+            (KING_ATTACKS[square] & bitboards[color + "K"]) |
+            (rookAttacks(square, occupied) & (bitboards[color + "R"] | queens)) |
+            (bishopAttacks(square, occupied) & (bitboards[color + "B"] | queens))
+        )
+
+
+    def squareUnderAttack(self, row, col):
+        """
+        Determines if a given square is under attack by the opponent's pieces.
+        """
+        enemy_color = "b" if self.white_to_move else "w"
+        return self.attackersOf(row * 8 + col, enemy_color) != 0
+
+
+    def inCheck(self):
+        """
+        Determines if the current player's king is in check.
+        """
+        color = "w" if self.white_to_move else "b"
+        king_square = _lowestSquare(self.bitboards[color + "K"])
+        return self.squareUnderAttack(*divmod(king_square, 8))
+
+
+    def kingInCheck(self, color):
+        """
+        Determines whether `color`'s king is attacked, regardless of whose turn it is.
+        """
+        enemy_color = "b" if color == "w" else "w"
+        return self.attackersOf(_lowestSquare(self.bitboards[color + "K"]), enemy_color) != 0
+
+
+    # --- MOVE GENERATION ---
+
+    def _findPins(self, king_square, ally_color, enemy_color, occupied):
+        """
+        Finds every allied piece pinned against the king.
+
+        Returns:
+            dict: square index of pinned piece -> mask of squares it may still move to
+                  (the line between king and pinner, including the pinner itself).
+        """
+        pins = {}
+        bitboards = self.bitboards
+        ally_occupancy = self.occupancy[ally_color]
+        enemy_queens = bitboards[enemy_color + "Q"]
+        enemy_sliders = {
+            direction: bitboards[enemy_color + ("R" if direction in ROOK_DIRECTIONS else "B")] | enemy_queens
+            for direction in RAYS
+        }
+
+        for direction, rays in RAYS.items():
+            ray = rays[king_square]
+            blockers = ray & occupied
+            if not blockers:
+                continue
+            first = _nearestBlocker(direction, blockers)
+            if not (ally_occupancy >> first) & 1:
+                continue  # Nearest piece is an enemy: a check, not a pin
+
+            remaining = blockers & ~(1 << first)
+            if not remaining:
+                continue
+            second = _nearestBlocker(direction, remaining)
+            if (enemy_sliders[direction] >> second) & 1:
+                # Allowed squares: everything from the king up to and including the pinner
+                pins[first] = ray & ~rays[second]
+        return pins
+
+
+    def _checkMask(self, king_square, checkers):
+        """
+        For a single checker, returns the squares a non-king move must land on to resolve
+        the check: the checker itself plus, for sliders, the squares in between.
+        """
+        checker = _lowestSquare(checkers)
+        for direction, rays in RAYS.items():
+            ray = rays[king_square]
+            if (ray >> checker) & 1:
+                between = ray & ~rays[checker]
+                # Only sliders can check along a ray from distance; adjacent checkers
+                # leave `between` as the checker square alone.
+                return between
+        return checkers  # Knight check: only capturing the knight resolves it
+
+
+    def _enpassantIsLegal(self, from_square, to_square, captured_square, ally_color, enemy_color, king_square):
+        """
+        Verifies an en passant capture by replaying it on the occupancy masks.
+        This catches the rare horizontal discovered check where both pawns leave the rank.
+        """
+        occupied = (self.occupancy["w"] | self.occupancy["b"])
+        occupied ^= (1 << from_square) | (1 << captured_square) | (1 << to_square)
+
+        bitboards = self.bitboards
+        queens = bitboards[enemy_color + "Q"]
+        if rookAttacks(king_square, occupied) & (bitboards[enemy_color + "R"] | queens):
+            return False
+        if bishopAttacks(king_square, occupied) & (bitboards[enemy_color + "B"] | queens):
+            return False
+        # Knights and pawns (other than the captured one) are unaffected by the capture
+        other_attackers = (
+            (KNIGHT_ATTACKS[king_square] & bitboards[enemy_color + "N"]) |
+            (PAWN_ATTACKS[ally_color][king_square] & bitboards[enemy_color + "p"] & ~(1 << captured_square))
+        )
+        return other_attackers == 0
+
+
+    def _addMoves(self, from_square, targets, moves):
+        """
+        Appends the encoded move (see Moves/moves.py) for every set bit in `targets`.
+        """
+        while targets:
+            low_bit = targets & -targets
+            moves.append(from_square | (low_bit.bit_length() - 1) << 6)
+            targets ^= low_bit
+
+
+    def _addPawnMoves(self, from_square, targets, moves):
+        """
+        Appends the encoded move for every set bit in `targets`, expanding back-rank targets
+        into one move per promotion piece.
+        """
+        for to_square in _squaresOf(targets):
+            code = from_square | to_square << 6
+            if to_square < 8 or to_square >= 56:
+                for promotion_index in range(len(Move.promotion_pieces)):
+                    moves.append(code | promotion_index << PROMOTION_SHIFT)
+            else:
+                moves.append(code)
+
+
+    def _decodeMoves(self, codes):
+        """
+        Builds the Move objects for a list of encoded moves.
+        """
+        board = self.board
+        return [Move.fromEncoded(code, board) for code in codes]
+
+
+    def getValidMoves(self):
+        """
+        Generates all legal moves for the current player (see getLegalMoveCodes) and records
+        whether the position is checkmate or stalemate.
+
+        Returns:
+            list: A list of Move objects that are legal to play.
+        """
+        codes = self.getLegalMoveCodes()
+        self.checkmate = not codes and self.in_check
+        self.stalemate = not codes and not self.in_check
+        return self._decodeMoves(codes)
+
+
+    def getLegalMoveCodes(self):
+        """
+        Generates all legal moves for the current player as encoded integers, using bitboard
+        pin and check masks, so no pseudo-legal move ever has to be made and taken back to test
+        legality and no Move object is built. Also updates in_check.
+
+        Returns:
+            list: Encoded moves (see Moves/moves.py).
+        """
+        return self._generateMoveCodes(self.prepareMoveGeneration(), ALL_MOVES)
+
+
+    # --- STAGED MOVE GENERATION ---
+    # The search picks moves in stages (AI/chessai.py pickMoves): the hash move, then captures,
+    # then killers, then quiet moves. The check and pin analysis is done once per position by
+    # prepareMoveGeneration; each stage then generates only its own moves.
+
+    def prepareMoveGeneration(self):
+        """
+        Runs the check and pin analysis shared by every generation stage. Also updates in_check.
+
+        Returns:
+            tuple: Generation context for _generateMoveCodes, getLegalMoveById,
+                getLegalCaptureMoves and getLegalQuietMoves.
+        """
+        if self.white_to_move:
+            ally_color, enemy_color = "w", "b"
+        else:
+            ally_color, enemy_color = "b", "w"
+
+        ally_occupancy = self.occupancy[ally_color]
+        enemy_occupancy = self.occupancy[enemy_color]
+        occupied = ally_occupancy | enemy_occupancy
+        king_square = _lowestSquare(self.bitboards[ally_color + "K"])
+
+        checkers = self.attackersOf(king_square, enemy_color)
+        self.in_check = checkers != 0
+        pins = self._findPins(king_square, ally_color, enemy_color, occupied)
+
+        if checkers & (checkers - 1):
+            # Double check: only the king may move
+            check_mask = 0
+        elif checkers:
+            check_mask = self._checkMask(king_square, checkers)
+        else:
+            check_mask = FULL_BOARD
+
+        return (ally_color, enemy_color, ally_occupancy, enemy_occupancy, occupied,
+                king_square, checkers, pins, check_mask)
+
+
+    def getLegalMoveById(self, context, move_id):
+        """
+        Returns the legal move with the given moveID, or None if it is not legal here. Tests that
+        one move against the context's check and pin masks without generating any other, so a
+        hash or killer move can be searched before move generation.
+
+        Args:
+            context (tuple): From prepareMoveGeneration for the current position.
+            move_id (int): moveID to look for (e.g. from the transposition table).
+
+        Returns:
+            Move or None
+        """
+        (ally_color, enemy_color, ally_occupancy, enemy_occupancy, occupied,
+         king_square, checkers, pins, check_mask) = context
+
+        from_square = move_id & 63
+        to_square = (move_id >> 6) & 63
+        piece = self.board[from_square >> 3][from_square & 7]
+        if piece[0] != ally_color:
+            return None
+        piece_type = piece[1]
+        to_bit = 1 << to_square
+        flags = 0
+
+        # A promotion index is only meaningful for a pawn reaching the back rank
+        if move_id >> PROMOTION_SHIFT and not (piece_type == "p" and (to_square < 8 or to_square >= 56)):
+            return None
+
+        if piece_type == "K":
+            if abs(to_square - from_square) == 2:
+                # Castling: the only two-square king moves
+                castles = []
+                if not checkers:
+                    self._addCastleMoves(king_square, enemy_color, occupied, castles)
+                if encodeMove(from_square, to_square, CASTLE_FLAG) not in castles:
+                    return None
+                flags = CASTLE_FLAG
+            elif not KING_ATTACKS[from_square] & ~ally_occupancy & to_bit or \
+                    self.attackersOf(to_square, enemy_color, occupied ^ (1 << king_square)):
+                return None
+
+        else:
+            # Everything but the king must resolve any check and stay on its pin line
+            allowed = check_mask & pins.get(from_square, FULL_BOARD)
+            if piece_type == "N":
+                targets = KNIGHT_ATTACKS[from_square] & ~ally_occupancy
+            elif piece_type == "p":
+                pawn_step, start_row, enpassant_row = self._pawnGeometry()
+                enpassant_square = self._enpassantSquare()
+                attacks = PAWN_ATTACKS[ally_color][from_square]
+                if to_square == enpassant_square and (attacks >> to_square) & 1 and \
+                        from_square // 8 == enpassant_row:
+                    # En passant is validated by replaying it, which covers pins and checks at once
+                    if not self._enpassantIsLegal(from_square, to_square, to_square - pawn_step,
+                                                  ally_color, enemy_color, king_square):
+                        return None
+                    return Move.fromEncoded(encodeMove(from_square, to_square, ENPASSANT_FLAG), self.board)
+                targets = self._pawnPushes(from_square, ~occupied & FULL_BOARD, pawn_step, start_row) | \
+                    (attacks & enemy_occupancy)
+            else:
+                targets = 0
+                if piece_type in ("R", "Q"):
+                    targets |= rookAttacks(from_square, occupied)
+                if piece_type in ("B", "Q"):
+                    targets |= bishopAttacks(from_square, occupied)
+                targets &= ~ally_occupancy
+
+            if piece_type == "N" and from_square in pins:
+                return None  # A pinned knight can never move
+            if not targets & allowed & to_bit:
+                return None
+
+        return Move.fromEncoded(move_id | flags, self.board)
+
+
+    def getLegalCaptureMoves(self, context):
+        """
+        Generates the legal captures (including en passant) and promotions.
+
+        Args:
+            context (tuple): From prepareMoveGeneration for the current position.
+
+        Returns:
+            list: Move objects.
+        """
+        return self._decodeMoves(self._generateMoveCodes(context, CAPTURE_MOVES))
+
+
+    def getLegalQuietMoves(self, context):
+        """
+        Generates the legal moves that neither capture nor promote, castling included.
+
+        Args:
+            context (tuple): From prepareMoveGeneration for the current position.
+
+        Returns:
+            list: Move objects.
+        """
+        return self._decodeMoves(self._generateMoveCodes(context, QUIET_MOVES))
+
+
+    def _pawnGeometry(self):
+        """
+        Returns (pawn_step, start_row, enpassant_row) for the side to move: the square offset of
+        a single push, the row pawns start on and the row they capture en passant from.
+        """
+        return (-8, 6, 3) if self.white_to_move else (8, 1, 4)
+
+
+    def _enpassantSquare(self):
+        """
+        Returns the square index a pawn may capture en passant onto, or None.
+        """
+        if self.enpassant_possible:
+            return self.enpassant_possible[0] * 8 + self.enpassant_possible[1]
+        return None
+
+
+    def _pawnPushes(self, from_square, empty, pawn_step, start_row):
+        """
+        Returns the mask of the single and double push squares of the pawn on `from_square`.
+        """
+        pushes = 0
+        one_step = from_square + pawn_step
+        if (empty >> one_step) & 1:
+            pushes |= 1 << one_step
+            two_step = one_step + pawn_step
+            if from_square // 8 == start_row and (empty >> two_step) & 1:
+                pushes |= 1 << two_step
+        return pushes
+
+
+    def _generateMoveCodes(self, context, stage):
+        """
+        Generates the encoded legal moves of one stage: ALL_MOVES, CAPTURE_MOVES (captures,
+        en passant and promotions) or QUIET_MOVES (everything else, castling included).
+
+        Args:
+            context (tuple): From prepareMoveGeneration for the current position.
+            stage (int): Which moves to generate.
+
+        Returns:
+            list: Encoded moves (see Moves/moves.py).
+        """
+        (ally_color, enemy_color, ally_occupancy, enemy_occupancy, occupied,
+         king_square, checkers, pins, check_mask) = context
+
+        moves = []
+        bitboards = self.bitboards
+        pawn_step, start_row, enpassant_row = self._pawnGeometry()
+        empty = ~occupied & FULL_BOARD
+
+        # ---- 1. SQUARES THIS STAGE MAY MOVE TO ----
+        if stage == CAPTURE_MOVES:
+            destinations = enemy_occupancy
+        elif stage == QUIET_MOVES:
+            destinations = empty
+        else:
+            destinations = ~ally_occupancy & FULL_BOARD
+
+        # ---- 2. KING MOVES ----
+        # The king is lifted off the board so sliders x-ray through its current square.
+        occupied_without_king = occupied ^ (1 << king_square)
+        for to_square in _squaresOf(KING_ATTACKS[king_square] & destinations):
+            if not self.attackersOf(to_square, enemy_color, occupied_without_king):
+                moves.append(king_square | to_square << 6)
+
+        # ---- 3. RESTRICT TARGETS WHEN IN CHECK (see prepareMoveGeneration) ----
+        if check_mask:
+            targets_mask = destinations & check_mask
+
+            # ---- 4. KNIGHTS (a pinned knight can never move) ----
+            for from_square in _squaresOf(bitboards[ally_color + "N"]):
+                if from_square not in pins:
+                    self._addMoves(from_square, KNIGHT_ATTACKS[from_square] & targets_mask, moves)
+
+            # ---- 5. SLIDERS ----
+            queens = bitboards[ally_color + "Q"]
+            for piece_bits, attack_function in (
+                (bitboards[ally_color + "R"] | queens, rookAttacks),
+                (bitboards[ally_color + "B"] | queens, bishopAttacks)
+            ):
+                for from_square in _squaresOf(piece_bits):
+                    targets = attack_function(from_square, occupied) & targets_mask
+                    if from_square in pins:
+                        targets &= pins[from_square]
+                    self._addMoves(from_square, targets, moves)
+
+            # ---- 6. PAWNS ----
+            # Pushes onto the back rank are promotions, so they belong to the capture stage
+            if stage == CAPTURE_MOVES:
+                push_mask = PROMOTION_RANKS
+            elif stage == QUIET_MOVES:
+                push_mask = ~PROMOTION_RANKS & FULL_BOARD
+            else:
+                push_mask = FULL_BOARD
+            capture_mask = 0 if stage == QUIET_MOVES else enemy_occupancy
+            enpassant_square = self._enpassantSquare() if stage != QUIET_MOVES else None
+
+            for from_square in _squaresOf(bitboards[ally_color + "p"]):
+                allowed = check_mask & pins.get(from_square, FULL_BOARD)
+                attacks = PAWN_ATTACKS[ally_color][from_square]
+                targets = (self._pawnPushes(from_square, empty, pawn_step, start_row) & push_mask) | \
+                    (attacks & capture_mask)
+                self._addPawnMoves(from_square, targets & allowed, moves)
+
+                # En passant is validated by replaying it, which covers pins and checks at once
+                if enpassant_square is not None and from_square // 8 == enpassant_row and \
+                        (attacks >> enpassant_square) & 1:
+                    captured_square = enpassant_square - pawn_step
+                    if self._enpassantIsLegal(from_square, enpassant_square, captured_square,
+                                              ally_color, enemy_color, king_square):
+                        moves.append(encodeMove(from_square, enpassant_square, ENPASSANT_FLAG))
+
+        # ---- 7. CASTLING ----
+        if not checkers and stage != CAPTURE_MOVES:
+            self._addCastleMoves(king_square, enemy_color, occupied, moves)
+
+        return moves
+
+
+    def _addCastleMoves(self, king_square, enemy_color, occupied, moves):
+        """
+        Appends the (encoded) castling moves available to the side to move.
+        The king must not pass through or land on an attacked square.
+        """
+        if self.white_to_move:
+            king_side, queen_side = self.current_castling_rights.wks, self.current_castling_rights.wqs
+        else:
+            king_side, queen_side = self.current_castling_rights.bks, self.current_castling_rights.bqs
+
+        if king_side and not (occupied >> (king_square + 1)) & 3:
+            if not self.attackersOf(king_square + 1, enemy_color, occupied) and \
+                    not self.attackersOf(king_square + 2, enemy_color, occupied):
+                moves.append(encodeMove(king_square, king_square + 2, CASTLE_FLAG))
+
+        if queen_side and not (occupied >> (king_square - 3)) & 7:
+            if not self.attackersOf(king_square - 1, enemy_color, occupied) and \
+                    not self.attackersOf(king_square - 2, enemy_color, occupied):
+                moves.append(encodeMove(king_square, king_square - 2, CASTLE_FLAG))
+
+
+    def getAllPossibleMoves(self):
+        """
+        Generates all pseudo-legal moves (ignoring checks and pins) from the bitboards.
+        """
+        moves = []
+        bitboards = self.bitboards
+        ally_color = "w" if self.white_to_move else "b"
+        enemy_color = "b" if self.white_to_move else "w"
+        pawn_step, start_row = (-8, 6) if self.white_to_move else (8, 1)
+
+        ally_occupancy = self.occupancy[ally_color]
+        enemy_occupancy = self.occupancy[enemy_color]
+        occupied = ally_occupancy | enemy_occupancy
+        not_ally = ~ally_occupancy & FULL_BOARD
+
+        for from_square in _squaresOf(bitboards[ally_color + "N"]):
+            self._addMoves(from_square, KNIGHT_ATTACKS[from_square] & not_ally, moves)
+        for from_square in _squaresOf(bitboards[ally_color + "K"]):
+            self._addMoves(from_square, KING_ATTACKS[from_square] & not_ally, moves)
+
+        queens = bitboards[ally_color + "Q"]
+        for from_square in _squaresOf(bitboards[ally_color + "R"] | queens):
+            self._addMoves(from_square, rookAttacks(from_square, occupied) & not_ally, moves)
+        for from_square in _squaresOf(bitboards[ally_color + "B"] | queens):
+            self._addMoves(from_square, bishopAttacks(from_square, occupied) & not_ally, moves)
+
+        for from_square in _squaresOf(bitboards[ally_color + "p"]):
+            targets = PAWN_ATTACKS[ally_color][from_square] & enemy_occupancy
+            one_step = from_square + pawn_step
+            if not (occupied >> one_step) & 1:
+                targets |= 1 << one_step
+                two_step = one_step + pawn_step
+                if from_square // 8 == start_row and not (occupied >> two_step) & 1:
+                    targets |= 1 << two_step
+            self._addPawnMoves(from_square, targets, moves)
+
+        return self._decodeMoves(moves)
+
+
+    def getCaptureMoves(self):
+        """
+        Generates the pseudo-legal captures and (queen) promotions for the current player from
+        the bitboards, ignoring pins and checks (see GameState.getCaptureMoves).
+        """
+        moves = []
+        bitboards = self.bitboards
+        ally_color = "w" if self.white_to_move else "b"
+        enemy_color = "b" if self.white_to_move else "w"
+        pawn_step, promotion_row = (-8, 0) if self.white_to_move else (8, 7)
+
+        enemy_occupancy = self.occupancy[enemy_color]
+        occupied = self.occupancy[ally_color] | enemy_occupancy
+
+        for from_square in _squaresOf(bitboards[ally_color + "N"]):
+            self._addMoves(from_square, KNIGHT_ATTACKS[from_square] & enemy_occupancy, moves)
+        for from_square in _squaresOf(bitboards[ally_color + "K"]):
+            self._addMoves(from_square, KING_ATTACKS[from_square] & enemy_occupancy, moves)
+
+        queens = bitboards[ally_color + "Q"]
+        for from_square in _squaresOf(bitboards[ally_color + "R"] | queens):
+            self._addMoves(from_square, rookAttacks(from_square, occupied) & enemy_occupancy, moves)
+        for from_square in _squaresOf(bitboards[ally_color + "B"] | queens):
+            self._addMoves(from_square, bishopAttacks(from_square, occupied) & enemy_occupancy, moves)
+
+        enpassant_bit = (
+            1 << (self.enpassant_possible[0] * 8 + self.enpassant_possible[1])
+            if self.enpassant_possible else 0
+        )
+        for from_square in _squaresOf(bitboards[ally_color + "p"]):
+            attacks = PAWN_ATTACKS[ally_color][from_square]
+            targets = attacks & enemy_occupancy
+            one_step = from_square + pawn_step
+            if one_step // 8 == promotion_row and not (occupied >> one_step) & 1:
+                targets |= 1 << one_step  # Quiet promotion
+            self._addMoves(from_square, targets, moves)
+            if attacks & enpassant_bit:
+                moves.append(encodeMove(from_square, enpassant_bit.bit_length() - 1, ENPASSANT_FLAG))
+
+        return self._decodeMoves(moves)
+
+
+    def getMobility(self, color):
+        """
+        Counts the pseudo-legal moves available to `color` from the attack sets of its pieces
+        (see GameState.getMobility), using population counts instead of building moves.
+        """
+        bitboards = self.bitboards
+        own = self.occupancy[color]
+        enemy = self.occupancy["b" if color == "w" else "w"]
+        occupied = own | enemy
+        not_own = ~own & FULL_BOARD
+
+        count = 0
+        for from_square in _squaresOf(bitboards[color + "N"]):
+            count += (KNIGHT_ATTACKS[from_square] & not_own).bit_count()
+        for from_square in _squaresOf(bitboards[color + "K"]):
+            count += (KING_ATTACKS[from_square] & not_own).bit_count()
+
+        queens = bitboards[color + "Q"]
+        for from_square in _squaresOf(bitboards[color + "R"] | queens):
+            count += (rookAttacks(from_square, occupied) & not_own).bit_count()
+        for from_square in _squaresOf(bitboards[color + "B"] | queens):
+            count += (bishopAttacks(from_square, occupied) & not_own).bit_count()
+
+        # Pawns: pushes onto empty squares (double pushes from the start rank) and captures
+        pawns = bitboards[color + "p"]
+        empty = ~occupied & FULL_BOARD
+        if color == "w":
+            single_pushes = (pawns >> 8) & empty
+            double_pushes = ((single_pushes & WHITE_DOUBLE_PUSH_RANK) >> 8) & empty
+        else:
+            single_pushes = (pawns << 8) & empty
+            double_pushes = ((single_pushes & BLACK_DOUBLE_PUSH_RANK) << 8) & empty
+        count += single_pushes.bit_count() + double_pushes.bit_count()
+
+        pawn_attacks = PAWN_ATTACKS[color]
+        for from_square in _squaresOf(pawns):
+            count += (pawn_attacks[from_square] & enemy).bit_count()
+
+        return count
@@ -1,5 +1,20 @@
 from Moves.moves import Move
 from Moves.castling import Castling
+from GameState.zobrist import (
+    ZOBRIST_PIECES,
+    ZOBRIST_BLACK_TO_MOVE,
+    castlingKey,
+    enpassantKey,
+    computeZobristKey,
+    computePawnKey
+)
+from GameState.serialization import (
+    parseFen,
+    buildFen,
+    encodePosition,
+    decodePosition
+)
+from GameState.piece_values import piece_score, piece_position_scores
 from GameState.gamestate_helpers import (
     checkForPinsAndChecks,
     getPawnMoves,
@@ -8,9 +23,21 @@ from GameState.gamestate_helpers import (
     getBishopMoves,
     getQueenMoves,
     getKingMoves,
-    getCastleMoves
+    getEvasionMoves,
+    getCastleMoves,
+    isSquareAttacked,
+    buildAttackMap,
+    getCaptureMoves,
+    computeEvaluationTotals,
+    computePieceLocations,
+    pieceSquares,
+    countMobility
 )
 
+# attack_maps key of the cached king danger map (see GameState.getKingDangerMap)
+KING_DANGER_KEY = "king_danger"
+
+
 class GameState:
     
     
@@ -98,6 +125,136 @@ class GameState:
             )
         ]
 
+        # 64-bit Zobrist key identifying the current position (pieces, side to move,
+        # castling rights and en passant square). makeMove updates it incrementally.
+        self.zobrist_key = computeZobristKey(self)
+
+        # Keys of every position reached so far, pushed alongside move_log so undoMove can
+        # restore the previous key and repeated positions can be detected.
+        self.zobrist_key_log = [self.zobrist_key]
+
+        # Zobrist key over pawns and kings only, used by the evaluation's pawn hash table.
+        # Most moves leave it unchanged; pawn_key_log restores it on undo.
+        self.pawn_key = computePawnKey(self)
+        self.pawn_key_log = [self.pawn_key]
+
+        # Per-position cache of attack maps, keyed by attacking colour ('w' or 'b'), plus the
+        # side to move's king danger map under KING_DANGER_KEY. Filled lazily by
+        # getAttackMap/getKingDangerMap and cleared whenever the position changes.
+        self.attack_maps = {}
+
+        # Plies since the last capture or pawn move (for the fifty-move rule), with a log
+        # for undo, and the move number shown in FEN (increases after every black move).
+        self.halfmove_clock = 0
+        self.halfmove_clock_log = [self.halfmove_clock]
+        self.fullmove_number = 1
+
+        # Running evaluation totals per colour ('w'/'b'): material (piece_score) and piece-square
+        # bonuses (piece_position_scores). makeMove updates them from the squares the move changes,
+        # so the evaluation never has to rescan the board for them; score_log keeps the previous
+        # totals for undo.
+        self.material_score, self.position_score = computeEvaluationTotals(self)
+        self.score_log = []
+
+        # Squares of every piece, per piece ('wp', 'bK', ...), as sets of (row, col). makeMove and
+        # undoMove keep them in step with the board, so move generation and evaluation only visit
+        # occupied squares.
+        self.piece_locations = computePieceLocations(self)
+
+
+    @classmethod
+    def fromFen(cls, fen):
+        """
+        Creates a game set up from a FEN string.
+
+        Args:
+            fen (str): Position in Forsyth-Edwards Notation.
+
+        Returns:
+            GameState: A new game (of the class it is called on) with an empty move history.
+
+        Raises:
+            ValueError: If the FEN is malformed.
+        """
+        game_state = cls()
+        game_state.loadPosition(parseFen(fen))
+        return game_state
+
+
+    @classmethod
+    def fromBytes(cls, data):
+        """
+        Creates a game from a position packed by toBytes.
+
+        Returns:
+            GameState: A new game (of the class it is called on) with an empty move history.
+        """
+        game_state = cls()
+        game_state.loadPosition(decodePosition(data))
+        return game_state
+
+
+    def toFen(self):
+        """
+        Returns the current position as a FEN string.
+        """
+        return buildFen(self)
+
+
+    def toBytes(self):
+        """
+        Returns the current position packed into a fixed-size bytes object
+        (see GameState/serialization.py for the layout). Move history is not included.
+        """
+        return encodePosition(self)
+
+
+    def loadPosition(self, position):
+        """
+        Replaces the current game with the given position and clears the move history.
+
+        Args:
+            position (dict): Position dictionary as returned by parseFen or decodePosition.
+        """
+        # ---- 1. BOARD AND KINGS ----
+        self.board = [list(row) for row in position["board"]]
+        for row in range(8):
+            for col in range(8):
+                if self.board[row][col] == "wK":
+                    self.white_king_location = (row, col)
+                elif self.board[row][col] == "bK":
+                    self.black_king_location = (row, col)
+
+        # ---- 2. SIDE TO MOVE, CASTLING, EN PASSANT, CLOCKS ----
+        self.white_to_move = position["white_to_move"]
+
+        rights = position["castling_rights"]
+        self.current_castling_rights = Castling(rights.wks, rights.bks, rights.wqs, rights.bqs)
+        self.castle_rights_log = [Castling(rights.wks, rights.bks, rights.wqs, rights.bqs)]
+
+        self.enpassant_possible = position["enpassant_possible"]
+        self.enpassant_possible_log = [self.enpassant_possible]
+
+        self.halfmove_clock = position["halfmove_clock"]
+        self.halfmove_clock_log = [self.halfmove_clock]
+        self.fullmove_number = position["fullmove_number"]
+
+        # ---- 3. RESET HISTORY AND DERIVED STATE ----
+        self.move_log = []
+        self.zobrist_key = computeZobristKey(self)
+        self.zobrist_key_log = [self.zobrist_key]
+        self.pawn_key = computePawnKey(self)
+        self.pawn_key_log = [self.pawn_key]
+        self.material_score, self.position_score = computeEvaluationTotals(self)
+        self.score_log = []
+        self.piece_locations = computePieceLocations(self)
+        self.attack_maps.clear()
+        self.checkmate = False
+        self.stalemate = False
+        self.in_check = False
+        self.pins = []
+        self.checks = []
+
       
     def makeMove(self, move):
         """
@@ -108,6 +265,9 @@ class GameState:
                         piece moved, captured piece, and special move flags.
         """
 
+        # Remember the state-dependent key terms before they change
+        old_state_key = castlingKey(self.current_castling_rights) ^ enpassantKey(self.enpassant_possible)
+
         # ---- 1. UPDATE BOARD POSITION ----
 
         # Remove the piece from its start square
@@ -119,6 +279,9 @@ class GameState:
         # Record the move in the move history log
         self.move_log.append(move)
 
+        # Any cached attack maps describe the previous position
+        self.attack_maps.clear()
+
         # ---- 2. SWITCH PLAYER TURN ----
 
         # If it was white's move, switch to black and vice versa
@@ -134,9 +297,9 @@ class GameState:
 
         # ---- 4. HANDLE PAWN PROMOTION ----
 
-        # Promote pawn to queen by default if it reaches the back rank
+        # Replace a pawn that reaches the back rank with its promotion piece (queen by default)
         if move.is_pawn_promotion:
-            self.board[move.end_row][move.end_col] = move.piece_moved[0] + "Q"  # 'wQ' or 'bQ'
+            self.board[move.end_row][move.end_col] = move.piece_moved[0] + move.promotion_piece  # e.g. 'wQ'
 
         # ---- 5. HANDLE EN PASSANT ----
 
@@ -183,6 +346,181 @@ class GameState:
             )
         )
 
+        # ---- 9. UPDATE ZOBRIST KEYS ----
+
+        self.zobrist_key = self._zobristKeyAfter(move, old_state_key)
+        self.zobrist_key_log.append(self.zobrist_key)
+
+        # The pawn key only changes when a pawn or king moves or a pawn is captured
+        if move.piece_moved[1] in ("p", "K") or move.piece_captured[1] == "p":
+            self.pawn_key = self._pawnKeyAfter(move)
+        self.pawn_key_log.append(self.pawn_key)
+
+        # ---- 10. UPDATE MOVE CLOCKS ----
+
+        # Pawn moves and captures reset the fifty-move counter
+        if move.piece_moved[1] == "p" or move.is_capture:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        self.halfmove_clock_log.append(self.halfmove_clock)
+
+        # A full move is complete once black has moved
+        if move.piece_moved[0] == "b":
+            self.fullmove_number += 1
+
+        # ---- 11. UPDATE EVALUATION TOTALS ----
+
+        self.score_log.append((dict(self.material_score), dict(self.position_score)))
+        self._updateEvaluationTotals(move)
+
+        # ---- 12. UPDATE PIECE LOCATIONS ----
+
+        self._togglePieceLocations(move)
+
+
+    def _togglePieceLocations(self, move):
+        """
+        Moves the pieces affected by `move` between squares in the piece location sets. Every
+        step toggles a square in or out of a set, so the same call both makes and unmakes a move.
+        """
+        locations = self.piece_locations
+
+        def toggle(piece, square):
+            squares = locations[piece]
+            if square in squares:
+                squares.remove(square)
+            else:
+                squares.add(square)
+
+        end_square = (move.end_row, move.end_col)
+
+        # Captured piece (en passant captures beside the destination square)
+        if move.is_enpassant_move:
+            toggle(move.piece_captured, (move.start_row, move.end_col))
+        elif move.is_capture:
+            toggle(move.piece_captured, end_square)
+
+        # Moving piece, which becomes the promotion piece on the back rank
+        toggle(move.piece_moved, (move.start_row, move.start_col))
+        if move.is_pawn_promotion:
+            toggle(move.piece_moved[0] + move.promotion_piece, end_square)
+        else:
+            toggle(move.piece_moved, end_square)
+
+        # Castling also moves the rook
+        if move.is_castle_move:
+            rook = move.piece_moved[0] + "R"
+            if move.end_col - move.start_col == 2:
+                toggle(rook, (move.end_row, 7))  # King-side: h-file -> f-file
+                toggle(rook, (move.end_row, 5))
+            else:
+                toggle(rook, (move.end_row, 0))  # Queen-side: a-file -> d-file
+                toggle(rook, (move.end_row, 3))
+
+
+    def _updateEvaluationTotals(self, move):
+        """
+        Updates the material and piece-square totals for `move`. Only the squares the move
+        touches change: the start and end squares, the captured piece's square, and the rook's
+        squares when castling.
+        """
+        color = move.piece_moved[0]
+        table = piece_position_scores.get(move.piece_moved)
+
+        # Lift the moving piece off its start square
+        if table is not None:
+            self.position_score[color] -= table[move.start_row][move.start_col]
+
+        # Place it (or the promoted piece) on the destination square
+        if move.is_pawn_promotion:
+            promoted = color + move.promotion_piece
+            self.material_score[color] += piece_score[move.promotion_piece] - piece_score["p"]
+            self.position_score[color] += piece_position_scores[promoted][move.end_row][move.end_col]
+        elif table is not None:
+            self.position_score[color] += table[move.end_row][move.end_col]
+
+        # Remove the captured piece (en passant captures beside the destination square)
+        if move.is_capture:
+            captured = move.piece_captured
+            captured_row = move.start_row if move.is_enpassant_move else move.end_row
+            self.material_score[captured[0]] -= piece_score[captured[1]]
+            self.position_score[captured[0]] -= piece_position_scores[captured][captured_row][move.end_col]
+
+        # Castling also moves the rook
+        if move.is_castle_move:
+            rook_table = piece_position_scores[color + "R"][move.end_row]
+            if move.end_col - move.start_col == 2:
+                self.position_score[color] += rook_table[5] - rook_table[7]  # h-file -> f-file
+            else:
+                self.position_score[color] += rook_table[3] - rook_table[0]  # a-file -> d-file
+
+
+    def _zobristKeyAfter(self, move, old_state_key):
+        """
+        Computes the new Zobrist key after `move` by XORing out the features that changed
+        and XORing in the new ones, instead of rehashing the whole board.
+
+        Args:
+            move (Move): The move that was just made.
+            old_state_key (int): Castling and en passant key terms from before the move.
+
+        Returns:
+            int: The updated 64-bit key.
+        """
+        key = self.zobrist_key
+        moved = ZOBRIST_PIECES[move.piece_moved]
+
+        # Lift the moving piece off its start square
+        key ^= moved[move.start_row][move.start_col]
+
+        # Remove the captured piece (en passant captures beside the destination square)
+        if move.is_enpassant_move:
+            key ^= ZOBRIST_PIECES[move.piece_captured][move.start_row][move.end_col]
+        elif move.piece_captured != "--":
+            key ^= ZOBRIST_PIECES[move.piece_captured][move.end_row][move.end_col]
+
+        # Place the moved piece (or the promoted piece) on its destination square
+        if move.is_pawn_promotion:
+            key ^= ZOBRIST_PIECES[move.piece_moved[0] + move.promotion_piece][move.end_row][move.end_col]
+        else:
+            key ^= moved[move.end_row][move.end_col]
+
+        # Castling also moves the rook
+        if move.is_castle_move:
+            rook = ZOBRIST_PIECES[move.piece_moved[0] + "R"][move.end_row]
+            if move.end_col - move.start_col == 2:
+                key ^= rook[7] ^ rook[5]  # King-side: h-file -> f-file
+            else:
+                key ^= rook[0] ^ rook[3]  # Queen-side: a-file -> d-file
+
+        # Side to move, castling rights and en passant square
+        key ^= ZOBRIST_BLACK_TO_MOVE
+        key ^= old_state_key
+        key ^= castlingKey(self.current_castling_rights) ^ enpassantKey(self.enpassant_possible)
+        return key
+
+
+    def _pawnKeyAfter(self, move):
+        """
+        Computes the new pawn key after `move` (see _zobristKeyAfter), XORing pawns and kings
+        in and out of the pawn key only.
+        """
+        key = self.pawn_key
+
+        if move.piece_moved[1] in ("p", "K"):
+            moved = ZOBRIST_PIECES[move.piece_moved]
+            key ^= moved[move.start_row][move.start_col]
+            # A promoted pawn leaves the pawn structure
+            if not move.is_pawn_promotion:
+                key ^= moved[move.end_row][move.end_col]
+
+        if move.piece_captured[1] == "p":
+            captured_row = move.start_row if move.is_enpassant_move else move.end_row
+            key ^= ZOBRIST_PIECES[move.piece_captured][captured_row][move.end_col]
+
+        return key
+
 
     def undoMove(self):
         """
@@ -195,6 +533,9 @@ class GameState:
             # Remove the last move from the move log
             move = self.move_log.pop()
 
+            # Any cached attack maps describe the position being undone
+            self.attack_maps.clear()
+
             # Move the piece back to its original square
             self.board[move.start_row][move.start_col] = move.piece_moved
 
@@ -226,8 +567,9 @@ class GameState:
             # ---- 5. UNDO PROMOTION ----
 
             if move.is_pawn_promotion:
-                # Replace promoted queen with a pawn
-                self.board[move.end_row][move.end_col] = move.piece_moved[0] + "p"
+                # The pawn is already back on its start square (step 1); the promoted piece
+                # must make way for whatever stood on the promotion square before
+                self.board[move.end_row][move.end_col] = move.piece_captured
 
             # ---- 6. RESTORE CASTLING MOVE ----
 
@@ -263,7 +605,30 @@ class GameState:
                 last_rights.bqs
             )
 
-            # ---- 9. CLEAR CHECK/STATUS FLAGS ----
+            # ---- 9. RESTORE ZOBRIST KEYS ----
+
+            # Drop the key of the undone position and fall back to the previous one
+            self.zobrist_key_log.pop()
+            self.zobrist_key = self.zobrist_key_log[-1]
+            self.pawn_key_log.pop()
+            self.pawn_key = self.pawn_key_log[-1]
+
+            # ---- 10. RESTORE MOVE CLOCKS ----
+
+            self.halfmove_clock_log.pop()
+            self.halfmove_clock = self.halfmove_clock_log[-1]
+            if move.piece_moved[0] == "b":
+                self.fullmove_number -= 1
+
+            # ---- 11. RESTORE EVALUATION TOTALS ----
+
+            self.material_score, self.position_score = self.score_log.pop()
+
+            # ---- 12. RESTORE PIECE LOCATIONS ----
+
+            self._togglePieceLocations(move)
+
+            # ---- 13. CLEAR CHECK/STATUS FLAGS ----
 
             # Reset checkmate, stalemate, and check status
             self.checkmate = False
@@ -284,14 +649,14 @@ class GameState:
         # ---- 1. HANDLE ROOK CAPTURES ----
 
         # If a white rook was captured, check if it was one of the original rooks
-        if move.piece_captured == "wR":
+        if move.piece_captured == "wR" and move.end_row == 7:
             if move.end_col == 0:  # Captured on a1: white queen-side rook
                 self.current_castling_rights.wqs = False
             elif move.end_col == 7:  # Captured on h1: white king-side rook
                 self.current_castling_rights.wks = False
 
         # If a black rook was captured, check if it was one of the original rooks
-        elif move.piece_captured == "bR":
+        elif move.piece_captured == "bR" and move.end_row == 0:
             if move.end_col == 0:  # Captured on a8: black queen-side rook
                 self.current_castling_rights.bqs = False
             elif move.end_col == 7:  # Captured on h8: black king-side rook
@@ -335,6 +700,37 @@ class GameState:
         - Pins (pieces that cannot legally move without exposing the king)
         - Castling availability
 
+        Also records whether the position is checkmate or stalemate.
+
+        Returns:
+            list: A list of Move objects that are legal to play.
+        """
+
+        # ---- 1. GENERATE LEGAL MOVES ----
+        moves = self._generateLegalMoves()
+
+        # ---- 2. CHECK FOR CHECKMATE OR STALEMATE ----
+
+        if len(moves) == 0:
+            if self.inCheck():
+                self.checkmate = True
+                self.stalemate = False
+            else:
+                self.stalemate = True
+                self.checkmate = False
+        else:
+            self.checkmate = False
+            self.stalemate = False
+
+        return moves
+
+
+    def _generateLegalMoves(self):
+        """
+        Generates the legal moves for getValidMoves without touching the checkmate/stalemate
+        flags, so callers that only need the moves (getLegalMoveCodes, the staged picker) leave
+        the game status alone.
+
         Returns:
             list: A list of Move objects that are legal to play.
         """
@@ -362,35 +758,10 @@ class GameState:
         # ---- 3. HANDLE CASE: KING IS IN CHECK ----
         if self.in_check:
             if len(self.checks) == 1:
-                # SINGLE CHECK: Can escape by moving king, blocking the attack, or capturing the attacker
-                moves = self.getAllPossibleMoves()
-
-                # Extract attacker information
-                check = self.checks[0]
-                check_row, check_col = check[0], check[1]
-                piece_checking = self.board[check_row][check_col]
-
-                valid_squares = []  # Squares that can block or capture the checking piece
-
-                if piece_checking[1] == "N":
-                    # Knights cannot be blocked — only capturing the knight or moving king is allowed
-                    valid_squares = [(check_row, check_col)]
-                else:
-                    # For sliding pieces (R, B, Q), add the squares between the attacker and the king
-                    for i in range(1, 8):
-                        valid_square = (
-                            king_row + check[2] * i,
-                            king_col + check[3] * i
-                        )
-                        valid_squares.append(valid_square)
-                        if valid_square == (check_row, check_col):  # Stop at the attacker
-                            break
-
-                # Filter out any moves that don't move the king or block/capture the attacker
-                for i in range(len(moves) - 1, -1, -1):  # Reverse iteration for safe removal
-                    if moves[i].piece_moved[1] != "K":
-                        if (moves[i].end_row, moves[i].end_col) not in valid_squares:
-                            moves.remove(moves[i])
+                # SINGLE CHECK: Can escape by moving king, blocking the attack, or capturing the attacker.
+                # Only those moves are generated, rather than generating everything and filtering
+                moves = []
+                getEvasionMoves(self, king_row, king_col, self.checks[0], moves)
 
             else:
                 # DOUBLE CHECK: Only valid move is to move the king
@@ -409,26 +780,85 @@ class GameState:
             else:
                 getCastleMoves(self, self.black_king_location[0], self.black_king_location[1], moves)
 
-        # ---- 5. CHECK FOR CHECKMATE OR STALEMATE ----
-
-        if len(moves) == 0:
-            if self.inCheck():
-                self.checkmate = True
-                self.stalemate = False
-            else:
-                self.stalemate = True
-                self.checkmate = False
-        else:
-            self.checkmate = False
-            self.stalemate = False
-
-        # ---- 6. RESTORE CASTLING RIGHTS ----
+        # ---- 5. RESTORE CASTLING RIGHTS ----
         # This is important because some pseudo-moves simulate actual play and may affect castling rights.
         self.current_castling_rights = temp_castle_rights
 
         return moves  # Return the final filtered list of legal moves
 
 
+    def getLegalMoveCodes(self):
+        """
+        Returns the legal moves in their 16-bit integer encoding (see Moves/moves.py), for
+        callers that only count or look up moves. BitboardGameState generates these directly
+        without building Move objects; here they are taken from the list generator.
+
+        Returns:
+            list: Encoded moves.
+        """
+        return [move.encoded for move in self._generateLegalMoves()]
+
+
+    # --- STAGED MOVE GENERATION ---
+    # The search picks moves in stages (AI/chessai.py pickMoves): the hash move, then captures,
+    # then killers, then quiet moves. BitboardGameState generates each stage on its own; the
+    # list-based generator has no cheaper way to test a single move, so here the context is the
+    # full legal move list, generated once per position and split by the stage methods.
+
+    def prepareMoveGeneration(self):
+        """
+        Prepares the context shared by the generation stages of the current position.
+
+        Returns:
+            list: Generation context for getLegalMoveById, getLegalCaptureMoves and
+                getLegalQuietMoves.
+        """
+        return self._generateLegalMoves()
+
+
+    def getLegalMoveById(self, context, move_id):
+        """
+        Returns the legal move with the given moveID, or None if it is not legal here.
+
+        Args:
+            context (list): From prepareMoveGeneration for the current position.
+            move_id (int): moveID to look for (e.g. from the transposition table).
+
+        Returns:
+            Move or None
+        """
+        for move in context:
+            if move.moveID == move_id:
+                return move
+        return None
+
+
+    def getLegalCaptureMoves(self, context):
+        """
+        Returns the legal captures (including en passant) and promotions.
+
+        Args:
+            context (list): From prepareMoveGeneration for the current position.
+
+        Returns:
+            list: Move objects.
+        """
+        return [move for move in context if move.is_capture or move.is_pawn_promotion]
+
+
+    def getLegalQuietMoves(self, context):
+        """
+        Returns the legal moves that neither capture nor promote, castling included.
+
+        Args:
+            context (list): From prepareMoveGeneration for the current position.
+
+        Returns:
+            list: Move objects.
+        """
+        return [move for move in context if not (move.is_capture or move.is_pawn_promotion)]
+
+
     def inCheck(self):
         """
         Determines if the current player's king is in check (i.e., under direct attack).
@@ -444,34 +874,91 @@ class GameState:
             return self.squareUnderAttack(self.black_king_location[0], self.black_king_location[1])
 
 
+    def kingInCheck(self, color):
+        """
+        Determines whether `color`'s king is attacked, regardless of whose turn it is.
+        Used after making a pseudo-legal move to check that the mover's king is safe.
+
+        Args:
+            color (str): 'w' or 'b' — the side whose king is tested.
+
+        Returns:
+            bool: True if that king is under attack.
+        """
+        if color == "w":
+            return isSquareAttacked(self, self.white_king_location[0], self.white_king_location[1], "b")
+        return isSquareAttacked(self, self.black_king_location[0], self.black_king_location[1], "w")
+
+
     def squareUnderAttack(self, row, col):
         """
         Determines if a given square is under attack by the opponent's pieces.
 
+        Uses the cached attack map for the opponent if one has already been built for this
+        position; otherwise looks outward from the square along rays, knight jumps,
+        pawn diagonals and king steps (see isSquareAttacked).
+
         Args:
             row (int): Row index of the square to evaluate.
             col (int): Column index of the square to evaluate.
 
         Returns:
-            bool: True if any opposing move targets this square, False otherwise.
+            bool: True if any opposing piece attacks this square, False otherwise.
         """
+        enemy_color = "b" if self.white_to_move else "w"
 
-        # Temporarily switch turns to simulate the opponent's perspective.
-        self.white_to_move = not self.white_to_move
+        attack_map = self.attack_maps.get(enemy_color)
+        if attack_map is not None:
+            return attack_map[row][col] > 0
 
-        # Generate all possible moves for the opponent.
-        # These moves include pseudo-legal moves that don’t consider self-check.
-        opponents_moves = self.getAllPossibleMoves()
+        return isSquareAttacked(self, row, col, enemy_color)
 
-        # Revert turn to the current player.
-        self.white_to_move = not self.white_to_move
 
-        # Check if any move by the opponent targets the specified (row, col).
-        for move in opponents_moves:
-            if move.end_row == row and move.end_col == col:
-                return True  # The square is under attack
+    def getAttackMap(self, color):
+        """
+        Returns an 8x8 grid with the number of `color` pieces attacking each square.
+
+        The map is built once per position and cached, so king moves, castling and
+        squareUnderAttack share it (see getKingDangerMap). The cache is cleared by
+        makeMove/undoMove.
+
+        Args:
+            color (str): 'w' or 'b' — the attacking side.
 
-        return False  # No moves attack the square
+        Returns:
+            list: 8x8 list of attacker counts.
+        """
+        attack_map = self.attack_maps.get(color)
+        if attack_map is None:
+            attack_map = buildAttackMap(self, color)
+            self.attack_maps[color] = attack_map
+        return attack_map
+
+
+    def getKingDangerMap(self):
+        """
+        Returns the attack map of the side not to move, built with the side to move's king
+        taken off the board: sliders attack through the king's square. A king may step to a
+        square exactly when it is zero here.
+
+        Built once per position and cached alongside the attack maps (see getAttackMap).
+        When the king is not in check, no slider sees through it, so the map is also cached
+        as the plain attack map of the side not to move, and castling reuses it.
+
+        Returns:
+            list: 8x8 list of attacker counts.
+        """
+        danger_map = self.attack_maps.get(KING_DANGER_KEY)
+        if danger_map is None:
+            enemy_color = "b" if self.white_to_move else "w"
+            king_row, king_col = (
+                self.white_king_location if self.white_to_move else self.black_king_location
+            )
+            danger_map = buildAttackMap(self, enemy_color, transparent_square=(king_row, king_col))
+            self.attack_maps[KING_DANGER_KEY] = danger_map
+            if danger_map[king_row][king_col] == 0:
+                self.attack_maps.setdefault(enemy_color, danger_map)
+        return danger_map
 
 
     def getAllPossibleMoves(self):
@@ -486,19 +973,33 @@ class GameState:
         """
         moves = []  # List to accumulate generated moves
 
-        # Loop over every square on the 8x8 board
-        for row in range(len(self.board)):
-            for col in range(len(self.board[row])):
-                piece = self.board[row][col]  # Get the piece at the current square
+        # Visit only the current player's pieces, from the piece location sets
+        color = "w" if self.white_to_move else "b"
+        for row, col, piece_type in pieceSquares(self, color):
+            # Use the moveFunctions dictionary to dispatch to the correct generator
+            self.moveFunctions[piece_type](self, row, col, moves)
 
-                if piece != "--":  # Ignore empty squares
-                    color = piece[0]  # 'w' for white, 'b' for black
+        return moves  # Return the complete list of pseudo-legal moves
 
-                    # Only generate moves for the current player's pieces
-                    if (color == "w" and self.white_to_move) or (color == "b" and not self.white_to_move):
-                        piece_type = piece[1]  # e.g., 'p', 'R', 'N', 'B', 'Q', 'K'
 
-                        # Use the moveFunctions dictionary to dispatch to the correct generator
-                        self.moveFunctions[piece_type](self, row, col, moves)
+    def getCaptureMoves(self):
+        """
+        Generates the pseudo-legal captures and promotions for the current player only.
+        Much cheaper than getValidMoves when just the tactical moves are wanted (quiescence search).
+        The caller is responsible for rejecting moves that leave its own king in check.
 
-        return moves  # Return the complete list of pseudo-legal moves
\ No newline at end of file
+        Returns:
+            list: Move objects for captures and promotions.
+        """
+        return getCaptureMoves(self)
+
+
+    def getMobility(self, color):
+        """
+        Counts the pseudo-legal moves available to `color` ('w' or 'b'), whoever is to move.
+        Used by the evaluation; no Move objects are built and no game state is changed.
+
+        Returns:
+            int: Number of pseudo-legal moves (see gamestate_helpers.countMobility).
+        """
+        return countMobility(self, color)
@@ -1,4 +1,27 @@
 from Moves.moves import Move
+from GameState.piece_values import piece_score, piece_position_scores
+from GameState.precomputed import (
+    DIRECTIONS,
+    ROOK_DIRECTION_INDICES,
+    BISHOP_DIRECTION_INDICES,
+    KNIGHT_TARGETS,
+    KING_TARGETS,
+    RAYS,
+    PAWN_CAPTURE_TARGETS,
+    SQUARES_BETWEEN,
+    LINE_THROUGH
+)
+
+
+# Piece types in the order piece locations are visited
+PIECE_TYPES = ("p", "N", "B", "R", "Q", "K")
+
+# Indices into RAYS[row][col] that each sliding piece moves along
+SLIDER_DIRECTIONS = {
+    "R": ROOK_DIRECTION_INDICES,
+    "B": BISHOP_DIRECTION_INDICES,
+    "Q": ROOK_DIRECTION_INDICES + BISHOP_DIRECTION_INDICES
+}
 
 
 def checkForPinsAndChecks(game_state):
@@ -29,191 +52,415 @@ def checkForPinsAndChecks(game_state):
         ally_color = "b"
         start_row, start_col = game_state.black_king_location
 
-    # All 8 directions from the king: vertical, horizontal, and diagonal
-    directions = (
-        (-1, 0), (0, -1), (1, 0), (0, 1),    # up, left, down, right
-        (-1, -1), (-1, 1), (1, -1), (1, 1)   # diagonals: up-left, up-right, down-left, down-right
-    )
+    board = game_state.board
 
-    for j, direction in enumerate(directions):
+    # Walk the precomputed rays from the king in all 8 directions: vertical, horizontal, and diagonal
+    for j, ray in enumerate(RAYS[start_row][start_col]):
+        direction = DIRECTIONS[j]
         possible_pin = ()  # Track a candidate allied piece that might be pinned
-        for i in range(1, 8):
-            end_row = start_row + direction[0] * i
-            end_col = start_col + direction[1] * i
+        for i, (end_row, end_col) in enumerate(ray, 1):
+            end_piece = board[end_row][end_col]
 
-            # Ensure the target square is on the board
-            if 0 <= end_row < 8 and 0 <= end_col < 8:
-                end_piece = game_state.board[end_row][end_col]
+            if end_piece[0] == ally_color and end_piece[1] != "K":
+                # First allied piece in this direction — could be pinned
+                if possible_pin == ():
+                    possible_pin = (end_row, end_col, direction[0], direction[1])
+                else:
+                    # Second allied piece blocks the line — no pin or check possible in this direction
+                    break
+
+            elif end_piece[0] == enemy_color:
+                enemy_type = end_piece[1]
+
+                # Check if the enemy piece type can attack along this direction
+                is_rook_dir = 0 <= j <= 3
+                is_bishop_dir = 4 <= j <= 7
+                is_pawn_attack = (
+                    i == 1 and enemy_type == "p" and
+                    ((enemy_color == "w" and 6 <= j <= 7) or
+                    (enemy_color == "b" and 4 <= j <= 5))
+                )
+                is_adjacent_king = (i == 1 and enemy_type == "K")
+
+                if (enemy_type == "Q") or \
+                (is_rook_dir and enemy_type == "R") or \
+                (is_bishop_dir and enemy_type == "B") or \
+                is_pawn_attack or is_adjacent_king:
 
-                if end_piece[0] == ally_color and end_piece[1] != "K":
-                    # First allied piece in this direction — could be pinned
                     if possible_pin == ():
-                        possible_pin = (end_row, end_col, direction[0], direction[1])
+                        # No blocking piece: it's a check
+                        in_check = True
+                        checks.append((end_row, end_col, direction[0], direction[1]))
                     else:
-                        # Second allied piece blocks the line — no pin or check possible in this direction
-                        break
+                        # One blocking allied piece: it's pinned
+                        pins.append(possible_pin)
+                    break  # No further processing in this direction
 
-                elif end_piece[0] == enemy_color:
-                    enemy_type = end_piece[1]
-
-                    # Check if the enemy piece type can attack along this direction
-                    is_rook_dir = 0 <= j <= 3
-                    is_bishop_dir = 4 <= j <= 7
-                    is_pawn_attack = (
-                        i == 1 and enemy_type == "p" and
-                        ((enemy_color == "w" and 6 <= j <= 7) or
-                        (enemy_color == "b" and 4 <= j <= 5))
-                    )
-                    is_adjacent_king = (i == 1 and enemy_type == "K")
-
-                    if (enemy_type == "Q") or \
-                    (is_rook_dir and enemy_type == "R") or \
-                    (is_bishop_dir and enemy_type == "B") or \
-                    is_pawn_attack or is_adjacent_king:
-
-                        if possible_pin == ():
-                            # No blocking piece: it's a check
-                            in_check = True
-                            checks.append((end_row, end_col, direction[0], direction[1]))
-                        else:
-                            # One blocking allied piece: it's pinned
-                            pins.append(possible_pin)
-                        break  # No further processing in this direction
-
-                    else:
-                        # Enemy piece not relevant for check/pin in this direction
-                        break
-            else:
-                # Out of bounds
-                break
+                else:
+                    # Enemy piece not relevant for check/pin in this direction
+                    break
 
     # ---- HANDLE KNIGHT CHECKS SEPARATELY ----
     # Knights can jump over pieces, so direction-based scanning won't catch them
-    knight_moves = (
-        (-2, -1), (-2, 1), (-1, 2), (1, 2),
-        (2, -1), (2, 1), (-1, -2), (1, -2)
-    )
-
-    for move in knight_moves:
-        end_row = start_row + move[0]
-        end_col = start_col + move[1]
-        if 0 <= end_row < 8 and 0 <= end_col < 8:
-            end_piece = game_state.board[end_row][end_col]
-            if end_piece[0] == enemy_color and end_piece[1] == "N":
-                # King is in check by a knight
-                in_check = True
-                checks.append((end_row, end_col, move[0], move[1]))
+    enemy_knight = enemy_color + "N"
+    for end_row, end_col in KNIGHT_TARGETS[start_row][start_col]:
+        if board[end_row][end_col] == enemy_knight:
+            # King is in check by a knight
+            in_check = True
+            checks.append((end_row, end_col, end_row - start_row, end_col - start_col))
 
     return in_check, pins, checks
 
 
+def isSquareAttacked(game_state, row, col, attacker_color):
+    """
+    Determines whether any piece of `attacker_color` attacks the square (row, col).
+
+    Instead of generating the attacker's moves, this looks outward from the target square:
+    along the eight rays for sliders and kings, at the knight jumps, and at the two squares
+    a pawn would have to stand on to capture onto it. No Move objects are created.
+
+    Returns:
+        bool: True if the square is attacked.
+    """
+    board = game_state.board
+
+    # ---- 1. PAWNS ----
+    # A pawn attacks the square exactly when a pawn of the other colour on it would capture the pawn
+    pawn = attacker_color + "p"
+    for end_row, end_col in PAWN_CAPTURE_TARGETS["b" if attacker_color == "w" else "w"][row][col]:
+        if board[end_row][end_col] == pawn:
+            return True
+
+    # ---- 2. KNIGHTS ----
+    knight = attacker_color + "N"
+    for end_row, end_col in KNIGHT_TARGETS[row][col]:
+        if board[end_row][end_col] == knight:
+            return True
+
+    # ---- 3. SLIDERS AND KING ----
+    # The first four rays are orthogonal (rook/queen), the last four diagonal (bishop/queen)
+    for j, ray in enumerate(RAYS[row][col]):
+        sliders = ("R", "Q") if j < 4 else ("B", "Q")
+        for i, (end_row, end_col) in enumerate(ray, 1):
+            end_piece = board[end_row][end_col]
+            if end_piece == "--":
+                continue
+            # The first piece on the ray decides: either it attacks the square or it blocks
+            if end_piece[0] == attacker_color and \
+                    (end_piece[1] in sliders or (i == 1 and end_piece[1] == "K")):
+                return True
+            break
+
+    return False
+
+
+def isSquareAttackedBySliders(game_state, row, col, attacker_color, vacated=(), occupied=()):
+    """
+    Determines whether a rook, bishop or queen of `attacker_color` would attack (row, col)
+    if the squares in `vacated` were empty and those in `occupied` held a piece. Used to test
+    a move that changes several squares at once (en passant) without making it on the board.
+
+    Returns:
+        bool: True if a sliding piece attacks the square.
+    """
+    board = game_state.board
+
+    for j, ray in enumerate(RAYS[row][col]):
+        sliders = ("R", "Q") if j < 4 else ("B", "Q")
+        for end_square in ray:
+            if end_square in occupied:
+                break
+            end_piece = board[end_square[0]][end_square[1]]
+            if end_piece == "--" or end_square in vacated:
+                continue
+            # The first piece on the ray decides: either it attacks the square or it blocks
+            if end_piece[0] == attacker_color and end_piece[1] in sliders:
+                return True
+            break
+
+    return False
+
+
+def buildAttackMap(game_state, color, transparent_square=None):
+    """
+    Builds an 8x8 grid counting how many pieces of `color` attack each square.
+
+    Squares occupied by `color`'s own pieces are included (they count as defended),
+    and sliders stop at the first occupied square. Pawns only contribute their diagonal
+    captures, never their pushes.
+
+    Args:
+        transparent_square (tuple): Optional (row, col) that sliders see through as if it
+            were empty. Passing the defending king's square gives the squares the king
+            cannot step to, including those behind it on a checking line.
+
+    Returns:
+        list: 8x8 list of ints, where attack_map[row][col] is the number of attackers.
+    """
+    board = game_state.board
+    attack_map = [[0] * 8 for _ in range(8)]
+    pawn_targets = PAWN_CAPTURE_TARGETS[color]
+
+    for row, col, piece_type in pieceSquares(game_state, color):
+        if piece_type == "p" or piece_type == "N" or piece_type == "K":
+            if piece_type == "p":
+                targets = pawn_targets[row][col]
+            else:
+                targets = (KNIGHT_TARGETS if piece_type == "N" else KING_TARGETS)[row][col]
+            for end_row, end_col in targets:
+                attack_map[end_row][end_col] += 1
+
+        else:
+            rays = RAYS[row][col]
+            for j in SLIDER_DIRECTIONS[piece_type]:
+                for end_row, end_col in rays[j]:
+                    attack_map[end_row][end_col] += 1
+                    if board[end_row][end_col] != "--" and (end_row, end_col) != transparent_square:
+                        break  # Blocked beyond the first occupied square
+
+    return attack_map
+
+
+def countMobility(game_state, color):
+    """
+    Counts the pseudo-legal moves of `color`'s pieces without creating Move objects or
+    touching any game state, so it is safe to call from the evaluation at any time.
+
+    Every piece counts the squares it could move to: empty squares and enemy pieces it attacks.
+    Pawns count their pushes and diagonal captures. Pins, checks, castling and en passant are
+    ignored, and a promotion counts once.
+
+    Returns:
+        int: Number of pseudo-legal moves.
+    """
+    board = game_state.board
+    enemy_color = "b" if color == "w" else "w"
+    pawn_direction, start_row = (-1, 6) if color == "w" else (1, 1)
+    pawn_targets = PAWN_CAPTURE_TARGETS[color]
+
+    count = 0
+    for row, col, piece_type in pieceSquares(game_state, color):
+        if piece_type == "p":
+            end_row = row + pawn_direction
+            if board[end_row][col] == "--":
+                count += 1
+                if row == start_row and board[end_row + pawn_direction][col] == "--":
+                    count += 1
+            for end_row, end_col in pawn_targets[row][col]:
+                if board[end_row][end_col][0] == enemy_color:
+                    count += 1
+
+        elif piece_type == "N" or piece_type == "K":
+            for end_row, end_col in (KNIGHT_TARGETS if piece_type == "N" else KING_TARGETS)[row][col]:
+                if board[end_row][end_col][0] != color:
+                    count += 1
+
+        else:
+            rays = RAYS[row][col]
+            for j in SLIDER_DIRECTIONS[piece_type]:
+                for end_row, end_col in rays[j]:
+                    end_piece = board[end_row][end_col]
+                    if end_piece == "--":
+                        count += 1
+                        continue
+                    if end_piece[0] == enemy_color:
+                        count += 1  # Capture, then the ray is blocked
+                    break
+
+    return count
+
+
+def computeEvaluationTotals(game_state):
+    """
+    Sums the material (piece_score) and piece-square table (piece_position_scores) values of
+    every piece on the board, per colour. makeMove/undoMove keep these totals up to date
+    afterwards; this seeds them and can verify the incremental updates.
+
+    Returns:
+        tuple:
+            - material (dict): {'w': float, 'b': float}
+            - position (dict): {'w': float, 'b': float}
+    """
+    material = {"w": 0, "b": 0}
+    position = {"w": 0, "b": 0}
+    for row in range(8):
+        for col in range(8):
+            piece = game_state.board[row][col]
+            if piece != "--":
+                material[piece[0]] += piece_score[piece[1]]
+                if piece in piece_position_scores:  # Kings have no table
+                    position[piece[0]] += piece_position_scores[piece][row][col]
+    return material, position
+
+
+def computePieceLocations(game_state):
+    """
+    Collects the squares of every piece on the board, per piece ('wp', 'bK', ...). makeMove/undoMove
+    keep these sets up to date afterwards, so generators and the evaluation can visit just the
+    occupied squares instead of all 64.
+
+    Returns:
+        dict: Maps each of the twelve pieces to a set of (row, col) squares.
+    """
+    locations = {color + piece_type: set() for color in "wb" for piece_type in PIECE_TYPES}
+    for row in range(8):
+        for col in range(8):
+            piece = game_state.board[row][col]
+            if piece != "--":
+                locations[piece].add((row, col))
+    return locations
+
+
+def pieceSquares(game_state, color):
+    """
+    Yields (row, col, piece_type) for every piece of `color`, from the piece location sets.
+    """
+    locations = game_state.piece_locations
+    for piece_type in PIECE_TYPES:
+        for row, col in locations[color + piece_type]:
+            yield row, col, piece_type
+
+
+def getCaptureMoves(game_state):
+    """
+    Generates the *pseudo-legal* captures and promotions for the current player, without
+    building the full move list. Used by quiescence search.
+
+    Pins and checks are not considered: the caller must make the move and reject it if
+    the mover's king is left attacked (see GameState.kingInCheck).
+
+    Promotions are generated as queen promotions only; underpromotions are left to the
+    full move generator.
+
+    Returns:
+        list: Move objects for captures (including en passant) and pawn promotions.
+    """
+    moves = []
+    board = game_state.board
+
+    if game_state.white_to_move:
+        ally_color, enemy_color = "w", "b"
+        pawn_direction, promotion_row = -1, 0
+    else:
+        ally_color, enemy_color = "b", "w"
+        pawn_direction, promotion_row = 1, 7
+
+    pawn_targets = PAWN_CAPTURE_TARGETS[ally_color]
+
+    for row, col, piece_type in pieceSquares(game_state, ally_color):
+        if piece_type == "p":
+            end_row = row + pawn_direction
+            # Quiet promotion push
+            if end_row == promotion_row and board[end_row][col] == "--":
+                moves.append(Move((row, col), (end_row, col), board))
+            # Diagonal captures, including en passant
+            for end_square in pawn_targets[row][col]:
+                if board[end_square[0]][end_square[1]][0] == enemy_color:
+                    moves.append(Move((row, col), end_square, board))
+                elif end_square == game_state.enpassant_possible:
+                    moves.append(Move((row, col), end_square, board, is_enpassant_move=True))
+
+        elif piece_type == "N" or piece_type == "K":
+            for end_row, end_col in (KNIGHT_TARGETS if piece_type == "N" else KING_TARGETS)[row][col]:
+                if board[end_row][end_col][0] == enemy_color:
+                    moves.append(Move((row, col), (end_row, end_col), board))
+
+        else:
+            rays = RAYS[row][col]
+            for j in SLIDER_DIRECTIONS[piece_type]:
+                for end_row, end_col in rays[j]:
+                    end_piece = board[end_row][end_col]
+                    if end_piece != "--":
+                        # Only the first piece on the ray can be captured
+                        if end_piece[0] == enemy_color:
+                            moves.append(Move((row, col), (end_row, end_col), board))
+                        break
+
+    return moves
+
+
+def addPawnMove(start_square, end_square, board, moves):
+    """
+    Appends a pawn move to `moves`. A move onto the back rank is added once for every
+    promotion piece (queen, rook, bishop and knight).
+    """
+    end_row = end_square[0]
+    if end_row == 0 or end_row == 7:
+        for promotion_piece in Move.promotion_pieces:
+            moves.append(Move(start_square, end_square, board, promotion_piece=promotion_piece))
+    else:
+        moves.append(Move(start_square, end_square, board))
+
+
 def getPawnMoves(game_state, row, col, moves):
     """
     Appends all valid pawn moves for a pawn at (row, col) to the `moves` list.
     Considers:
         - standard 1- and 2-square advances
-        - diagonal captures
+        - diagonal captures, on the precomputed capture squares
+        - promotions (to any piece)
         - en passant
         - movement restrictions due to pins
     """
     # ---- 1. HANDLE PINS ----
 
     piece_pinned = False
-    pin_direction = ()
 
-    # Check if this pawn is pinned and store the direction if so
+    # Check if this pawn is pinned
     for i in range(len(game_state.pins) - 1, -1, -1):
         if game_state.pins[i][0] == row and game_state.pins[i][1] == col:
             piece_pinned = True
-            pin_direction = (game_state.pins[i][2], game_state.pins[i][3])
             game_state.pins.remove(game_state.pins[i])  # Remove the pin once processed
             break
 
-    # ---- 2. DETERMINE DIRECTION, STARTING ROW, ENEMY COLOR ----
+    # ---- 2. DETERMINE DIRECTION, STARTING ROW, COLORS ----
 
     if game_state.white_to_move:
         move_amount = -1             # White pawns move "up" the board
         start_row = 6
-        enemy_color = "b"
+        ally_color, enemy_color = "w", "b"
         king_row, king_col = game_state.white_king_location
     else:
         move_amount = 1              # Black pawns move "down"
         start_row = 1
-        enemy_color = "w"
+        ally_color, enemy_color = "b", "w"
         king_row, king_col = game_state.black_king_location
 
-    # ---- 3. ONE-SQUARE FORWARD MOVE ----
+    board = game_state.board
 
-    if game_state.board[row + move_amount][col] == "--":
-        if not piece_pinned or pin_direction == (move_amount, 0):
-            moves.append(Move((row, col), (row + move_amount, col), game_state.board))
+    # A pinned pawn may only move along the line through its king and itself,
+    # towards or away from the king
+    pin_line = LINE_THROUGH[king_row * 8 + king_col][row * 8 + col] if piece_pinned else None
 
-            # ---- 4. TWO-SQUARE FORWARD MOVE ----
-            if row == start_row and game_state.board[row + 2 * move_amount][col] == "--":
-                moves.append(Move((row, col), (row + 2 * move_amount, col), game_state.board))
+    # ---- 3. ONE-SQUARE FORWARD MOVE ----
 
-    # ---- 5. CAPTURE TO THE LEFT ----
+    end_row = row + move_amount
+    if board[end_row][col] == "--" and (pin_line is None or (end_row, col) in pin_line):
+        addPawnMove((row, col), (end_row, col), board, moves)
 
-    if col - 1 >= 0:
-        if not piece_pinned or pin_direction == (move_amount, -1):
-            if game_state.board[row + move_amount][col - 1][0] == enemy_color:
-                moves.append(Move((row, col), (row + move_amount, col - 1), game_state.board))
+        # ---- 4. TWO-SQUARE FORWARD MOVE ----
+        if row == start_row and board[end_row + move_amount][col] == "--":
+            moves.append(Move((row, col), (end_row + move_amount, col), board))
 
-            # ---- 6. EN PASSANT TO THE LEFT ----
-            if (row + move_amount, col - 1) == game_state.enpassant_possible:
-                attacking_piece = blocking_piece = False
-                if king_row == row:
-                    if king_col < col:
-                        inside_range = range(king_col + 1, col - 1)
-                        outside_range = range(col + 1, 8)
-                    else:
-                        inside_range = range(king_col - 1, col, -1)
-                        outside_range = range(col - 2, -1, -1)
-
-                    for i in inside_range:
-                        if game_state.board[row][i] != "--":
-                            blocking_piece = True
-                    for i in outside_range:
-                        square = game_state.board[row][i]
-                        if square[0] == enemy_color and square[1] in ("R", "Q"):
-                            attacking_piece = True
-                        elif square != "--":
-                            blocking_piece = True
-
-                # Only allow en passant if it does not expose the king to attack
-                if not attacking_piece or blocking_piece:
-                    moves.append(Move((row, col), (row + move_amount, col - 1), game_state.board, is_enpassant_move=True))
-
-    # ---- 7. CAPTURE TO THE RIGHT ----
-
-    if col + 1 <= 7:
-        if not piece_pinned or pin_direction == (move_amount, +1):
-            if game_state.board[row + move_amount][col + 1][0] == enemy_color:
-                moves.append(Move((row, col), (row + move_amount, col + 1), game_state.board))
-
-            # ---- 8. EN PASSANT TO THE RIGHT ----
-            if (row + move_amount, col + 1) == game_state.enpassant_possible:
-                attacking_piece = blocking_piece = False
-                if king_row == row:
-                    if king_col < col:
-                        inside_range = range(king_col + 1, col)
-                        outside_range = range(col + 2, 8)
-                    else:
-                        inside_range = range(king_col - 1, col + 1, -1)
-                        outside_range = range(col - 1, -1, -1)
+    # ---- 5. DIAGONAL CAPTURES ----
 
-                    for i in inside_range:
-                        if game_state.board[row][i] != "--":
-                            blocking_piece = True
-                    for i in outside_range:
-                        square = game_state.board[row][i]
-                        if square[0] == enemy_color and square[1] in ("R", "Q"):
-                            attacking_piece = True
-                        elif square != "--":
-                            blocking_piece = True
+    for end_square in PAWN_CAPTURE_TARGETS[ally_color][row][col]:
+        if pin_line is not None and end_square not in pin_line:
+            continue
 
-                if not attacking_piece or blocking_piece:
-                    moves.append(Move((row, col), (row + move_amount, col + 1), game_state.board, is_enpassant_move=True))
+        if board[end_square[0]][end_square[1]][0] == enemy_color:
+            addPawnMove((row, col), end_square, board, moves)
+
+        # ---- 6. EN PASSANT ----
+        elif end_square == game_state.enpassant_possible:
+            # Both pawns leave the rank at once, which can uncover a rook or queen on the
+            # king's rank; only an attack by a slider can appear this way
+            if not isSquareAttackedBySliders(
+                game_state, king_row, king_col, enemy_color,
+                vacated=((row, col), (row, end_square[1])), occupied=(end_square,)
+            ):
+                moves.append(Move((row, col), end_square, board, is_enpassant_move=True))
 
 
 def getRookMoves(game_state, row, col, moves):
@@ -240,39 +487,40 @@ def getRookMoves(game_state, row, col, moves):
                 game_state.pins.remove(game_state.pins[i])
             break
 
-    # ---- 2. DEFINE ROOK MOVEMENT DIRECTIONS ----
-
-    directions = ((-1, 0), (0, -1), (1, 0), (0, 1))  # up, left, down, right
-    enemy_color = "b" if game_state.white_to_move else "w"  # Determine opposing color
-
-    # ---- 3. GENERATE MOVES IN EACH DIRECTION ----
-
-    for direction in directions:
-        for i in range(1, 8):  # Rooks can move 1 to 7 squares in any direction
-            end_row = row + direction[0] * i
-            end_col = col + direction[1] * i
+    # ---- 2. WALK THE PRECOMPUTED ROOK RAYS ----
 
-            # Stop if the move goes off the board
-            if 0 <= end_row <= 7 and 0 <= end_col <= 7:
+    getSlidingMoves(game_state, row, col, ROOK_DIRECTION_INDICES, piece_pinned, pin_direction, moves)
 
-                # Enforce pin restriction: rook can only move along the pin line
-                if not piece_pinned or pin_direction == direction or pin_direction == (-direction[0], -direction[1]):
-
-                    end_piece = game_state.board[end_row][end_col]
-
-                    if end_piece == "--":
-                        # Empty square — legal move
-                        moves.append(Move((row, col), (end_row, end_col), game_state.board))
-                    elif end_piece[0] == enemy_color:
-                        # Enemy piece — capture is legal
-                        moves.append(Move((row, col), (end_row, end_col), game_state.board))
-                        break  # Stop searching this direction after a capture
-                    else:
-                        # Friendly piece — rook cannot move past or onto it
-                        break
 
+def getSlidingMoves(game_state, row, col, direction_indices, piece_pinned, pin_direction, moves):
+    """
+    Appends the moves of a sliding piece on (row, col) along the precomputed rays
+    RAYS[row][col][j] for every j in `direction_indices`, stopping at the first occupied square
+    (which is included when it holds an enemy piece). A pinned piece only moves along its pin line.
+    """
+    board = game_state.board
+    enemy_color = "b" if game_state.white_to_move else "w"  # Determine opposing color
+    rays = RAYS[row][col]
+
+    for j in direction_indices:
+        # Enforce pin restriction: the piece can only move along the pin line
+        if piece_pinned:
+            direction = DIRECTIONS[j]
+            if pin_direction != direction and pin_direction != (-direction[0], -direction[1]):
+                continue
+
+        for end_square in rays[j]:
+            end_piece = board[end_square[0]][end_square[1]]
+
+            if end_piece == "--":
+                # Empty square — legal move
+                moves.append(Move((row, col), end_square, board))
+            elif end_piece[0] == enemy_color:
+                # Enemy piece — capture is legal
+                moves.append(Move((row, col), end_square, board))
+                break  # Stop searching this direction after a capture
             else:
-                # Move went out of bounds — stop checking this direction
+                # Friendly piece — cannot move past or onto it
                 break
 
 
@@ -290,26 +538,17 @@ def getKnightMoves(game_state, row, col, moves):
             game_state.pins.remove(game_state.pins[i])
             break
 
-    # ---- 2. Define knight movement offsets ----
-    knight_moves = (
-        (-2, -1), (-2, 1), (-1, 2), (1, 2),
-        (2, -1), (2, 1), (-1, -2), (1, -2)
-    )
+    if piece_pinned:
+        return
 
     ally_color = "w" if game_state.white_to_move else "b"  # Determine friendly color
+    board = game_state.board
 
-    # ---- 3. Generate each potential move ----
-    for move in knight_moves:
-        end_row = row + move[0]
-        end_col = col + move[1]
-
-        # Make sure the target square is on the board
-        if 0 <= end_row <= 7 and 0 <= end_col <= 7:
-            if not piece_pinned:
-                end_piece = game_state.board[end_row][end_col]
-                if end_piece[0] != ally_color:
-                    # Move is valid if landing on empty or enemy square
-                    moves.append(Move((row, col), (end_row, end_col), game_state.board))
+    # ---- 2. Generate each precomputed target square ----
+    for end_square in KNIGHT_TARGETS[row][col]:
+        if board[end_square[0]][end_square[1]][0] != ally_color:
+            # Move is valid if landing on empty or enemy square
+            moves.append(Move((row, col), end_square, board))
 
 
 def getBishopMoves(game_state, row, col, moves):
@@ -328,81 +567,142 @@ def getBishopMoves(game_state, row, col, moves):
             game_state.pins.remove(game_state.pins[i])
             break
 
-    # ---- 2. Define diagonal directions ----
-    directions = ((-1, -1), (-1, 1), (1, 1), (1, -1))  # Top-left, top-right, bottom-right, bottom-left
-    enemy_color = "b" if game_state.white_to_move else "w"
-
-    # ---- 3. Explore each direction ----
-    for direction in directions:
-        for i in range(1, 8):  # Bishops can move up to 7 squares in one direction
-            end_row = row + direction[0] * i
-            end_col = col + direction[1] * i
-
-            # Check board boundaries
-            if 0 <= end_row <= 7 and 0 <= end_col <= 7:
-                # Allow movement only along the pin line if pinned
-                if not piece_pinned or pin_direction == direction or pin_direction == (-direction[0], -direction[1]):
-                    end_piece = game_state.board[end_row][end_col]
-
-                    if end_piece == "--":
-                        moves.append(Move((row, col), (end_row, end_col), game_state.board))
-                    elif end_piece[0] == enemy_color:
-                        moves.append(Move((row, col), (end_row, end_col), game_state.board))
-                        break  # Stop direction on capture
-                    else:
-                        break  # Stop if blocked by friendly piece
-            else:
-                break  # Direction goes off board
+    # ---- 2. Walk the precomputed diagonal rays ----
+    getSlidingMoves(game_state, row, col, BISHOP_DIRECTION_INDICES, piece_pinned, pin_direction, moves)
 
 
 def getQueenMoves(game_state, row, col, moves):
     """
     Get all the queen moves for the queen located at row col and add the moves to the list.
     """
-    getBishopMoves(game_state, row, col, moves) # Diagonal moves
+    # getRookMoves leaves a queen's pin in place, so it must run first for
+    # getBishopMoves to see the same pin (and then remove it)
     getRookMoves(game_state, row, col, moves) # Horizontal and vertical moves
+    getBishopMoves(game_state, row, col, moves) # Diagonal moves
 
 def getKingMoves(game_state, row, col, moves):
     """
     Appends all valid king moves from (row, col) to the `moves` list.
     The king moves one square in any direction, but cannot move into check.
-    """
 
-    # ---- 1. Define the 8 possible king moves (row/col deltas) ----
-    row_moves = (-1, -1, -1,  0, 0, 1, 1, 1)
-    col_moves = (-1,  0,  1, -1, 1, -1, 0, 1)
+    Destinations are tested against the enemy attack map built with the king removed
+    (GameState.getKingDangerMap), so a king cannot step back along the line of a slider
+    that checks it. The map is built once per position and only if the king has a
+    square to go to.
+    """
 
     ally_color = "w" if game_state.white_to_move else "b"
+    board = game_state.board
+    danger_map = None
 
-    for i in range(8):
-        end_row = row + row_moves[i]
-        end_col = col + col_moves[i]
+    # ---- 1. Visit the precomputed on-board king targets ----
+    for end_row, end_col in KING_TARGETS[row][col]:
 
-        # ---- 2. Skip off-board moves ----
-        if 0 <= end_row <= 7 and 0 <= end_col <= 7:
-            end_piece = game_state.board[end_row][end_col]
+        # ---- 2. Skip moves to squares occupied by allied pieces ----
+        if board[end_row][end_col][0] != ally_color:
 
-            # ---- 3. Skip moves to squares occupied by allied pieces ----
-            if end_piece[0] != ally_color:
+            # ---- 3. Only allow the move if the destination is not attacked ----
+            if danger_map is None:
+                danger_map = game_state.getKingDangerMap()
+            if danger_map[end_row][end_col] == 0:
+                moves.append(Move((row, col), (end_row, end_col), board))
 
-                # ---- 4. Temporarily move the king to simulate the position ----
-                if ally_color == "w":
-                    game_state.white_king_location = (end_row, end_col)
-                else:
-                    game_state.black_king_location = (end_row, end_col)
 
-                # ---- 5. Check if the new king position is under attack ----
-                in_check, pins, checks = checkForPinsAndChecks(game_state)
+def getEvasionMoves(game_state, king_row, king_col, check, moves):
+    """
+    Appends the legal moves out of a single check to the `moves` list, without generating
+    every pseudo-legal move first:
+        - king moves (getKingMoves)
+        - captures of the checking piece, including en passant of a checking pawn
+        - interpositions on the squares between the king and a checking slider
+
+    Pinned pieces are skipped entirely: a piece pinned to the king can never capture the
+    checker or block the check without exposing the king along its pin.
+
+    Args:
+        king_row, king_col (int): Location of the king in check.
+        check (tuple): (row, col, direction_row, direction_col) of the checking piece, as
+            returned by checkForPinsAndChecks.
+    """
+    # ---- 1. KING MOVES ----
+    getKingMoves(game_state, king_row, king_col, moves)
 
-                if not in_check:
-                    # Only allow the move if the king would not be in check
-                    moves.append(Move((row, col), (end_row, end_col), game_state.board))
+    board = game_state.board
+    check_row, check_col = check[0], check[1]
 
-                # ---- 6. Restore king's original position ----
-                if ally_color == "w":
-                    game_state.white_king_location = (row, col)
-                else:
-                    game_state.black_king_location = (row, col)
+    if game_state.white_to_move:
+        ally_color, enemy_color = "w", "b"
+        move_amount, double_push_row = -1, 4
+    else:
+        ally_color, enemy_color = "b", "w"
+        move_amount, double_push_row = 1, 3
+
+    pinned = {(pin[0], pin[1]) for pin in game_state.pins}
+    ally_pawn, ally_knight = ally_color + "p", ally_color + "N"
+
+    # ---- 2. TARGET SQUARES: THE CHECKER AND THE SQUARES BETWEEN ----
+    # Empty for knight, pawn and adjacent checks, which cannot be blocked
+    targets = [(check_row, check_col)]
+    targets.extend(SQUARES_BETWEEN[king_row * 8 + king_col][check_row * 8 + check_col])
+
+    for target in targets:
+        end_row, end_col = target
+        is_capture = target == (check_row, check_col)
+
+        # ---- 3. KNIGHTS THAT JUMP TO THE TARGET ----
+        for start_square in KNIGHT_TARGETS[end_row][end_col]:
+            if board[start_square[0]][start_square[1]] == ally_knight and start_square not in pinned:
+                moves.append(Move(start_square, target, board))
+
+        # ---- 4. SLIDERS THAT REACH THE TARGET ----
+        # The first piece on each ray from the target is the only one that can slide onto it
+        for j, ray in enumerate(RAYS[end_row][end_col]):
+            sliders = ("R", "Q") if j < 4 else ("B", "Q")
+            for start_square in ray:
+                start_piece = board[start_square[0]][start_square[1]]
+                if start_piece == "--":
+                    continue
+                if start_piece[0] == ally_color and start_piece[1] in sliders and start_square not in pinned:
+                    moves.append(Move(start_square, target, board))
+                break
+
+        # ---- 5. PAWNS ----
+        if is_capture:
+            # A pawn captures onto the target from where an enemy pawn on it would capture
+            for start_square in PAWN_CAPTURE_TARGETS[enemy_color][end_row][end_col]:
+                if board[start_square[0]][start_square[1]] == ally_pawn and start_square not in pinned:
+                    addPawnMove(start_square, target, board, moves)
+        else:
+            # Pushes onto an empty square between the checker and the king
+            start_row = end_row - move_amount
+            if 0 <= start_row < 8:
+                start_piece = board[start_row][end_col]
+                if start_piece == ally_pawn:
+                    if (start_row, end_col) not in pinned:
+                        addPawnMove((start_row, end_col), target, board, moves)
+                elif start_piece == "--" and end_row == double_push_row:
+                    start_row -= move_amount
+                    if board[start_row][end_col] == ally_pawn and (start_row, end_col) not in pinned:
+                        moves.append(Move((start_row, end_col), target, board))
+
+    # ---- 6. EN PASSANT ----
+    # Resolves the check either by removing a checking pawn that just double-pushed or by
+    # landing between a slider and the king
+    if game_state.enpassant_possible != ():
+        ep_row, ep_col = game_state.enpassant_possible
+        captured_square = (ep_row - move_amount, ep_col)
+        if captured_square == (check_row, check_col) or (ep_row, ep_col) in targets:
+            for start_square in PAWN_CAPTURE_TARGETS[enemy_color][ep_row][ep_col]:
+                if board[start_square[0]][start_square[1]] != ally_pawn or start_square in pinned:
+                    continue
+                # Two pawns leave the board at once, which can still uncover a slider's attack
+                # on the king; only sliders matter, since any other checker is the captured pawn
+                safe = not isSquareAttackedBySliders(
+                    game_state, king_row, king_col, enemy_color,
+                    vacated=(start_square, captured_square), occupied=((ep_row, ep_col),)
+                )
+                if safe:
+                    moves.append(Move(start_square, (ep_row, ep_col), board, is_enpassant_move=True))
 
 
 def getCastleMoves(game_state, row, col, moves):
@@ -413,6 +713,9 @@ def getCastleMoves(game_state, row, col, moves):
         - King not currently in check
         - Path not under attack
         - Squares between king and rook are unoccupied
+
+    The path is tested against the cached enemy attack map (GameState.getAttackMap), which
+    king move generation has normally built already for this position.
     """
     if game_state.squareUnderAttack(row, col):
         return  # Cannot castle out of, through, or into check
@@ -434,12 +737,15 @@ def getKingsideCastleMoves(game_state, row, col, moves):
         - Squares between king and rook (f1, g1) or (f8, g8) are empty
         - Squares the king passes through are not under attack
     """
-    if game_state.board[row][col + 1] == '--' and game_state.board[row][col + 2] == '--':
-        if not game_state.squareUnderAttack(row, col + 1) and not game_state.squareUnderAttack(row, col + 2):
+    # Here the squares between king and rook are exactly the ones the king passes through
+    path = SQUARES_BETWEEN[row * 8 + col][row * 8 + col + 3]
+    if all(game_state.board[end_row][end_col] == "--" for end_row, end_col in path):
+        attack_map = game_state.getAttackMap("b" if game_state.white_to_move else "w")
+        if not any(attack_map[end_row][end_col] for end_row, end_col in path):
             # All conditions met: perform castling move
             moves.append(Move((row, col), (row, col + 2), game_state.board, is_castle_move=True))
 
-            
+
 def getQueensideCastleMoves(game_state, row, col, moves):
     """
     Appends a queenside castling move to `moves` if it is valid.
@@ -447,10 +753,12 @@ def getQueensideCastleMoves(game_state, row, col, moves):
         - Squares between king and rook (d1, c1, b1) or (d8, c8, b8) are empty
         - Squares the king passes through are not under attack
     """
-    if game_state.board[row][col - 1] == '--' and \
-    game_state.board[row][col - 2] == '--' and \
-    game_state.board[row][col - 3] == '--':
-        if not game_state.squareUnderAttack(row, col - 1) and not game_state.squareUnderAttack(row, col - 2):
+    king_square = row * 8 + col
+    if all(game_state.board[end_row][end_col] == "--"
+           for end_row, end_col in SQUARES_BETWEEN[king_square][king_square - 4]):
+        # The king passes through d1 and c1 (d8 and c8): the squares between it and b1 (b8)
+        attack_map = game_state.getAttackMap("b" if game_state.white_to_move else "w")
+        if not any(attack_map[end_row][end_col]
+                   for end_row, end_col in SQUARES_BETWEEN[king_square][king_square - 3]):
             # All conditions met: perform castling move
             moves.append(Move((row, col), (row, col - 2), game_state.board, is_castle_move=True))
-
@@ -0,0 +1,190 @@
+"""
+Perft ("performance test") for the move generator.
+
+perft(n) walks the full legal move tree to depth n and counts the leaf nodes. The counts for
+well-known positions are published, so any difference points straight at a move generation
+bug (use divide to find the root move whose subtree is wrong). The same walk exercises
+getValidMoves, makeMove and undoMove, so the nodes per second it reports is the throughput
+number to compare between versions.
+
+Run from the project root:
+    python -m GameState.perft                      # standard suite, quick depths
+    python -m GameState.perft --full               # standard suite, every known depth
+    python -m GameState.perft --depth 4 --divide   # one position, per-move breakdown
+    python -m GameState.perft --fen "<FEN>" --depth 3 --mailbox
+"""
+
+import argparse
+import sys
+import time
+
+from GameState.gamestate import GameState
+from GameState.bitboard import BitboardGameState
+
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Standard positions with their known node counts: (name, FEN, {depth: nodes}).
+# The first seven (position 4 twice, once colour-mirrored) are the usual suite; the rest each
+# isolate one rule that is easy to get wrong.
+PERFT_SUITE = [
+    ("Start position", START_FEN,
+     {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609}),
+    ("Kiwipete (castling, pins, en passant)",
+     "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     {1: 48, 2: 2039, 3: 97862, 4: 4085603}),
+    ("Position 3 (en passant pins, rook endgame)",
+     "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624}),
+    ("Position 4 (promotions, checks)",
+     "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     {1: 6, 2: 264, 3: 9467, 4: 422333}),
+    ("Position 4 mirrored",
+     "r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1",
+     {1: 6, 2: 264, 3: 9467, 4: 422333}),
+    ("Position 5 (promotion captures)",
+     "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     {1: 44, 2: 1486, 3: 62379, 4: 2103487}),
+    ("Position 6 (middlegame)",
+     "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     {1: 46, 2: 2079, 3: 89890, 4: 3894594}),
+    ("Double check and checkmate", "8/8/2k5/5q2/5n2/8/5K2/8 b - - 0 1", {4: 23527}),
+    ("Self stalemate", "K1k5/8/P7/8/8/8/8/8 w - - 0 1", {6: 2217}),
+    ("Underpromotion to give check", "8/P1k5/K7/8/8/8/8/8 w - - 0 1", {6: 92683}),
+    ("Promotion to give check", "4k3/1P6/8/8/8/8/K7/8 w - - 0 1", {6: 217342}),
+    ("Stalemate and checkmate", "8/k1P5/8/1K6/8/8/8/8 w - - 0 1", {7: 567584}),
+    ("Short castling gives check", "5k2/8/8/8/8/8/8/4K2R w K - 0 1", {6: 661072}),
+    ("Long castling gives check", "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1", {6: 803711}),
+    ("Illegal en passant (horizontal pin)", "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1", {6: 1134888}),
+    ("Illegal en passant (diagonal pin)", "8/8/4k3/8/2p5/8/B2P2K1/8 w - - 0 1", {6: 1015133}),
+    ("En passant capture gives check", "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1", {6: 1440467}),
+    ("Castling rights", "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1", {4: 1274206}),
+    ("Castling prevented", "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1", {4: 1720476}),
+    ("Promotion out of check", "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1", {6: 3821001}),
+]
+
+# Depths whose node count exceeds this are skipped unless the full suite is requested
+QUICK_MAX_NODES = 250000
+
+
+def perft(game_state, depth):
+    """
+    Counts the leaf nodes of the legal move tree below the current position.
+
+    The last ply is bulk-counted: the number of legal moves is used directly instead of
+    making and unmaking each of them, and is taken from getLegalMoveCodes so no Move objects
+    are built for the leaves.
+
+    Args:
+        game_state (GameState): Position to count from. Restored before returning.
+        depth (int): Number of plies to search (>= 1).
+
+    Returns:
+        int: Number of leaf nodes at `depth`.
+    """
+    if depth == 1:
+        return len(game_state.getLegalMoveCodes())
+
+    nodes = 0
+    for move in game_state.getValidMoves():
+        game_state.makeMove(move)
+        nodes += perft(game_state, depth - 1)
+        game_state.undoMove()
+    return nodes
+
+
+def divide(game_state, depth):
+    """
+    Runs perft separately below every root move, so a wrong total can be traced to the
+    move (and then, recursively, the line) whose subtree is miscounted.
+
+    Returns:
+        dict: Maps each root move in UCI notation (e.g. 'e2e4') to its leaf count.
+    """
+    counts = {}
+    for move in game_state.getValidMoves():
+        if depth == 1:
+            counts[move.getUciNotation()] = 1
+        else:
+            game_state.makeMove(move)
+            counts[move.getUciNotation()] = perft(game_state, depth - 1)
+            game_state.undoMove()
+    return counts
+
+
+def runSuite(state_class=BitboardGameState, max_nodes=QUICK_MAX_NODES):
+    """
+    Runs perft over PERFT_SUITE and compares every count with the known value.
+
+    Args:
+        state_class (type): GameState implementation to test.
+        max_nodes (int): Skip depths whose known count is larger than this (None runs all).
+
+    Returns:
+        bool: True if every count matched.
+    """
+    all_passed = True
+    total_nodes = 0
+    total_time = 0.0
+
+    for name, fen, known_counts in PERFT_SUITE:
+        for depth, expected in sorted(known_counts.items()):
+            if max_nodes is not None and expected > max_nodes:
+                continue
+
+            game_state = state_class.fromFen(fen)
+            start_time = time.perf_counter()
+            nodes = perft(game_state, depth)
+            elapsed = time.perf_counter() - start_time
+
+            total_nodes += nodes
+            total_time += elapsed
+            passed = nodes == expected
+            all_passed = all_passed and passed
+
+            print("{:<4} {:<44} depth {} {:>9} nodes {:>8.0f} nps{}".format(
+                "ok" if passed else "FAIL", name, depth, nodes, nodes / max(elapsed, 1e-9),
+                "" if passed else "  (expected {})".format(expected)
+            ))
+
+    print("total {} nodes in {:.2f}s ({:.0f} nps)".format(
+        total_nodes, total_time, total_nodes / max(total_time, 1e-9)
+    ))
+    return all_passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft move generator test and benchmark.")
+    parser.add_argument("--fen", help="position to count (default: run the standard suite)")
+    parser.add_argument("--depth", type=int, help="depth for a single position")
+    parser.add_argument("--divide", action="store_true", help="print the count below every root move")
+    parser.add_argument("--full", action="store_true", help="run every known depth of the suite")
+    parser.add_argument("--mailbox", action="store_true",
+                        help="test the list-based GameState instead of BitboardGameState")
+    args = parser.parse_args()
+
+    state_class = GameState if args.mailbox else BitboardGameState
+
+    # ---- STANDARD SUITE ----
+    if args.fen is None and args.depth is None:
+        passed = runSuite(state_class, None if args.full else QUICK_MAX_NODES)
+        sys.exit(0 if passed else 1)
+
+    # ---- SINGLE POSITION ----
+    game_state = state_class.fromFen(args.fen or START_FEN)
+    depth = args.depth or 1
+    start_time = time.perf_counter()
+    if args.divide:
+        counts = divide(game_state, depth)
+        for move_name in sorted(counts):
+            print("{}: {}".format(move_name, counts[move_name]))
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(game_state, depth)
+    elapsed = time.perf_counter() - start_time
+
+    print("depth {} nodes {} time {:.2f}s nps {:.0f}".format(depth, nodes, elapsed, nodes / max(elapsed, 1e-9)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Material values and piece-square tables shared by the board model and the evaluation.
+
+GameState keeps running material and piece-square totals as moves are made (see
+GameState._updateEvaluationTotals), and the AI's static evaluation reads the same weights, so
+they live here rather than in AI/chessai.py: the board model does not depend on the search.
+
+The tables are mutable. AI.chessai.setEvaluationParameters overwrites them in place with tuned
+weights, so every module that imported them sees the new values.
+"""
+
+# --- MATERIAL SCORES ---
+
+# Assigns material value to each piece type (used in static evaluation).
+# These values approximate the traditional chess piece valuations.
+piece_score = {
+    "K": 0,  # King is not scored directly since its loss ends the game.
+    "Q": 9,  # Queen is most valuable
+    "R": 5,  # Rook
+    "B": 3,  # Bishop
+    "N": 3,  # Knight
+    "p": 1   # Pawn
+}
+
+# --- POSITIONAL SCORES (PIECE-SQUARE TABLES) ---
+
+# These tables encourage good piece positioning.
+# Higher values represent stronger control or tactical advantage for that square.
+# Tables are flipped for black to maintain symmetry from white's perspective.
+
+# Knight is most valuable in the center, less so on the edges.
+knight_scores = [
+    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0],
+    [0.1, 0.3, 0.5, 0.5, 0.5, 0.5, 0.3, 0.1],
+    [0.2, 0.5, 0.6, 0.65, 0.65, 0.6, 0.5, 0.2],
+    [0.2, 0.55, 0.65, 0.7, 0.7, 0.65, 0.55, 0.2],
+    [0.2, 0.5, 0.65, 0.7, 0.7, 0.65, 0.5, 0.2],
+    [0.2, 0.55, 0.6, 0.65, 0.65, 0.6, 0.55, 0.2],
+    [0.1, 0.3, 0.5, 0.55, 0.55, 0.5, 0.3, 0.1],
+    [0.0, 0.1, 0.2, 0.2, 0.2, 0.2, 0.1, 0.0]
+]
+
+# Bishop prefers open diagonals and central influence.
+bishop_scores = [
+    [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0],
+    [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
+    [0.2, 0.4, 0.5, 0.6, 0.6, 0.5, 0.4, 0.2],
+    [0.2, 0.5, 0.5, 0.6, 0.6, 0.5, 0.5, 0.2],
+    [0.2, 0.4, 0.6, 0.6, 0.6, 0.6, 0.4, 0.2],
+    [0.2, 0.6, 0.6, 0.6, 0.6, 0.6, 0.6, 0.2],
+    [0.2, 0.5, 0.4, 0.4, 0.4, 0.4, 0.5, 0.2],
+    [0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.0]
+]
+
+# Rooks are best placed on open files and central ranks.
+rook_scores = [
+    [0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25],
+    [0.5, 0.75, 0.75, 0.75, 0.75, 0.75, 0.75, 0.5],
+    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+    [0.0, 0.25, 0.25, 0.25, 0.25, 0.25, 0.25, 0.0],
+    [0.25, 0.25, 0.25, 0.5, 0.5, 0.25, 0.25, 0.25]
+]
+
+# Queen gains value from central control and flexibility.
+queen_scores = [
+    [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0],
+    [0.2, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.2],
+    [0.2, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
+    [0.3, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
+    [0.4, 0.4, 0.5, 0.5, 0.5, 0.5, 0.4, 0.3],
+    [0.2, 0.5, 0.5, 0.5, 0.5, 0.5, 0.4, 0.2],
+    [0.2, 0.4, 0.5, 0.4, 0.4, 0.4, 0.4, 0.2],
+    [0.0, 0.2, 0.2, 0.3, 0.3, 0.2, 0.2, 0.0]
+]
+
+# Pawns are evaluated based on progression and structure.
+pawn_scores = [
+    [0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8, 0.8],  # Rank 1 (Black side, white pawns start here)
+    [0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7, 0.7],
+    [0.3, 0.3, 0.4, 0.5, 0.5, 0.4, 0.3, 0.3],
+    [0.25, 0.25, 0.3, 0.45, 0.45, 0.3, 0.25, 0.25],
+    [0.2, 0.2, 0.2, 0.4, 0.4, 0.2, 0.2, 0.2],
+    [0.25, 0.15, 0.1, 0.2, 0.2, 0.1, 0.15, 0.25],
+    [0.25, 0.3, 0.3, 0.0, 0.0, 0.3, 0.3, 0.25],
+    [0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2]   # Rank 8 (White side)
+]
+
+# Dictionary linking piece identifiers to their respective square score matrices.
+# Black piece tables are vertically flipped versions of white ones.
+piece_position_scores = {
+    "wN": knight_scores,
+    "bN": knight_scores[::-1],
+    "wB": bishop_scores,
+    "bB": bishop_scores[::-1],
+    "wQ": queen_scores,
+    "bQ": queen_scores[::-1],
+    "wR": rook_scores,
+    "bR": rook_scores[::-1],
+    "wp": pawn_scores,
+    "bp": pawn_scores[::-1]
+}
+
+# Piece-square table of each piece type, in white's orientation (black uses the flipped rows)
+piece_square_tables = {
+    "N": knight_scores,
+    "B": bishop_scores,
+    "R": rook_scores,
+    "Q": queen_scores,
+    "p": pawn_scores
+}
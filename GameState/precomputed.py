@@ -0,0 +1,95 @@
+"""
+Move and attack target tables for the list-based GameState, built once at import.
+
+The helpers in gamestate_helpers.py look squares up here instead of stepping through
+direction offsets and checking board bounds on every call:
+
+- KNIGHT_TARGETS[row][col] / KING_TARGETS[row][col]: on-board (row, col) squares a knight or
+  king on (row, col) reaches.
+- RAYS[row][col][j]: the squares from (row, col) (exclusive) to the board edge along
+  DIRECTIONS[j], nearest first. Indices 0-3 are the rook directions, 4-7 the bishop directions.
+- PAWN_CAPTURE_TARGETS[color][row][col]: squares a pawn of `color` on (row, col) captures on.
+- SQUARES_BETWEEN[a][b]: squares strictly between square indices a and b (row * 8 + col) when
+  they share a rank, file or diagonal, as a frozenset of (row, col); empty otherwise.
+- LINE_THROUGH[a][b]: every square of the full rank, file or diagonal through a and b
+  (including both), as a frozenset of (row, col); empty when they are not aligned.
+"""
+
+
+# Row/column steps, in the order the helpers scan them: orthogonal first, then diagonal
+DIRECTIONS = (
+    (-1, 0), (0, -1), (1, 0), (0, 1),    # up, left, down, right
+    (-1, -1), (-1, 1), (1, -1), (1, 1)   # diagonals: up-left, up-right, down-left, down-right
+)
+ROOK_DIRECTION_INDICES = (0, 1, 2, 3)
+BISHOP_DIRECTION_INDICES = (4, 5, 6, 7)
+
+# Index of the reverse of each direction
+OPPOSITE_DIRECTION = tuple(DIRECTIONS.index((-d_row, -d_col)) for d_row, d_col in DIRECTIONS)
+
+KNIGHT_OFFSETS = (
+    (-2, -1), (-2, 1), (-1, 2), (1, 2),
+    (2, -1), (2, 1), (-1, -2), (1, -2)
+)
+KING_OFFSETS = (
+    (-1, -1), (-1, 0), (-1, 1), (0, -1),
+    (0, 1), (1, -1), (1, 0), (1, 1)
+)
+
+
+def _jumpTargets(row, col, offsets):
+    """
+    Returns the on-board squares one jump from (row, col), in the order of `offsets`.
+    """
+    return tuple(
+        (row + d_row, col + d_col) for d_row, d_col in offsets
+        if 0 <= row + d_row < 8 and 0 <= col + d_col < 8
+    )
+
+
+def _ray(row, col, direction):
+    """
+    Returns the squares from (row, col) (exclusive) to the board edge along `direction`.
+    """
+    squares = []
+    end_row, end_col = row + direction[0], col + direction[1]
+    while 0 <= end_row < 8 and 0 <= end_col < 8:
+        squares.append((end_row, end_col))
+        end_row, end_col = end_row + direction[0], end_col + direction[1]
+    return tuple(squares)
+
+
+KNIGHT_TARGETS = [[_jumpTargets(row, col, KNIGHT_OFFSETS) for col in range(8)] for row in range(8)]
+KING_TARGETS = [[_jumpTargets(row, col, KING_OFFSETS) for col in range(8)] for row in range(8)]
+
+RAYS = [[tuple(_ray(row, col, direction) for direction in DIRECTIONS) for col in range(8)] for row in range(8)]
+
+# White pawns capture "up" the board (towards row 0), black pawns "down"
+PAWN_CAPTURE_TARGETS = {
+    "w": [[_jumpTargets(row, col, ((-1, -1), (-1, 1))) for col in range(8)] for row in range(8)],
+    "b": [[_jumpTargets(row, col, ((1, -1), (1, 1))) for col in range(8)] for row in range(8)]
+}
+
+
+def _buildLineTables():
+    """
+    Builds SQUARES_BETWEEN and LINE_THROUGH for every pair of square indices.
+    """
+    empty = frozenset()
+    between = [[empty] * 64 for _ in range(64)]
+    line = [[empty] * 64 for _ in range(64)]
+
+    for square in range(64):
+        row, col = divmod(square, 8)
+        for j in range(len(DIRECTIONS)):
+            # The whole line is this ray, its opposite ray and the square itself
+            opposite = RAYS[row][col][OPPOSITE_DIRECTION[j]]
+            full_line = frozenset(RAYS[row][col][j] + opposite + ((row, col),))
+            for distance, (end_row, end_col) in enumerate(RAYS[row][col][j]):
+                target = end_row * 8 + end_col
+                between[square][target] = frozenset(RAYS[row][col][j][:distance])
+                line[square][target] = full_line
+    return between, line
+
+
+SQUARES_BETWEEN, LINE_THROUGH = _buildLineTables()
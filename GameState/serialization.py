@@ -0,0 +1,231 @@
+"""
+Reading and writing positions: FEN strings and a compact fixed-size binary encoding.
+
+Both formats are parsed into the same plain "position" dictionary, which GameState.loadPosition
+turns into a searchable game:
+
+    {
+        "board": 8x8 list of piece strings ("wK", "bp", "--", ...),
+        "white_to_move": bool,
+        "castling_rights": Castling,
+        "enpassant_possible": (row, col) or (),
+        "halfmove_clock": int,    # plies since the last capture or pawn move
+        "fullmove_number": int    # starts at 1, increases after every black move
+    }
+
+Binary layout (POSITION_SIZE = 30 bytes, big-endian):
+
+    bytes  0-7   occupancy bitboard (bit row * 8 + col set for every occupied square)
+    bytes  8-23  one 4-bit piece code per occupied square, in square order (max 32 pieces)
+    byte   24    bit 0: black to move, bits 1-4: castling rights wks, bks, wqs, bqs
+    byte   25    en passant column, or 0xFF if there is none
+    bytes 26-27  halfmove clock
+    bytes 28-29  fullmove number
+"""
+
+import struct
+
+from Moves.castling import Castling
+from Moves.moves import Move
+
+
+# Piece code (index) used by the binary encoding
+PIECE_CODES = ("wp", "wN", "wB", "wR", "wQ", "wK", "bp", "bN", "bB", "bR", "bQ", "bK")
+
+POSITION_SIZE = 30
+
+_HEADER = struct.Struct(">Q16sBBHH")
+
+# FEN letters <-> piece strings
+_FEN_TO_PIECE = {
+    "P": "wp", "N": "wN", "B": "wB", "R": "wR", "Q": "wQ", "K": "wK",
+    "p": "bp", "n": "bN", "b": "bB", "r": "bR", "q": "bQ", "k": "bK"
+}
+_PIECE_TO_FEN = {piece: letter for letter, piece in _FEN_TO_PIECE.items()}
+
+
+def parseFen(fen):
+    """
+    Parses a FEN string into a position dictionary.
+
+    The halfmove clock and fullmove number are optional and default to 0 and 1.
+
+    Raises:
+        ValueError: If the string is not a valid FEN.
+    """
+    fields = fen.split()
+    if len(fields) < 4:
+        raise ValueError("FEN needs at least 4 fields: {!r}".format(fen))
+    placement, side, castling, enpassant = fields[:4]
+
+    # ---- 1. PIECE PLACEMENT ----
+    ranks = placement.split("/")
+    if len(ranks) != 8:
+        raise ValueError("FEN must describe 8 ranks: {!r}".format(placement))
+
+    board = []
+    for rank in ranks:
+        row = []
+        for char in rank:
+            if char.isdigit():
+                row.extend(["--"] * int(char))
+            elif char in _FEN_TO_PIECE:
+                row.append(_FEN_TO_PIECE[char])
+            else:
+                raise ValueError("Unknown piece {!r} in FEN".format(char))
+        if len(row) != 8:
+            raise ValueError("FEN rank {!r} does not have 8 squares".format(rank))
+        board.append(row)
+
+    for king in ("wK", "bK"):
+        if sum(row.count(king) for row in board) != 1:
+            raise ValueError("FEN must contain exactly one {}".format(king))
+
+    # ---- 2. SIDE TO MOVE, CASTLING, EN PASSANT ----
+    if side not in ("w", "b"):
+        raise ValueError("Side to move must be 'w' or 'b', not {!r}".format(side))
+
+    if castling != "-" and set(castling) - set("KQkq"):
+        raise ValueError("Invalid castling field {!r}".format(castling))
+
+    if enpassant == "-":
+        enpassant_possible = ()
+    elif len(enpassant) == 2 and enpassant[0] in Move.files_to_cols and enpassant[1] in ("3", "6"):
+        enpassant_possible = (Move.ranks_to_rows[enpassant[1]], Move.files_to_cols[enpassant[0]])
+    else:
+        raise ValueError("Invalid en passant field {!r}".format(enpassant))
+
+    # ---- 3. MOVE CLOCKS ----
+    halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+    fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+
+    return {
+        "board": board,
+        "white_to_move": side == "w",
+        "castling_rights": Castling("K" in castling, "k" in castling, "Q" in castling, "q" in castling),
+        "enpassant_possible": enpassant_possible,
+        "halfmove_clock": halfmove_clock,
+        "fullmove_number": fullmove_number
+    }
+
+
+def buildFen(game_state):
+    """
+    Returns the FEN string describing the current position of `game_state`.
+    """
+    # ---- 1. PIECE PLACEMENT ----
+    ranks = []
+    for row in game_state.board:
+        rank = ""
+        empty = 0
+        for piece in row:
+            if piece == "--":
+                empty += 1
+                continue
+            if empty:
+                rank += str(empty)
+                empty = 0
+            rank += _PIECE_TO_FEN[piece]
+        if empty:
+            rank += str(empty)
+        ranks.append(rank)
+
+    # ---- 2. CASTLING AND EN PASSANT ----
+    rights = game_state.current_castling_rights
+    castling = (
+        ("K" if rights.wks else "") + ("Q" if rights.wqs else "") +
+        ("k" if rights.bks else "") + ("q" if rights.bqs else "")
+    ) or "-"
+
+    if game_state.enpassant_possible:
+        row, col = game_state.enpassant_possible
+        enpassant = Move.cols_to_files[col] + Move.rows_to_ranks[row]
+    else:
+        enpassant = "-"
+
+    return "{} {} {} {} {} {}".format(
+        "/".join(ranks),
+        "w" if game_state.white_to_move else "b",
+        castling,
+        enpassant,
+        game_state.halfmove_clock,
+        game_state.fullmove_number
+    )
+
+
+def encodePosition(game_state):
+    """
+    Packs the current position of `game_state` into POSITION_SIZE bytes.
+
+    Raises:
+        ValueError: If the board holds more than 32 pieces.
+    """
+    occupancy = 0
+    codes = []
+    for row in range(8):
+        for col in range(8):
+            piece = game_state.board[row][col]
+            if piece != "--":
+                occupancy |= 1 << (row * 8 + col)
+                codes.append(PIECE_CODES.index(piece))
+
+    if len(codes) > 32:
+        raise ValueError("Cannot encode a position with more than 32 pieces")
+
+    # Two piece codes per byte, the first one in the high nibble
+    codes += [0] * (32 - len(codes))
+    packed_pieces = bytes((codes[i] << 4) | codes[i + 1] for i in range(0, 32, 2))
+
+    rights = game_state.current_castling_rights
+    flags = (
+        (0 if game_state.white_to_move else 1) |
+        rights.wks << 1 | rights.bks << 2 | rights.wqs << 3 | rights.bqs << 4
+    )
+    enpassant_col = game_state.enpassant_possible[1] if game_state.enpassant_possible else 0xFF
+
+    return _HEADER.pack(
+        occupancy, packed_pieces, flags, enpassant_col,
+        min(game_state.halfmove_clock, 0xFFFF), min(game_state.fullmove_number, 0xFFFF)
+    )
+
+
+def decodePosition(data):
+    """
+    Unpacks bytes produced by encodePosition into a position dictionary.
+
+    Raises:
+        ValueError: If `data` is not POSITION_SIZE bytes long.
+    """
+    if len(data) != POSITION_SIZE:
+        raise ValueError("Encoded position must be {} bytes, got {}".format(POSITION_SIZE, len(data)))
+    occupancy, packed_pieces, flags, enpassant_col, halfmove_clock, fullmove_number = _HEADER.unpack(data)
+
+    codes = []
+    for byte in packed_pieces:
+        codes.append(byte >> 4)
+        codes.append(byte & 0xF)
+
+    board = [["--"] * 8 for _ in range(8)]
+    next_code = 0
+    for square in range(64):
+        if (occupancy >> square) & 1:
+            board[square // 8][square % 8] = PIECE_CODES[codes[next_code]]
+            next_code += 1
+
+    white_to_move = not flags & 1
+    if enpassant_col == 0xFF:
+        enpassant_possible = ()
+    else:
+        # The en passant square is behind the pawn that just moved two squares
+        enpassant_possible = (2 if white_to_move else 5, enpassant_col)
+
+    return {
+        "board": board,
+        "white_to_move": white_to_move,
+        "castling_rights": Castling(
+            bool(flags & 2), bool(flags & 4), bool(flags & 8), bool(flags & 16)
+        ),
+        "enpassant_possible": enpassant_possible,
+        "halfmove_clock": halfmove_clock,
+        "fullmove_number": fullmove_number
+    }
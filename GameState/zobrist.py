@@ -0,0 +1,111 @@
+"""
+Zobrist hashing for chess positions.
+
+Every (piece, square) pair, the side to move, each castling right and each en passant file is
+assigned a random 64-bit number. A position's key is the XOR of the numbers for every feature
+present, so a move only has to XOR out what changed and XOR in what is new.
+
+The random numbers come from a fixed seed, which keeps keys identical across processes
+(e.g. the GUI and the AI worker) and across runs.
+"""
+
+import random
+
+ZOBRIST_SEED = 0x5EED_C0DE
+
+_rng = random.Random(ZOBRIST_SEED)
+
+
+def _random64():
+    """Returns a random 64-bit integer from the seeded generator."""
+    return _rng.getrandbits(64)
+
+
+# ZOBRIST_PIECES[piece][row][col] -> key for that piece standing on that square
+ZOBRIST_PIECES = {
+    color + piece_type: [[_random64() for _ in range(8)] for _ in range(8)]
+    for color in ("w", "b")
+    for piece_type in ("p", "N", "B", "R", "Q", "K")
+}
+
+# XORed in whenever it is black's turn to move
+ZOBRIST_BLACK_TO_MOVE = _random64()
+
+# One key per castling right
+ZOBRIST_CASTLING = {
+    "wks": _random64(),
+    "bks": _random64(),
+    "wqs": _random64(),
+    "bqs": _random64()
+}
+
+# One key per file on which an en passant capture is possible
+ZOBRIST_ENPASSANT = [_random64() for _ in range(8)]
+
+
+def castlingKey(castling_rights):
+    """
+    Returns the combined key for a Castling object's active rights.
+    """
+    key = 0
+    if castling_rights.wks:
+        key ^= ZOBRIST_CASTLING["wks"]
+    if castling_rights.bks:
+        key ^= ZOBRIST_CASTLING["bks"]
+    if castling_rights.wqs:
+        key ^= ZOBRIST_CASTLING["wqs"]
+    if castling_rights.bqs:
+        key ^= ZOBRIST_CASTLING["bqs"]
+    return key
+
+
+def enpassantKey(enpassant_possible):
+    """
+    Returns the key for an en passant square in (row, col) form, or 0 if there is none.
+    """
+    if enpassant_possible:
+        return ZOBRIST_ENPASSANT[enpassant_possible[1]]
+    return 0
+
+
+def computeZobristKey(game_state):
+    """
+    Computes the Zobrist key of a position from scratch.
+
+    makeMove/undoMove keep the key up to date incrementally; this is used to seed it and
+    to verify the incremental updates.
+
+    Returns:
+        int: 64-bit position key.
+    """
+    key = 0
+    for row in range(8):
+        for col in range(8):
+            piece = game_state.board[row][col]
+            if piece != "--":
+                key ^= ZOBRIST_PIECES[piece][row][col]
+
+    if not game_state.white_to_move:
+        key ^= ZOBRIST_BLACK_TO_MOVE
+
+    key ^= castlingKey(game_state.current_castling_rights)
+    key ^= enpassantKey(game_state.enpassant_possible)
+    return key
+
+
+def computePawnKey(game_state):
+    """
+    Computes the pawn key of a position from scratch: the XOR of the piece keys of every
+    pawn and both kings. It identifies the pawn structure (plus king placement, which the
+    king shelter evaluation depends on) for the pawn hash table.
+
+    Returns:
+        int: 64-bit pawn key.
+    """
+    key = 0
+    for row in range(8):
+        for col in range(8):
+            piece = game_state.board[row][col]
+            if piece[1] == "p" or piece[1] == "K":
+                key ^= ZOBRIST_PIECES[piece][row][col]
+    return key
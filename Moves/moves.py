@@ -1,4 +1,52 @@
+"""
+Move objects and their compact 16-bit integer encoding.
+
+Move generation works on plain integers (see BitboardGameState.getLegalMoveCodes) and only
+builds Move objects, which carry the pieces and flags makeMove and the GUI need, when a move
+is actually going to be played, searched or shown. An encoded move is laid out as:
+
+    bits 0-5    start square (row * 8 + col, 0 = a8)
+    bits 6-11   end square
+    bits 12-13  promotion piece, as an index into Move.promotion_pieces (0 = queen)
+    bit 14      en passant capture
+    bit 15      castling move
+
+The low 14 bits (squares and promotion piece) are the move's moveID, which identifies it
+within a position.
+"""
+
+# Flag bits of an encoded move
+PROMOTION_SHIFT = 12
+ENPASSANT_FLAG = 1 << 14
+CASTLE_FLAG = 1 << 15
+
+# Mask selecting the moveID from an encoded move
+MOVE_ID_MASK = (1 << 14) - 1
+
+
+def encodeMove(start_square, end_square, flags=0):
+    """
+    Packs a move into its 16-bit encoding.
+
+    Args:
+        start_square (int): Start square index (row * 8 + col).
+        end_square (int): End square index.
+        flags (int): ENPASSANT_FLAG, CASTLE_FLAG and/or promotion index << PROMOTION_SHIFT.
+
+    Returns:
+        int: The encoded move.
+    """
+    return start_square | end_square << 6 | flags
+
+
 class Move:
+    # Moves are created in large numbers during search: fixed slots instead of a per-object __dict__
+    __slots__ = (
+        "start_row", "start_col", "end_row", "end_col", "piece_moved", "piece_captured",
+        "is_pawn_promotion", "promotion_piece", "is_enpassant_move", "is_castle_move",
+        "is_capture", "moveID", "encoded"
+    )
+
     # Dictionaries for converting between chess notation (e.g., 'e4') and board indices
 
     # Maps rank characters ('1'–'8') to row indices (used in 2D board representation)
@@ -19,7 +67,12 @@ class Move:
     # Reverse mapping from column indices back to file characters
     cols_to_files = {v: k for k, v in files_to_cols.items()}
 
-    def __init__(self, start_square, end_square, board, is_enpassant_move=False, is_castle_move=False):
+    # Pieces a pawn may promote to. The index is folded into the moveID, so the queen
+    # (index 0) keeps the plain coordinate ID used by the GUI's click-to-move matching.
+    promotion_pieces = ("Q", "R", "B", "N")
+
+    def __init__(self, start_square, end_square, board, is_enpassant_move=False, is_castle_move=False,
+                 promotion_piece="Q"):
         """
         Creates a new Move object representing a single move in the game.
 
@@ -29,6 +82,7 @@ class Move:
             board (list of lists): current game board state
             is_enpassant_move (bool): whether this move is an en passant capture
             is_castle_move (bool): whether this move is a castling move
+            promotion_piece (str): piece type a promoting pawn becomes ('Q', 'R', 'B' or 'N')
         """
 
         # Extract starting and ending positions
@@ -50,6 +104,9 @@ class Move:
             self.piece_moved == "bp" and self.end_row == 7
         )
 
+        # Piece type the pawn turns into (None for every other move)
+        self.promotion_piece = promotion_piece if self.is_pawn_promotion else None
+
         # Handle en passant (special pawn capture)
         self.is_enpassant_move = is_enpassant_move
         if self.is_enpassant_move:
@@ -62,13 +119,39 @@ class Move:
         # Convenience flag for whether the move results in a capture
         self.is_capture = self.piece_captured != "--"
 
-        # Generate a unique ID for this move based on its coordinates
+        # Generate a unique ID for this move based on its squares (and promotion piece)
         # This is used to compare moves and detect equivalency
-        self.moveID = (
-            self.start_row * 1000 +
-            self.start_col * 100 +
-            self.end_row * 10 +
-            self.end_col
+        self.moveID = (self.start_row * 8 + self.start_col) | (self.end_row * 8 + self.end_col) << 6
+        if self.is_pawn_promotion:
+            self.moveID |= self.promotion_pieces.index(promotion_piece) << PROMOTION_SHIFT
+
+        # The full 16-bit encoding also records the special-move flags
+        self.encoded = self.moveID
+        if is_enpassant_move:
+            self.encoded |= ENPASSANT_FLAG
+        if is_castle_move:
+            self.encoded |= CASTLE_FLAG
+
+
+    @classmethod
+    def fromEncoded(cls, encoded, board):
+        """
+        Builds the Move for an encoded move (see the module docstring) on the given board.
+
+        Args:
+            encoded (int): 16-bit encoded move.
+            board (list of lists): current game board state
+
+        Returns:
+            Move: The decoded move.
+        """
+        return cls(
+            divmod(encoded & 63, 8),
+            divmod((encoded >> 6) & 63, 8),
+            board,
+            is_enpassant_move=bool(encoded & ENPASSANT_FLAG),
+            is_castle_move=bool(encoded & CASTLE_FLAG),
+            promotion_piece=cls.promotion_pieces[(encoded >> PROMOTION_SHIFT) & 3]
         )
 
 
@@ -83,6 +166,13 @@ class Move:
         return False  # Not equal if other object is not a Move
 
 
+    def __hash__(self):
+        """
+        Hashes the moveID, consistently with __eq__, so moves can be used in sets and as dict keys.
+        """
+        return self.moveID
+
+
     def getChessNotation(self):
         """
         Returns the move in standard chess notation (e.g., e4, Nf3, Qxe7, 0-0).
@@ -93,9 +183,9 @@ class Move:
         - piece captures and quiet moves
         """
 
-        # Handle pawn promotion (assumes promotion to Queen)
+        # Handle pawn promotion (e.g., e8Q, e8N)
         if self.is_pawn_promotion:
-            return self.getRankFile(self.end_row, self.end_col) + "Q"
+            return self.getRankFile(self.end_row, self.end_col) + self.promotion_piece
 
         # Handle castling (kingside and queenside)
         if self.is_castle_move:
@@ -121,6 +211,18 @@ class Move:
             return self.piece_moved[1] + self.getRankFile(self.end_row, self.end_col)
 
 
+    def getUciNotation(self):
+        """
+        Returns the move in long algebraic (UCI) notation: start square, end square and,
+        for promotions, the lowercase promotion piece (e.g., e2e4, e7e8q, e1g1 for 0-0).
+        """
+        notation = self.getRankFile(self.start_row, self.start_col) + \
+            self.getRankFile(self.end_row, self.end_col)
+        if self.is_pawn_promotion:
+            notation += self.promotion_piece.lower()
+        return notation
+
+
     def getRankFile(self, row, col):
         """
         Converts board coordinates (row, col) to standard square notation (e.g., e4).
@@ -148,8 +250,8 @@ class Move:
             if self.is_capture:
                 return self.cols_to_files[self.start_col] + "x" + end_square
             else:
-                # Add 'Q' for promotion
-                return end_square + "Q" if self.is_pawn_promotion else end_square
+                # Add the promotion piece (e.g., 'e8Q')
+                return end_square + self.promotion_piece if self.is_pawn_promotion else end_square
 
         # Non-pawn moves
         move_string = self.piece_moved[1]  # e.g., 'N' for knight, 'Q' for queen
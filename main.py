@@ -4,11 +4,11 @@ Handling user input.
 Displaying current GameStatus.
 """
 import pygame as p
-from GameState.gamestate import GameState
+from GameState.bitboard import BitboardGameState
 from Moves.moves import Move
 import AI.chessai as ChessAI
+from AI.worker import EngineWorker
 import sys
-from multiprocessing import Process, Queue
 
 # Constants for GUI dimensions
 BOARD_WIDTH = BOARD_HEIGHT = 512  # Chess board will be 512x512 pixels
@@ -47,7 +47,7 @@ def main():
     clock = p.time.Clock()  # For controlling the frame rate of the game loop
     screen.fill(p.Color("white"))  # Fill the screen with a white background
 
-    game_state = GameState()  # Create the initial game state object
+    game_state = BitboardGameState()  # Create the initial game state object (bitboard-backed)
     valid_moves = game_state.getValidMoves()  # Get the list of valid moves at the start of the game
     move_made = False  # Track if a move has been made (used to trigger updates)
     animate = False  # Track whether the last move should be animated
@@ -61,7 +61,7 @@ def main():
     game_over = False  # Flag to indicate if the game is over (checkmate or stalemate)
     ai_thinking = False  # Whether the AI is currently evaluating its move
     move_undone = False  # True if a move was undone (used to control AI flow)
-    move_finder_process = None  # The process used for asynchronous AI move finding
+    engine = EngineWorker()  # Long-lived AI process that searches in the background
     move_log_font = p.font.SysFont("Arial", 14, False, False)  # Font used for rendering the move log
 
     player_one = True  # True if human is playing white
@@ -74,6 +74,7 @@ def main():
         # Handle all pygame events in the queue
         for e in p.event.get():
             if e.type == p.QUIT:
+                engine.close()
                 p.quit()
                 sys.exit()
 
@@ -114,13 +115,13 @@ def main():
                     game_over = False
                     # Stop any AI processing
                     if ai_thinking:
-                        move_finder_process.terminate()
+                        engine.cancel()
                         ai_thinking = False
                     move_undone = True
 
                 elif e.key == p.K_r:
                     # Reset the game
-                    game_state = GameState()
+                    game_state = BitboardGameState()
                     valid_moves = game_state.getValidMoves()
                     square_selected = ()
                     player_clicks = []
@@ -128,7 +129,7 @@ def main():
                     animate = False
                     game_over = False
                     if ai_thinking:
-                        move_finder_process.terminate()
+                        engine.cancel()
                         ai_thinking = False
                     move_undone = True
 
@@ -136,17 +137,12 @@ def main():
         if not game_over and not human_turn and not move_undone:
             if not ai_thinking:
                 ai_thinking = True
-                return_queue = Queue()  # Queue for inter-process communication
-                # Start a separate process for AI move computation
-                move_finder_process = Process(
-                    target=ChessAI.findBestMove,
-                    args=(game_state, valid_moves, return_queue)
-                )
-                move_finder_process.start()
-
-            # If AI process has finished
-            if not move_finder_process.is_alive():
-                ai_move = return_queue.get()  # Get the best move from the AI process
+                # Hand the position to the background engine; it only receives the new moves
+                engine.startSearch(game_state, randomize=True)  # Vary play between equally good moves
+
+            # If the engine has answered
+            if engine.poll():
+                ai_move = engine.bestMove(valid_moves)  # Get the best move from the AI process
                 if ai_move is None:
                     # Fallback to random move if AI fails
                     ai_move = ChessAI.findRandomMove(valid_moves)
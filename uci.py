@@ -0,0 +1,389 @@
+"""
+Headless UCI (Universal Chess Interface) front-end for the engine.
+
+Lets the AI play under any UCI tournament manager or GUI (cutechess-cli, Arena, ...) without
+pygame or a display:
+
+    python uci.py
+
+Supported commands: uci, isready, setoption (Hash, Threads, LazySMP, Ponder), ucinewgame,
+position [startpos | fen <FEN>] [moves ...], go [depth | movetime | wtime/btime/winc/binc/movestogo |
+nodes | infinite | ponder], stop, ponderhit, quit.
+
+The search runs in a background thread so stop, ponderhit and isready are answered while it
+thinks. While searching the engine prints one "info" line per completed depth. With Threads
+above 1 the root moves are searched in parallel by a pool of worker processes
+(AI/parallel_search.py), or, with LazySMP set, helper processes search the whole position and
+share one transposition table with the main search (AI/lazy_smp.py). Hash is the total table
+size either way: the parallel search divides it between its workers' tables.
+"""
+
+import os
+import sys
+import threading
+
+import AI.chessai as ChessAI
+from AI.lazy_smp import LazySmpSearch
+from AI.parallel_search import ParallelSearch
+from GameState.bitboard import BitboardGameState
+
+
+ENGINE_NAME = "Chess-AI-Project"
+ENGINE_AUTHOR = "Chess-AI-Project contributors"
+
+# Bounds for the Hash option (transposition table size in MB)
+MIN_HASH_MB = 1
+MAX_HASH_MB = 1024
+
+# Upper bound for the Threads option: one search process per CPU
+MAX_THREADS = os.cpu_count() or 1
+
+# Fraction of the remaining clock to spend on one move when no movestogo is given,
+# and the time (in seconds) always left on the clock for communication delays
+DEFAULT_MOVES_TO_GO = 30
+MOVE_OVERHEAD = 0.05
+
+
+class UciEngine:
+    """
+    Reads UCI commands, keeps the current position and runs searches in a background thread.
+    """
+
+    def __init__(self, output=sys.stdout):
+        """
+        Args:
+            output (file): Stream the engine's replies are written to.
+        """
+        self.output = output
+        self.output_lock = threading.Lock()  # The search thread prints too
+
+        self.game_state = BitboardGameState()
+
+        # Options set through setoption
+        self.hash_mb = ChessAI.DEFAULT_SIZE_MB
+        self.threads = 1
+        self.lazy_smp = False
+        self.ponder = False  # Whether bestmove also names the expected reply to ponder on
+        self.parallel = None  # Worker pool, started by the first search with Threads > 1
+
+        # State of the running search (if any)
+        self.search_thread = None
+        self.stop_flag = threading.Event()   # Polled by the search; set by "stop"
+        self.release_flag = threading.Event()  # Lets an infinite/ponder search report bestmove
+        self.time_limit = None    # Budget of the current "go", kept for ponderhit
+        self.ponder_timer = None  # Ends a pondering search after ponderhit
+
+
+    def send(self, line):
+        """
+        Writes one line to the GUI.
+        """
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+
+    def run(self, input_stream=sys.stdin):
+        """
+        Processes commands until "quit" or the end of the input.
+        """
+        for line in input_stream:
+            if not self.handleCommand(line):
+                break
+        self.stopSearch()
+        self.closeWorkers()
+
+
+    def handleCommand(self, line):
+        """
+        Executes a single UCI command.
+
+        Returns:
+            bool: False once the engine should exit.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, arguments = tokens[0], tokens[1:]
+
+        if command == "uci":
+            self.send("id name " + ENGINE_NAME)
+            self.send("id author " + ENGINE_AUTHOR)
+            self.send("option name Hash type spin default {} min {} max {}".format(
+                ChessAI.DEFAULT_SIZE_MB, MIN_HASH_MB, MAX_HASH_MB))
+            self.send("option name Threads type spin default 1 min 1 max {}".format(MAX_THREADS))
+            self.send("option name LazySMP type check default false")
+            self.send("option name Ponder type check default false")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self.setOption(arguments)
+        elif command == "ucinewgame":
+            self.stopSearch()
+            ChessAI.transposition_table.clear()
+            self.closeWorkers()  # Restarted with empty tables on the next search
+        elif command == "position":
+            self.stopSearch()
+            self.setPosition(arguments)
+        elif command == "go":
+            self.stopSearch()
+            self.go(arguments)
+        elif command == "stop":
+            self.stopSearch()
+        elif command == "ponderhit":
+            self.ponderHit()
+        elif command == "quit":
+            return False
+        # Unknown commands (and "debug", "register") are ignored, as the protocol requires
+        return True
+
+
+    # ---- OPTIONS AND POSITION ----
+
+    def setOption(self, arguments):
+        """
+        Handles "setoption name <id> [value <x>]".
+        """
+        if "name" not in arguments:
+            return
+        if "value" in arguments:
+            name = " ".join(arguments[arguments.index("name") + 1:arguments.index("value")])
+            value = " ".join(arguments[arguments.index("value") + 1:])
+        else:
+            name, value = " ".join(arguments[arguments.index("name") + 1:]), ""
+
+        name = name.lower()
+        try:
+            if name == "hash":
+                self.hash_mb = min(max(int(value), MIN_HASH_MB), MAX_HASH_MB)
+                ChessAI.transposition_table.resize(self.hash_mb)
+                self.closeWorkers()
+            elif name == "threads":
+                self.threads = min(max(int(value), 1), MAX_THREADS)
+                self.closeWorkers()
+            elif name == "lazysmp":
+                self.lazy_smp = value.lower() == "true"
+                self.closeWorkers()
+            elif name == "ponder":
+                self.ponder = value.lower() == "true"
+        except ValueError:
+            self.send("info string invalid value {!r} for option {}".format(value, name))
+
+
+    def setPosition(self, arguments):
+        """
+        Handles "position [startpos | fen <FEN>] [moves <move1> ... <moveN>]".
+        """
+        if "moves" in arguments:
+            moves_index = arguments.index("moves")
+            setup, moves = arguments[:moves_index], arguments[moves_index + 1:]
+        else:
+            setup, moves = arguments, []
+
+        try:
+            if setup and setup[0] == "fen":
+                game_state = BitboardGameState.fromFen(" ".join(setup[1:]))
+            else:
+                game_state = BitboardGameState()
+        except ValueError as error:
+            self.send("info string invalid position: {}".format(error))
+            return
+
+        for move_text in moves:
+            move = findUciMove(game_state, move_text)
+            if move is None:
+                self.send("info string illegal move {}".format(move_text))
+                break
+            game_state.makeMove(move)
+
+        self.game_state = game_state
+
+
+    # ---- SEARCH ----
+
+    def go(self, arguments):
+        """
+        Handles "go" by starting a search in a background thread.
+        """
+        limits = parseGoArguments(arguments)
+        infinite = limits["infinite"] or limits["ponder"]
+
+        search_limits = {"depth": limits["depth"], "node_limit": limits["nodes"]}
+        self.time_limit = allocateTime(limits, self.game_state.white_to_move)
+        if not infinite:
+            search_limits["time_limit"] = self.time_limit
+        elif limits["depth"] is None:
+            # Keep deepening until "stop" (or the ponderhit timer) ends the search
+            search_limits["depth"] = ChessAI.MAX_DEPTH
+
+        self.stop_flag.clear()
+        self.release_flag.clear()
+        if not infinite:
+            self.release_flag.set()
+
+        self.search_thread = threading.Thread(
+            target=self._searchThread, args=(search_limits,), daemon=True
+        )
+        self.search_thread.start()
+
+
+    def _searchThread(self, search_limits):
+        """
+        Body of the search thread: searches, then reports bestmove (and, with the Ponder
+        option set, the expected reply to ponder on).
+        """
+        game_state = self.game_state
+        valid_moves = game_state.getValidMoves()
+        if not valid_moves:
+            self.release_flag.wait()
+            self.send("bestmove 0000")
+            return
+
+        on_iteration = lambda info: self.sendInfo(game_state, info)
+        if self.threads > 1:
+            if self.parallel is None:
+                search_class = LazySmpSearch if self.lazy_smp else ParallelSearch
+                self.parallel = search_class(self.threads, self.hash_mb)
+            search = self.parallel.search(
+                game_state, valid_moves, stop_flag=self.stop_flag, on_iteration=on_iteration, **search_limits
+            )
+        else:
+            search = ChessAI.iterativeDeepening(
+                game_state, valid_moves, stop_flag=self.stop_flag, on_iteration=on_iteration, **search_limits
+            )
+
+        # "go infinite" and "go ponder" must not answer before "stop" or "ponderhit",
+        # even if the search finished on its own (e.g. it found a mate)
+        self.release_flag.wait()
+
+        best_move = search.best_move
+        line = []
+        if self.ponder:
+            line = search.principal_variation or ChessAI.principalVariation(game_state, best_move, max_length=2)
+        if len(line) > 1:
+            self.send("bestmove {} ponder {}".format(best_move.getUciNotation(), line[1].getUciNotation()))
+        else:
+            self.send("bestmove " + best_move.getUciNotation())
+
+
+    def sendInfo(self, game_state, search):
+        """
+        Prints the "info" line for a completed iteration.
+        """
+        elapsed = search.elapsed()
+        line = search.principal_variation or ChessAI.principalVariation(
+            game_state, search.best_move, max_length=search.completed_depth
+        )
+        self.send("info depth {} score {} nodes {} nps {} time {} pv {}".format(
+            search.completed_depth,
+            formatScore(search.best_score, search.completed_depth),
+            search.nodes,
+            int(search.nodes / elapsed) if elapsed > 0 else 0,
+            int(elapsed * 1000),
+            " ".join(move.getUciNotation() for move in line)
+        ))
+
+
+    def stopSearch(self):
+        """
+        Stops the running search (if any) and waits for it to print its bestmove.
+        """
+        if self.ponder_timer is not None:
+            self.ponder_timer.cancel()
+            self.ponder_timer = None
+        if self.search_thread is not None:
+            self.stop_flag.set()
+            self.release_flag.set()
+            self.search_thread.join()
+            self.search_thread = None
+
+
+    def closeWorkers(self):
+        """
+        Shuts down the parallel search workers (if any), freeing a Lazy SMP shared table.
+        """
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+
+
+    def ponderHit(self):
+        """
+        The opponent played the expected move: the pondering search becomes a normal search
+        with the time allocated by the "go ponder" command.
+        """
+        if self.search_thread is None:
+            return
+        self.release_flag.set()
+        if self.time_limit is not None:
+            self.ponder_timer = threading.Timer(self.time_limit, self.stop_flag.set)
+            self.ponder_timer.daemon = True
+            self.ponder_timer.start()
+
+
+def parseGoArguments(arguments):
+    """
+    Parses the arguments of a "go" command into a dictionary of limits (None when not given).
+    """
+    limits = {
+        "depth": None, "nodes": None, "movetime": None,
+        "wtime": None, "btime": None, "winc": 0, "binc": 0, "movestogo": None,
+        "infinite": "infinite" in arguments, "ponder": "ponder" in arguments
+    }
+    for i, token in enumerate(arguments[:-1]):
+        if token in limits and token not in ("infinite", "ponder"):
+            try:
+                limits[token] = int(arguments[i + 1])
+            except ValueError:
+                pass
+    return limits
+
+
+def allocateTime(limits, white_to_move):
+    """
+    Decides how many seconds to search from the "go" limits.
+
+    Returns:
+        float or None: Time budget, or None when the search is only limited by depth or nodes.
+    """
+    if limits["movetime"] is not None:
+        return max(limits["movetime"] / 1000 - MOVE_OVERHEAD, 0.01)
+
+    remaining = limits["wtime"] if white_to_move else limits["btime"]
+    if remaining is None:
+        return None
+    increment = (limits["winc"] if white_to_move else limits["binc"]) / 1000
+    remaining /= 1000
+
+    moves_to_go = limits["movestogo"] or DEFAULT_MOVES_TO_GO
+    budget = remaining / moves_to_go + increment * 0.8
+
+    # Never plan to use more than half of what is left on the clock
+    return max(min(budget, remaining / 2 - MOVE_OVERHEAD), 0.01)
+
+
+def formatScore(score, depth):
+    """
+    Converts a search score (in pawns, from the side to move's perspective) to UCI form:
+    "cp <centipawns>", or "mate <moves>" for a forced mate (negative when being mated).
+    Mate scores do not record their distance, so the iteration depth gives the move count.
+    """
+    if abs(score) >= ChessAI.CHECKMATE:
+        moves = (depth + 1) // 2
+        return "mate {}".format(moves if score > 0 else -moves)
+    return "cp {}".format(int(round(score * 100)))
+
+
+def findUciMove(game_state, move_text):
+    """
+    Returns the legal Move written as `move_text` in UCI notation (e.g. e2e4, e7e8q), or None.
+    """
+    for move in game_state.getValidMoves():
+        if move.getUciNotation() == move_text:
+            return move
+    return None
+
+
+if __name__ == "__main__":
+    UciEngine().run()